@@ -0,0 +1,58 @@
+"""
+Mide el arranque en frío del CLI: el tiempo total de procesos
+"python -m file_manager find" sobre un árbol chico, contra un "python -c pass"
+vacío, y los módulos pesados que quedaron importados.
+
+    python -m benchmarks.bench_cli --runs 30
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.tree import TreeSpec, make_tree
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("sqlite3", "ctypes", "hashlib", "asyncio", "json", "uuid", "logging")
+
+
+def timed_runs(cmd: list[str], runs: int) -> list[float]:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, check=True, cwd=ROOT)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(Path(tmp), TreeSpec(depth=1, fanout=2, files_per_dir=10, max_size=0))
+        bare = timed_runs([sys.executable, "-c", "pass"], args.runs)
+        find = timed_runs(
+            [sys.executable, "-m", "file_manager", "find", tmp, "-d", "1"], args.runs
+        )
+        probe = (
+            "import sys; from file_manager import cli; "
+            f"cli.main(['find', {tmp!r}]); "
+            f"print(*[m for m in {HEAVY!r} if m in sys.modules], file=sys.stderr)"
+        )
+        loaded = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, cwd=ROOT
+        ).stderr.split()
+
+    print(f"python -c pass: {statistics.median(bare) * 1000:6.1f} ms (median)")
+    print(f"find          : {statistics.median(find) * 1000:6.1f} ms (median)")
+    print(f"heavy modules loaded by find: {', '.join(loaded) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compara la cadena de condiciones original (lambdas sobre Path con re.match sin
+compilar) contra el predicado de compile_filters() sobre N nombres sintéticos.
+
+    python -m benchmarks.bench_filters --n 1000000
+"""
+
+import argparse
+import os
+import random
+import re
+import time
+from pathlib import Path
+
+from file_manager.filters import (
+    ExtensionFilter,
+    NamesFilter,
+    RegexFilter,
+    compile_filters,
+)
+
+EXTENSIONS = [".xlsx", ".docx", ".pdf", ".txt", ".csv", ".pptx"]
+WORDS = ["cuentas", "informe", "Fracaso", "resumen", "nota", "acta", "ficha"]
+
+
+class Entry:
+    __slots__ = ("name", "path")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+
+
+def make_paths(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    paths = []
+    for i in range(n):
+        word = rng.choice(WORDS)
+        dup = f" ({rng.randint(1, 9)})" if rng.random() < 0.1 else ""
+        paths.append(f"/data/{i % 97}/{word}_{i}{dup}{rng.choice(EXTENSIONS)}")
+    return paths
+
+
+def legacy_chain() -> list:
+    """Las condiciones tal como las construía FileManager antes del compilador."""
+    regex_match, regex_search = r"^(?=.*Fracaso)", r"\(\d\)$"
+    names = {"acta_1", "acta_2"}
+    return [
+        lambda x: x if x.suffix == ".xlsx" else None,
+        lambda x: x if x.suffix != ".pdf" else None,
+        lambda x: x if not re.search(pattern=regex_search, string=x.stem) else None,
+        lambda x: x if not re.search(pattern="copia", string=x.stem) else None,
+        lambda x: x if x.stem not in names else None,
+        lambda x: x if re.match(pattern=regex_match, string=x.stem) else None,
+    ]
+
+
+def compiled_chain():
+    return compile_filters(
+        [
+            ExtensionFilter(".xlsx"),
+            ExtensionFilter(".pdf", filter_out=True),
+            RegexFilter(r"\(\d\)$", search=True, filter_out=True),
+            RegexFilter("copia", search=True, filter_out=True),
+            NamesFilter(["acta_1", "acta_2"], filter_out=True),
+            RegexFilter(r"^(?=.*Fracaso)"),
+        ]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    raw = make_paths(args.n)
+
+    # Antes: collect() construía un Path por archivo y evaluaba cada lambda
+    conditions = legacy_chain()
+    start = time.perf_counter()
+    legacy = [p for p in map(Path, raw) if all(c(p) is not None for c in conditions)]
+    legacy_t = time.perf_counter() - start
+
+    entries = [Entry(p) for p in raw]
+    start = time.perf_counter()
+    predicate = compiled_chain()
+    compiled = [e.path for e in entries if predicate(e)]
+    compiled_t = time.perf_counter() - start
+
+    assert [str(p) for p in legacy] == compiled
+    print(f"paths: {args.n}  matches: {len(compiled)}")
+    print(f"legacy chain:  {legacy_t:.3f} s")
+    print(f"compiled:      {compiled_t:.3f} s")
+    print(f"speedup:       {legacy_t / compiled_t:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
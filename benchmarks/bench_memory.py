@@ -0,0 +1,65 @@
+"""
+Memoria de un collect() de N rutas sintéticas (estructura tipo repositorio:
+carpetas de ~50 archivos, nombres repetidos como __init__.py) como list[Path]
+contra PathList, medida con tracemalloc.
+
+    python -m benchmarks.bench_memory --n 1000000
+"""
+
+import argparse
+import os
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+from file_manager.pathlist import PathList
+
+COMMON = ["__init__.py", "index.js", "README.md", "package.json", "test.py"]
+
+
+class Entry:
+    __slots__ = ("name", "path")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+
+
+def entries(n: int, seed: int = 0):
+    """Entradas como las del walk: cada una con su propio str de ruta."""
+    rng = random.Random(seed)
+    for i in range(n):
+        folder = f"/home/usuario/proyectos/repo_{i // 100_000}/src/modulo_{i // 50}"
+        if rng.random() < 0.2:
+            name = rng.choice(COMMON)
+        else:
+            name = f"archivo_{i}_{rng.randrange(10**6)}.py"
+        yield Entry(f"{folder}/{name}")
+
+
+def measure(build) -> tuple[int, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=500_000)
+    args = parser.parse_args()
+
+    paths, paths_time = measure(lambda: [Path(e.path) for e in entries(args.n)])
+    compact, compact_time = measure(lambda: PathList.from_entries(entries(args.n)))
+    print(f"list[Path]: {paths / args.n:7.1f} B/ruta ({paths_time:.2f}s)")
+    print(f"PathList  : {compact / args.n:7.1f} B/ruta ({compact_time:.2f}s)")
+    print(f"reducción : {paths / compact:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
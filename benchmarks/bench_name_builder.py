@@ -0,0 +1,65 @@
+"""
+Compara la evaluación paso por paso de un ESNameBuilder (apply_steps) contra el
+pipeline compilado sin caché (cache_size=0) y con caché (apply_many), con nombres
+repetidos y sin repetir.
+
+    python -m benchmarks.bench_name_builder --n 500000
+"""
+
+import argparse
+import random
+import time
+
+from file_manager import ESNameBuilder
+
+WORDS = ["INFORME", "nota", "de", "la", "Actualidad", "ficha", "del", "sesion", "acta"]
+
+
+def make_names(n: int, unique: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    vocabulary = [
+        "_".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))) + f"-{i}"
+        for i in range(unique)
+    ]
+    return [rng.choice(vocabulary) for _ in range(n)]
+
+
+def builder(cache_size: int = 65536) -> ESNameBuilder:
+    return (
+        ESNameBuilder(cache_size=cache_size)
+        .replace("_", " ")
+        .replace("-", " ")
+        .strip()
+        .lower()
+        .add_dash_after_keywords()
+        .smart_title()
+    )
+
+
+def timed(fn, names: list[str]) -> float:
+    start = time.perf_counter()
+    fn(names)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=500_000)
+    parser.add_argument("--unique", type=int, default=20_000)
+    args = parser.parse_args()
+
+    for label, unique in (("repeated", args.unique), ("all unique", args.n)):
+        names = make_names(args.n, unique)
+        nb = builder()
+        steps_t = timed(lambda ns: [nb.apply_steps(name) for name in ns], names)
+        uncached_t = timed(builder(cache_size=0).apply_many, names)
+        compiled_t = timed(nb.apply_many, names)
+        assert nb.apply_many(names) == [nb.apply_steps(name) for name in names]
+        print(f"{label} ({args.n} names, {unique} distinct)")
+        print(f"  step by step:       {steps_t:.3f} s")
+        print(f"  compiled, no cache: {uncached_t:.3f} s ({steps_t / uncached_t:.2f}x)")
+        print(f"  compiled + cache:   {compiled_t:.3f} s ({steps_t / compiled_t:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compara el walk serial contra el walk paralelo de TreeWalker.
+
+Genera un árbol sintético (profundo y ancho) en un directorio temporal y mide el
+tiempo de ambos modos. --latency simula un folder de red/OneDrive añadiendo una
+espera a cada listado de directorio.
+
+    python -m benchmarks.bench_walk --depth 4 --fanout 6 --files 20 --latency 0.002
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.tree import TreeSpec, make_tree
+from file_manager.walker import TreeWalker
+
+
+class LatentWalker(TreeWalker):
+    def __init__(self, latency: float, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+
+    def _scan(self, dir_path, depth, scope=None):
+        time.sleep(self.latency)
+        return super()._scan(dir_path, depth, scope)
+
+
+def timed(walker: TreeWalker, root: Path, repeat: int) -> tuple[float, list[str]]:
+    best = float("inf")
+    result: list[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = [entry.path for entry in walker.walk(root)]
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=6)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        spec = TreeSpec(
+            depth=args.depth,
+            fanout=args.fanout,
+            files_per_dir=args.files,
+            max_size=0,
+            duplicate_ratio=0,
+        )
+        n_files = make_tree(root, spec)["files"]
+        common = dict(latency=args.latency, max_depth=args.depth)
+
+        serial_t, serial = timed(LatentWalker(**common), root, args.repeat)
+        parallel_t, parallel = timed(
+            LatentWalker(workers=args.workers, **common), root, args.repeat
+        )
+        assert serial == parallel, "parallel walk must keep the serial order"
+
+    print(f"files: {n_files}  latency/listing: {args.latency * 1000:.1f} ms")
+    print(f"serial:              {serial_t:.3f} s")
+    print(f"parallel ({args.workers:>2} thr):   {parallel_t:.3f} s")
+    print(f"speedup:             {serial_t / parallel_t:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
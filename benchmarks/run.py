@@ -0,0 +1,214 @@
+"""
+Suite de benchmarks de FileManager sobre un árbol sintético (ver benchmarks/tree.py).
+Todo corre en un directorio local (usar --tmp /dev/shm para tmpfs), sin red.
+Los resultados salen en JSON para comparar entre versiones.
+
+    python -m benchmarks.run --depth 3 --fanout 4 --files 50 --output bench.json
+    python -m benchmarks.run --only collect_extension copy
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.tree import TreeSpec, make_tree
+from file_manager import ESNameBuilder, FileManager
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _load_delete_duplicated() -> Callable:
+    # scripts/ no es un paquete
+    spec = importlib.util.spec_from_file_location(
+        "delete_duplicated", ROOT / "scripts" / "delete_duplicated.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.delete_duplicated
+
+
+def _fm(tree: Path, depth: int) -> FileManager:
+    fm = FileManager()
+    fm.set_search_dir(tree)
+    fm.set_max_depth(depth)
+    return fm
+
+
+def _files(tree: Path, depth: int) -> list:
+    return [p for p in _fm(tree, depth).collect() if p.is_file()]
+
+
+# Cada escenario recibe (árbol, carpeta de trabajo, profundidad) y devuelve una
+# función a medir, que devuelve cuántos elementos procesó.
+# Los escenarios destructivos reciben una copia nueva del árbol en cada repetición.
+def collect_all(tree, work, depth):
+    fm = _fm(tree, depth)
+    return lambda: len(fm.collect())
+
+
+def collect_extension(tree, work, depth):
+    fm = _fm(tree, depth)
+    return lambda: len(fm.filter_by_extension(".xlsx").collect())
+
+
+def collect_regex_match(tree, work, depth):
+    fm = _fm(tree, depth)
+    return lambda: len(fm.filter_by_regex_match(r"^(?=.*Fracaso)").collect())
+
+
+def collect_regex_search(tree, work, depth):
+    fm = _fm(tree, depth)
+    return lambda: len(fm.filter_by_regex_search(r"\(\d+\)$").collect())
+
+
+def collect_names(tree, work, depth):
+    fm = _fm(tree, depth)
+    names = [f"informe_{i}" for i in range(50)]
+    return lambda: len(fm.filter_by_names(names).collect())
+
+
+def copy(tree, work, depth):
+    sources = list(tree.iterdir())
+    target = work / "copia"
+    return lambda: len(FileManager().copy(sources, target).copied)
+
+
+def delete(tree, work, depth):
+    files = _files(tree, depth)
+
+    def run():
+        FileManager().delete(files)
+        return len(files)
+
+    return run
+
+
+def rename(tree, work, depth):
+    files = _files(tree, depth)
+    builder = ESNameBuilder().replace("_", " ").smart_title()
+    return lambda: len(FileManager().rename(files, builder).mapping)
+
+
+def flatten(tree, work, depth):
+    return lambda: len(_fm(tree, depth).flatten().copied)
+
+
+def export_zip(tree, work, depth):
+    def run():
+        fm = _fm(tree, depth).filter_by_type("file")
+        return len(fm.export(work / "export.zip").added)
+
+    return run
+
+
+def delete_duplicated(tree, work, depth):
+    delete_duplicated = _load_delete_duplicated()
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            deleted, _cleaned = delete_duplicated(tree, max_depth=depth)
+        return len(deleted)
+
+    return run
+
+
+SCENARIOS = {
+    "collect_all": (collect_all, False),
+    "collect_extension": (collect_extension, False),
+    "collect_regex_match": (collect_regex_match, False),
+    "collect_regex_search": (collect_regex_search, False),
+    "collect_names": (collect_names, False),
+    "copy": (copy, True),
+    "delete": (delete, True),
+    "rename": (rename, True),
+    "flatten": (flatten, True),
+    "export_zip": (export_zip, False),
+    "delete_duplicated": (delete_duplicated, True),
+}
+
+
+def run_scenario(name: str, pristine: Path, tmp: Path, depth: int, repeat: int) -> dict:
+    setup, destructive = SCENARIOS[name]
+    times = []
+    items = 0
+    for i in range(repeat):
+        work = tmp / f"{name}_{i}"
+        work.mkdir()
+        tree = pristine
+        if destructive:
+            tree = work / "arbol"
+            shutil.copytree(pristine, tree)
+        fn = setup(tree, work, depth)
+        start = time.perf_counter()
+        items = fn()
+        times.append(time.perf_counter() - start)
+        shutil.rmtree(work)
+    return {
+        "name": name,
+        "items": items,
+        "best_s": min(times),
+        "mean_s": sum(times) / len(times),
+        "times_s": times,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--max-size", type=int, default=4096)
+    parser.add_argument("--duplicates", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", choices=list(SCENARIOS))
+    parser.add_argument("--tmp", type=Path, default=None, help="e.g. /dev/shm")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    spec = TreeSpec(
+        depth=args.depth,
+        fanout=args.fanout,
+        files_per_dir=args.files,
+        max_size=args.max_size,
+        duplicate_ratio=args.duplicates,
+        seed=args.seed,
+    )
+    with tempfile.TemporaryDirectory(dir=args.tmp) as tmp:
+        tmp = Path(tmp)
+        pristine = tmp / "pristine"
+        pristine.mkdir()
+        tree_counts = make_tree(pristine, spec)
+        results = [
+            run_scenario(name, pristine, tmp, args.depth, args.repeat)
+            for name in (args.only or SCENARIOS)
+        ]
+
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "tree": {**spec.as_dict(), **tree_counts},
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
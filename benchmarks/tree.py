@@ -0,0 +1,93 @@
+"""
+Generador de árboles sintéticos para los benchmarks. Con la misma semilla y los
+mismos parámetros se genera siempre el mismo árbol (nombres, tamaños y contenido).
+"""
+
+import random
+from pathlib import Path
+
+WORDS = [
+    "informe",
+    "cuentas",
+    "acta",
+    "nota",
+    "ficha",
+    "resumen",
+    "Fracaso",
+    "sesion",
+    "de",
+    "la",
+    "actualidad",
+    "prospectivo",
+]
+# Extensiones con su peso relativo
+EXTENSIONS = {".xlsx": 5, ".docx": 4, ".pdf": 3, ".txt": 2, ".csv": 1, ".pptx": 1}
+
+
+class TreeSpec:
+    def __init__(
+        self,
+        depth: int = 3,
+        fanout: int = 4,
+        files_per_dir: int = 20,
+        min_size: int = 0,
+        max_size: int = 4096,
+        duplicate_ratio: float = 0.05,
+        words_per_name: tuple[int, int] = (1, 4),
+        seed: int = 0,
+    ):
+        """
+        Args:
+            depth (int): Folder levels below the root.
+            fanout (int): Subfolders per folder.
+            files_per_dir (int): Files per folder (duplicates not included).
+            min_size / max_size (int): File size range in bytes (uniform).
+            duplicate_ratio (float): Share of files that get an "x (n).ext" copy
+                with the same content next to them.
+            words_per_name (tuple): Range of words in each name.
+            seed (int): Random seed.
+        """
+        self.depth = depth
+        self.fanout = fanout
+        self.files_per_dir = files_per_dir
+        self.min_size = min_size
+        self.max_size = max_size
+        self.duplicate_ratio = duplicate_ratio
+        self.words_per_name = words_per_name
+        self.seed = seed
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+def make_tree(root: Path, spec: TreeSpec) -> dict:
+    """Creates the tree under root. Returns counts of what was created."""
+    rng = random.Random(spec.seed)
+    extensions, weights = list(EXTENSIONS), list(EXTENSIONS.values())
+    counts = {"dirs": 0, "files": 0, "duplicates": 0, "bytes": 0}
+
+    level = [root]
+    for d in range(spec.depth + 1):
+        next_level = []
+        for folder in level:
+            for i in range(spec.files_per_dir):
+                words = rng.randint(*spec.words_per_name)
+                stem = "_".join(rng.choice(WORDS) for _ in range(words)) + f"_{i}"
+                ext = rng.choices(extensions, weights)[0]
+                data = rng.randbytes(rng.randint(spec.min_size, spec.max_size))
+                (folder / f"{stem}{ext}").write_bytes(data)
+                counts["files"] += 1
+                counts["bytes"] += len(data)
+                if rng.random() < spec.duplicate_ratio:
+                    n = rng.randint(1, 12)
+                    (folder / f"{stem} ({n}){ext}").write_bytes(data)
+                    counts["duplicates"] += 1
+                    counts["bytes"] += len(data)
+            if d < spec.depth:
+                for j in range(spec.fanout):
+                    sub = folder / f"carpeta {rng.choice(WORDS)} {j}"
+                    sub.mkdir()
+                    next_level.append(sub)
+                    counts["dirs"] += 1
+        level = next_level
+    return counts
@@ -1,4 +1,15 @@
-from .file_manager import FileManager
-from .name_builder import ESNameBuilder
+# FileManager y ESNameBuilder se importan al pedirlos (PEP 562), así
+# "python -m file_manager.cli" no carga toda la librería antes de parsear argumentos
+__all__ = ["FileManager", "ESNameBuilder"]
 
-__all__ = ["FileManager", "ESNameBuilder"]
\ No newline at end of file
+
+def __getattr__(name: str):
+    if name == "FileManager":
+        from .file_manager import FileManager
+
+        return FileManager
+    if name == "ESNameBuilder":
+        from .name_builder import ESNameBuilder
+
+        return ESNameBuilder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
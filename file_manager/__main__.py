@@ -0,0 +1,8 @@
+import sys
+
+from .cli import main
+
+# Sin esto, los procesos del pool de find --content (spawn/forkserver) volverían a
+# ejecutar el comando al importar el módulo principal
+if __name__ == "__main__":
+    sys.exit(main())
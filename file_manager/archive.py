@@ -0,0 +1,591 @@
+import os
+import stat
+import struct
+import tarfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from .stats import OperationStats
+
+# Extensión -> formato. El formato se deduce del nombre del archivo de salida
+FORMATS = {
+    ".zip": "zip",
+    ".tar": "tar",
+    ".tar.gz": "tar.gz",
+    ".tgz": "tar.gz",
+    ".tar.zst": "tar.zst",
+    ".tzst": "tar.zst",
+}
+DEFAULT_LEVELS = {"zip": 6, "tar": 0, "tar.gz": 6, "tar.zst": 3}
+# Bytes de entrada por tarea de compresión: en memoria hay como mucho
+# 4 * workers bloques (entrada + salida)
+CHUNK_SIZE = 1 << 20
+# Ventana de deflate: cada bloque se comprime con los últimos 32 KiB del anterior
+# como diccionario, así cortar en bloques casi no empeora la compresión (pigz)
+WINDOW = 32 << 10
+# Como zipfile: por encima de esto un miembro o un offset necesita ZIP64
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+# Ceros al final del tar: dos bloques, completando registros de 10 KiB como tarfile
+TAR_END = 2 * tarfile.BLOCKSIZE
+TAR_TRAILER = TAR_END + tarfile.RECORDSIZE
+
+
+def _zstd_compress() -> Optional[Callable[[bytes, int], bytes]]:
+    try:
+        from compression import zstd  # Python 3.14+
+
+        return lambda data, level: zstd.compress(data, level)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return lambda data, level: zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _deflate(data: bytes, level: int, zdict: bytes, last: bool) -> bytes:
+    """
+    Raw deflate of one block of a stream. The blocks of a stream end with a sync
+    flush (the last one with finish), so their outputs can be concatenated.
+    """
+    if zdict:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=zdict)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    data = compressor.compress(data)
+    return data + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def _dos_time(mtime: float) -> tuple[int, int]:
+    t = time.localtime(mtime)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1
+    year = min(t.tm_year, 2107) - 1980
+    return (
+        (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+        (year << 9) | (t.tm_mon << 5) | t.tm_mday,
+    )
+
+
+def _zip_flags(member: "_ZipMember") -> int:
+    # Bit 11: nombre en UTF-8
+    return 0 if member.name.isascii() else 0x800
+
+
+class ArchiveResult:
+    def __init__(self):
+        """
+        Attributes:
+            archives (list): Archives written, one per part.
+            added (list): Paths stored in the archives.
+            skipped (list): Paths that are not files or folders (sockets, FIFOs...).
+            errors (dict): {path: error} of what couldn't be read. A file that
+                fails half way is left out of a zip; in a tar it is padded with
+                zeros up to its size, like GNU tar does.
+            bytes_read (int): File data read.
+            bytes_written (int): Size of the archives.
+        """
+        self.archives: list[Path] = []
+        self.added: list[Path] = []
+        self.skipped: list[Path] = []
+        self.errors: dict[Path, Exception] = {}
+        self.bytes_read: int = 0
+        self.bytes_written: int = 0
+        self.elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes read per second."""
+        return self.bytes_read / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"ArchiveResult(archives={len(self.archives)}, added={len(self.added)}, "
+            f"errors={len(self.errors)}, {self.bytes_read / 1e6:.1f} MB -> "
+            f"{self.bytes_written / 1e6:.1f} MB, {self.throughput / 1e6:.1f} MB/s)"
+        )
+
+
+class _ZipMember:
+    __slots__ = (
+        "path",
+        "name",
+        "is_dir",
+        "mode",
+        "mtime",
+        "zip64",
+        "offset",
+        "data_start",
+        "crc",
+        "size",
+        "compress_size",
+        "error",
+    )
+
+    def __init__(self, path: Path, name: bytes, st: os.stat_result, is_dir: bool):
+        self.path = path
+        self.name = name
+        self.is_dir = is_dir
+        self.mode = st.st_mode
+        self.mtime = st.st_mtime
+        self.zip64 = not is_dir and st.st_size > ZIP64_LIMIT
+        self.offset = 0
+        self.data_start = 0
+        self.crc = 0
+        self.size = 0
+        self.compress_size = 0
+        self.error: Optional[Exception] = None
+
+    def header_size(self) -> int:
+        return 30 + len(self.name) + (20 if self.zip64 else 0)
+
+    def central_size(self) -> int:
+        return 46 + len(self.name) + 28
+
+
+class BulkArchiver:
+    def __init__(
+        self,
+        format: str = "zip",
+        workers: int = 4,
+        level: Optional[int] = None,
+        max_size: Optional[int] = None,
+        base_dir: Optional[str | Path] = None,
+        stats: Optional[OperationStats] = None,
+    ):
+        """
+        Streams files into zip or tar (.gz, .zst) archives, compressing on a pool
+        of threads.
+
+        Files are read once, in order, in blocks of CHUNK_SIZE. Each block is
+        compressed by a worker (zlib and zstd release the GIL) and written in
+        order as soon as it is ready, like pigz: big files are compressed in
+        parallel too, and only a few blocks per worker are in memory at a time,
+        whatever the size of the input. No temporary copies of the files are made.
+        Zip members are independent deflate streams; .tar.gz is one gzip
+        stream per archive and .tar.zst one zstd frame per block.
+
+        Args:
+            format (str): "zip", "tar", "tar.gz" or "tar.zst". tar.zst needs
+                Python 3.14 (compression.zstd) or the zstandard package.
+            workers (int): Blocks compressed at the same time.
+            level (int): Compression level. 6 for deflate, 3 for zstd by default.
+            max_size (int): Split the output in archives of at most this many
+                bytes: target-001.zip, target-002.zip... Each one is a complete
+                archive. A file goes to the next archive unless it fits even
+                without compressing, so a file bigger than max_size gets an
+                archive of its own (which can be bigger than max_size).
+            base_dir (str | Path): Names in the archive are relative to this
+                folder. Paths outside of it (or all, without base_dir) keep
+                their path without the root, like tar.
+            stats (OperationStats): Counts added, bytes_read, bytes_written,
+                archives and errors, and the time of the "archive" phase.
+        """
+        if format not in DEFAULT_LEVELS:
+            raise ValueError(f"format must be one of {list(DEFAULT_LEVELS)}")
+        self.format = format
+        self.workers = max(1, workers)
+        self.level = DEFAULT_LEVELS[format] if level is None else level
+        self.max_size = max_size
+        self.base_dir = None if base_dir is None else os.path.abspath(base_dir)
+        self.stats = stats
+        self._zstd = None
+        if format == "tar.zst":
+            self._zstd = _zstd_compress()
+            if self._zstd is None:
+                raise ImportError(
+                    "tar.zst needs Python 3.14 (compression.zstd) or zstandard"
+                )
+
+    @staticmethod
+    def format_of(target: str | Path) -> str:
+        """'backup.tar.gz' -> 'tar.gz'."""
+        name = os.fspath(target).lower()
+        for extension, format in FORMATS.items():
+            if name.endswith(extension):
+                return format
+        raise ValueError(f"unknown archive extension: {target}")
+
+    def export(self, paths: Iterable[str | Path], target: str | Path) -> ArchiveResult:
+        """
+        Writes every path (files and folder entries; folders are not walked) to
+        target, or to numbered parts of it with max_size. Each archive is written
+        to a ".tmp" file next to it and renamed when it is complete.
+        """
+        self._result = result = ArchiveResult()
+        self._target = Path(target)
+        start = time.perf_counter()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        # Escrituras en orden: bytes, Futures de bytes o funciones, con la cota de
+        # bytes que pueden escribir
+        self._queue: deque[tuple[bytes | Future | Callable, int]] = deque()
+        self._outputs: set[str] = set()
+        self._pending = 0
+        self._file = None
+        try:
+            self._open_part()
+            for path in paths:
+                path = Path(path)
+                absolute = os.path.abspath(path)
+                # El archivo no se agrega a sí mismo si está dentro de lo exportado
+                if absolute not in self._outputs:
+                    self._add(path, absolute)
+            self._close_part()
+        except BaseException:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            if self._file is not None:
+                self._file.close()
+                os.unlink(self._file.name)
+            raise
+        self._pool.shutdown()
+
+        result.elapsed = time.perf_counter() - start
+        if self.stats is not None:
+            self.stats.add_time("archive", result.elapsed)
+            self.stats.count("added", len(result.added))
+            self.stats.count("bytes_read", result.bytes_read)
+            self.stats.count("bytes_written", result.bytes_written)
+            self.stats.count("archives", len(result.archives))
+            self.stats.count("errors", len(result.errors))
+        return result
+
+    # -----------------------------------------
+    # --------  Parts
+    # -----------------------------------------
+
+    def _part_path(self, number: int) -> Path:
+        if self.max_size is None:
+            return self._target
+        name = self._target.name
+        extension = next(
+            (e for e in FORMATS if name.lower().endswith(e)), self._target.suffix
+        )
+        stem = name[: len(name) - len(extension)]
+        return self._target.with_name(f"{stem}-{number:03d}{extension}")
+
+    def _open_part(self):
+        path = os.path.abspath(self._part_path(len(self._result.archives) + 1))
+        self._outputs.update((path, f"{path}.tmp"))
+        self._file = open(f"{path}.tmp", "wb")
+        self._written = 0
+        self._members = 0
+        # zip: entradas del directorio central; tar: estado del stream comprimido
+        self._central: list[_ZipMember] = []
+        self._buffer = bytearray()
+        self._crc = 0
+        self._total = 0
+        self._window = b""
+        if self.format == "zip":
+            self._trailer = 22 + 56 + 20
+        else:
+            self._trailer = self._bound(TAR_TRAILER) + 8
+        if self.format == "tar.gz":
+            mtime = struct.pack("<I", int(time.time()) & 0xFFFFFFFF)
+            self._put(b"\x1f\x8b\x08\x00" + mtime + b"\x00\xff", 10)
+
+    def _close_part(self):
+        if self.format == "zip":
+            self._drain(0)
+            self._write_central()
+        else:
+            self._tar_feed(bytes(TAR_END))
+            padding = -(self._total + len(self._buffer)) % tarfile.RECORDSIZE
+            self._tar_feed(bytes(padding))
+            self._tar_emit(last=True)
+            self._drain(0)
+        file, self._file = self._file, None
+        file.close()
+        path = self._part_path(len(self._result.archives) + 1)
+        os.replace(file.name, path)
+        self._result.archives.append(path)
+        self._result.bytes_written += self._written
+
+    def _estimate(self) -> int:
+        """Upper bound of the size of the current archive if it is closed now."""
+        return (
+            self._written
+            + self._pending
+            + self._bound(len(self._buffer))
+            + self._trailer
+        )
+
+    def _fits(self, size: int) -> bool:
+        """
+        Whether size more bytes fit in the current archive; otherwise it is closed
+        and a new one is opened. The estimate counts every block in flight at its
+        worst size, so when it doesn't fit the blocks are written first and the
+        real size is checked.
+        """
+        if self.max_size is None or not self._members:
+            return True
+        if self._estimate() + size <= self.max_size:
+            return True
+        if self.format != "zip":
+            self._tar_emit(last=False)
+        self._drain(0)
+        if self._estimate() + size <= self.max_size:
+            return True
+        self._close_part()
+        self._open_part()
+        return False
+
+    def _bound(self, size: int) -> int:
+        """Maximum compressed size of size bytes (deflate or zstd, in blocks)."""
+        if self.format == "tar":
+            return size
+        return size + (size >> 8) + 128 * (size // CHUNK_SIZE + 1)
+
+    # -----------------------------------------
+    # --------  Pipeline
+    # -----------------------------------------
+
+    def _put(self, item: bytes | Future | Callable, bound: int):
+        self._queue.append((item, bound))
+        self._pending += bound
+        self._drain(4 * self.workers)
+
+    def _drain(self, limit: int):
+        """Writes queued items, oldest first, until at most limit are left."""
+        while len(self._queue) > limit:
+            item, bound = self._queue.popleft()
+            if isinstance(item, Future):
+                item = item.result()
+            if callable(item):
+                item()
+            else:
+                self._file.write(item)
+                self._written += len(item)
+            self._pending -= bound
+
+    # -----------------------------------------
+    # --------  Members
+    # -----------------------------------------
+
+    def _arcname(self, absolute: str) -> str:
+        if self.base_dir is not None:
+            relative = os.path.relpath(absolute, self.base_dir)
+            if not relative.startswith(os.pardir):
+                return relative.replace(os.sep, "/")
+        return os.path.splitdrive(absolute)[1].replace(os.sep, "/").lstrip("/")
+
+    def _add(self, path: Path, absolute: str):
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            self._result.errors[path] = e
+            return
+        is_dir = stat.S_ISDIR(st.st_mode)
+        if not is_dir and not stat.S_ISREG(st.st_mode):
+            self._result.skipped.append(path)
+            return
+        name = self._arcname(absolute) + ("/" if is_dir else "")
+        if self.format == "zip":
+            self._add_zip(path, name, st, is_dir)
+        else:
+            self._add_tar(path, name, st, is_dir)
+
+    def _read(self, path: Path, size: int) -> Iterable[bytes]:
+        """Blocks of the first size bytes of path. Errors go to the result."""
+        try:
+            with open(path, "rb", buffering=0) as file:
+                while size > 0 and (data := file.read(min(CHUNK_SIZE, size))):
+                    size -= len(data)
+                    self._result.bytes_read += len(data)
+                    yield data
+            if size > 0:
+                raise OSError(f"file shrank while reading, {size} bytes missing")
+        except OSError as e:
+            self._result.errors[path] = e
+
+    # ----- zip
+
+    def _add_zip(self, path: Path, name: str, st: os.stat_result, is_dir: bool):
+        member = _ZipMember(path, name.encode("utf-8", "surrogateescape"), st, is_dir)
+        size = 0 if is_dir else st.st_size
+        self._fits(member.header_size() + self._bound(size) + member.central_size())
+        self._members += 1
+        self._trailer += member.central_size()
+        self._put(lambda: self._zip_header(member), member.header_size())
+        if not is_dir:
+            # Se lee un bloque adelantado para saber cuál es el último
+            blocks = iter(self._read(path, size))
+            data, window = next(blocks, b""), b""
+            while True:
+                following = next(blocks, None)
+                member.crc = zlib.crc32(data, member.crc)
+                member.size += len(data)
+                last = following is None
+                future = self._pool.submit(_deflate, data, self.level, window, last)
+                self._put(future, self._bound(len(data)))
+                if last:
+                    break
+                window, data = data[-WINDOW:], following
+            member.error = self._result.errors.get(path)
+        self._put(lambda: self._zip_end(member), 0)
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._written += len(data)
+
+    def _zip_header(self, member: _ZipMember):
+        member.offset = self._written
+        dos_time, dos_date = _dos_time(member.mtime)
+        unknown = 0xFFFFFFFF if member.zip64 else 0
+        extra = struct.pack("<HHQQ", 1, 16, 0, 0) if member.zip64 else b""
+        header = struct.pack(
+            "<IHHHHHIIIHH",
+            0x04034B50,
+            45 if member.zip64 else 20,
+            _zip_flags(member),
+            0 if member.is_dir else zlib.DEFLATED,
+            dos_time,
+            dos_date,
+            0,
+            unknown,
+            unknown,
+            len(member.name),
+            len(extra),
+        )
+        self._write(header + member.name + extra)
+        member.data_start = self._written
+
+    def _zip_end(self, member: _ZipMember):
+        """Fills in the CRC and sizes in the local header, now that they are known."""
+        file = self._file
+        if member.error is not None:
+            # Un archivo a medias no queda en el zip
+            file.seek(member.offset)
+            file.truncate()
+            self._written = member.offset
+            return
+        member.compress_size = self._written - member.data_start
+        file.seek(member.offset + 14)
+        if member.zip64:
+            file.write(struct.pack("<I", member.crc))
+            file.seek(member.offset + 30 + len(member.name) + 4)
+            file.write(struct.pack("<QQ", member.size, member.compress_size))
+        else:
+            file.write(
+                struct.pack("<III", member.crc, member.compress_size, member.size)
+            )
+        file.seek(0, os.SEEK_END)
+        self._central.append(member)
+        self._result.added.append(member.path)
+
+    def _write_central(self):
+        start = self._written
+        for member in self._central:
+            sizes = [member.size, member.compress_size] if member.zip64 else []
+            offset = [member.offset] if member.offset > ZIP64_LIMIT else []
+            zip64 = sizes + offset
+            extra = b""
+            if zip64:
+                extra = struct.pack(f"<HH{len(zip64)}Q", 1, 8 * len(zip64), *zip64)
+            version = 45 if zip64 else 20
+            dos_time, dos_date = _dos_time(member.mtime)
+            record = struct.pack(
+                "<IHHHHHHIIIHHHHHII",
+                0x02014B50,
+                (3 << 8) | version,  # creado en Unix: los permisos van en attrs
+                version,
+                _zip_flags(member),
+                0 if member.is_dir else zlib.DEFLATED,
+                dos_time,
+                dos_date,
+                member.crc,
+                0xFFFFFFFF if sizes else member.compress_size,
+                0xFFFFFFFF if sizes else member.size,
+                len(member.name),
+                len(extra),
+                0,
+                0,
+                0,
+                ((member.mode & 0xFFFF) << 16) | (0x10 if member.is_dir else 0),
+                0xFFFFFFFF if offset else member.offset,
+            )
+            self._write(record + member.name + extra)
+
+        count, size = len(self._central), self._written - start
+        if count > ZIP_FILECOUNT_LIMIT or start > ZIP64_LIMIT or size > ZIP64_LIMIT:
+            end64 = self._written
+            self._write(
+                struct.pack(
+                    "<IQHHIIQQQQ",
+                    0x06064B50,
+                    44,
+                    45,
+                    45,
+                    0,
+                    0,
+                    count,
+                    count,
+                    size,
+                    start,
+                )
+            )
+            self._write(struct.pack("<IIQI", 0x07064B50, 0, end64, 1))
+            count, size, start = 0xFFFF, 0xFFFFFFFF, 0xFFFFFFFF
+        self._write(
+            struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, count, count, size, start, 0)
+        )
+
+    # ----- tar
+
+    def _add_tar(self, path: Path, name: str, st: os.stat_result, is_dir: bool):
+        info = tarfile.TarInfo(name.rstrip("/"))
+        info.type = tarfile.DIRTYPE if is_dir else tarfile.REGTYPE
+        info.size = 0 if is_dir else st.st_size
+        info.mode = stat.S_IMODE(st.st_mode)
+        # Un mtime float agregaría un header pax a cada archivo
+        info.mtime = int(st.st_mtime)
+        info.uid, info.gid = st.st_uid, st.st_gid
+        header = info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+        padding = -info.size % tarfile.BLOCKSIZE
+        self._fits(self._bound(len(header) + info.size + padding))
+        self._members += 1
+
+        self._tar_feed(header)
+        missing = info.size
+        for data in self._read(path, info.size) if not is_dir else ():
+            self._tar_feed(data)
+            missing -= len(data)
+        # El header ya declaró el tamaño: se completa con ceros, como GNU tar
+        while missing > 0:
+            zeros = min(missing, CHUNK_SIZE)
+            self._tar_feed(bytes(zeros))
+            missing -= zeros
+        self._tar_feed(bytes(padding))
+        if path not in self._result.errors:
+            self._result.added.append(path)
+
+    def _tar_feed(self, data: bytes):
+        self._buffer += data
+        while len(self._buffer) >= CHUNK_SIZE:
+            self._tar_emit(last=False, size=CHUNK_SIZE)
+
+    def _tar_emit(self, last: bool, size: Optional[int] = None):
+        """Sends size bytes of the buffer (all of it by default) to the stream."""
+        data = bytes(self._buffer[:size])
+        del self._buffer[: len(data)]
+        if not data and not last:
+            return
+        self._total += len(data)
+        if self.format == "tar":
+            self._put(data, len(data))
+        elif self.format == "tar.zst":
+            if data:
+                future = self._pool.submit(self._zstd, data, self.level)
+                self._put(future, self._bound(len(data)))
+        else:
+            self._crc = zlib.crc32(data, self._crc)
+            future = self._pool.submit(_deflate, data, self.level, self._window, last)
+            self._put(future, self._bound(len(data)))
+            self._window = (self._window + data)[-WINDOW:]
+            if last:
+                self._put(struct.pack("<II", self._crc, self._total & 0xFFFFFFFF), 8)
@@ -0,0 +1,281 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import aclosing
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Self,
+    Sequence,
+)
+
+from .copier import BulkCopier, CopyResult
+from .deleter import DeleteResult
+from .file_manager import FileManager
+from .name_builder import ESNameBuilder
+from .renamer import RenamePlan
+
+
+def _take(it: Iterator, n: int) -> list:
+    return list(islice(it, n))
+
+
+class AsyncFileManager:
+    def __init__(
+        self,
+        workers: int = 1,
+        max_concurrency: int = 8,
+        executor: Optional[Executor] = None,
+        batch_size: int = 256,
+    ):
+        """
+        asyncio version of FileManager. Blocking work runs on an executor, so the
+        event loop only waits on futures and several operations can share it.
+
+        Args:
+            workers (int): Threads listing directories (see FileManager).
+            max_concurrency (int): Files copied/deleted at the same time by one
+                operation. New work is only submitted when one finishes
+                (backpressure), so a big batch doesn't take over the executor.
+            executor (Executor): Executor to share between managers. By default one
+                is created with max_concurrency threads and shut down by aclose().
+            batch_size (int): Paths read from the walk per executor call in
+                iter_collect.
+        """
+        self.fm = FileManager(workers=workers)
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self._own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="file_manager"
+        )
+
+    async def aclose(self):
+        if self._own_executor:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.executor.shutdown
+            )
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def _run(self, func: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def _map_bounded(
+        self,
+        func: Callable,
+        items: AsyncIterable,
+        on_done: Callable[[object, asyncio.Future], None],
+    ):
+        """
+        Runs func(item) on the executor with at most max_concurrency calls in
+        flight. If the caller is cancelled, calls that didn't start are cancelled;
+        the ones already running in a thread finish on their own.
+        """
+        loop = asyncio.get_running_loop()
+        pending: dict[asyncio.Future, object] = {}
+        try:
+            async for item in items:
+                while len(pending) >= self.max_concurrency:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        on_done(pending.pop(future), future)
+                pending[loop.run_in_executor(self.executor, func, item)] = item
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    on_done(pending.pop(future), future)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    # -----------------------------------------
+    # --------  Configuration (same as FileManager)
+    # -----------------------------------------
+
+    def set_search_dir(self, search_dir: Path):
+        self.fm.set_search_dir(search_dir)
+
+    def set_max_depth(self, max_depth: int):
+        self.fm.set_max_depth(max_depth)
+
+    def set_follow_symlinks(self, follow_symlinks: bool):
+        self.fm.set_follow_symlinks(follow_symlinks)
+
+    def set_index(self, index_path: Optional[str | Path] = None):
+        self.fm.set_index(index_path)
+
+    def filter_by_extension(self, extension: str, filter_out: bool = False) -> Self:
+        self.fm.filter_by_extension(extension, filter_out)
+        return self
+
+    def filter_by_regex_match(self, regex: str, filter_out: bool = False) -> Self:
+        self.fm.filter_by_regex_match(regex, filter_out)
+        return self
+
+    def filter_by_regex_search(self, regex: str, filter_out: bool = False) -> Self:
+        self.fm.filter_by_regex_search(regex, filter_out)
+        return self
+
+    def filter_by_names(self, names: Sequence[str], filter_out: bool = False) -> Self:
+        self.fm.filter_by_names(names, filter_out)
+        return self
+
+    # -----------------------------------------
+    # --------  Operations
+    # -----------------------------------------
+
+    async def _iterate(self, it: Iterator) -> AsyncIterator:
+        """
+        Items of a blocking iterator, read on the executor in batches of
+        batch_size. The next batch is only read when the previous one was
+        consumed, so a slow consumer doesn't buffer the whole iterator.
+        """
+        future = None
+        try:
+            while True:
+                future = self.executor.submit(_take, it, self.batch_size)
+                batch = await asyncio.wrap_future(future)
+                if not batch:
+                    break
+                for item in batch:
+                    yield item
+        finally:
+            # El iterador no se puede cerrar mientras un thread lo está recorriendo:
+            # lo cierra ese thread al terminar el lote
+            if future is not None and not future.done():
+                future.add_done_callback(lambda _: it.close())
+            else:
+                try:
+                    self.executor.submit(it.close)
+                except RuntimeError:
+                    # Executor ya cerrado por aclose() (p.ej. el async for se
+                    # cerró después): nada más lo recorre, se cierra acá
+                    it.close()
+
+    async def iter_collect(self, clear_conditions: bool = True) -> AsyncIterator[Path]:
+        """
+        Async iterator over the matching paths. The walk runs on the executor in
+        batches of batch_size and only advances when the previous batch was
+        consumed, so a slow consumer doesn't buffer the whole tree.
+        """
+        it = await self._run(self.fm.iter_collect, clear_conditions)
+        async with aclosing(self._iterate(it)) as paths:
+            async for path in paths:
+                yield path
+
+    async def collect(self, clear_conditions: bool = True) -> list[Path]:
+        return [path async for path in self.iter_collect(clear_conditions)]
+
+    async def copy(
+        self,
+        paths: list[Path],
+        target_dir: Path,
+        preserve_metadata: bool = False,
+        skip_unchanged: bool = False,
+    ) -> CopyResult:
+        """
+        Async FileManager.copy. Errors are reported per path in the result. The
+        plan (BulkCopier.plan) is read on the executor in batches as copies
+        finish, so big trees are never listed in memory at once.
+        """
+        copier = BulkCopier(
+            preserve_metadata=preserve_metadata, skip_unchanged=skip_unchanged
+        )
+        result = CopyResult()
+        start = time.perf_counter()
+        target = Path(target_dir)
+        await self._run(target.mkdir, parents=True, exist_ok=True)
+
+        pairs = copier.plan(paths, target, result)
+        async with aclosing(self._iterate(pairs)) as items:
+            await self._map_bounded(
+                lambda pair: copier.copy_file(*pair),
+                items,
+                lambda pair, future: result.record(pair[0], future),
+            )
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    async def delete(
+        self, paths: list[Path], trash_dir: Optional[str | Path] = None
+    ) -> DeleteResult:
+        """
+        Async FileManager.delete: files, links and folder trees, or moved to
+        trash_dir. The whole batch runs on the executor with a BulkDeleter of
+        max_concurrency threads; as in the sync version a failure is reported in
+        the result without stopping the batch.
+
+        Cancelling the caller stops the batch: tasks that didn't start are
+        skipped, the ones running finish, and then CancelledError is raised.
+        """
+        cancel = threading.Event()
+        future = asyncio.ensure_future(
+            self._run(
+                self.fm.delete,
+                paths,
+                trash_dir=trash_dir,
+                workers=self.max_concurrency,
+                cancel=cancel,
+            )
+        )
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancel.set()
+            # Se espera a que paren los threads: al volver ya no se borra nada
+            await asyncio.wait([future])
+            raise
+
+    async def rename(
+        self,
+        paths: list[Path],
+        mapping: dict[str, str] | ESNameBuilder,
+        dry_run: bool = False,
+        journal_path: Optional[Path] = None,
+    ) -> RenamePlan:
+        """
+        Async FileManager.rename. The renames run one after the other in a single
+        executor call (their order matters); if the caller is cancelled the batch
+        still finishes, and the journal keeps it recoverable in any case.
+        """
+        return await self._run(
+            self.fm.rename, paths, mapping, dry_run=dry_run, journal_path=journal_path
+        )
+
+    async def find_duplicates(self, paths: list[Path]) -> list[list[Path]]:
+        return await self._run(self.fm.find_duplicates, paths)
+
+    async def create_files(
+        self,
+        files: Iterable[str | Path],
+        target_dir: Path,
+        size: int = 0,
+        sparse: bool = True,
+        template_file: Optional[Path] = None,
+    ) -> list[Path]:
+        return await self._run(
+            self.fm.create_files,
+            list(files),
+            target_dir,
+            size=size,
+            sparse=sparse,
+            template_file=template_file,
+        )
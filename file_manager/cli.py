@@ -1 +1,611 @@
-# Should work just like touch main.py
\ No newline at end of file
+"""
+Command line interface: python -m file_manager <command> ...
+
+    python -m file_manager find ~/Descargas -e .xlsx -d 3 -0 | xargs -0 ls -l
+    python -m file_manager find . -e .pdf -0 | python -m file_manager copy -0 - /backup
+    python -m file_manager find src -e .py -d 10 -g "TODO|FIXME"
+    python -m file_manager find . -d 20 --ignore-file .gitignore --prune .git
+    python -m file_manager find build -m "^tmp" -d 2 -0 | python -m file_manager rm -0 -
+    python -m file_manager find . -e .pdf -0 | python -m file_manager export -0 - pdfs.zip
+    python -m file_manager sync ~/Documentos /mnt/backup/Documentos --delete
+    python -m file_manager dedupe ~/Descargas -d 5 --dry-run
+    python -m file_manager dedupe ~/Descargas --similar-names
+    python -m file_manager rename *.xlsx -s lower -s "replace:_: " -s smart_title
+    python -m file_manager flatten ./fotos -p "*.jpg" --mode hardlink
+
+Only argparse and the modules a command needs are imported, and the library
+modules are loaded lazily (see file_manager/__init__.py), so a run starts fast.
+Paths are written as they are found, one per line or NUL-terminated with -0.
+"""
+
+import argparse
+import os
+import sys
+from typing import Callable, Iterable, Iterator, Optional
+
+
+def _write_paths(paths: Iterable, null: bool):
+    """Streams paths to stdout as bytes, so any file name survives the pipe."""
+    out = sys.stdout.buffer
+    end = b"\0" if null else b"\n"
+    # En un pipe se escribe por bloques; en la terminal, una línea por vez
+    flush = sys.stdout.isatty()
+    for path in paths:
+        out.write(os.fsencode(path) + end)
+        if flush:
+            out.flush()
+    out.flush()
+
+
+# Bytes leídos de stdin por vez: las rutas salen apenas se completan
+STDIN_CHUNK = 64 * 1024
+
+
+def _read_paths(sources: list[str], null: bool) -> Iterator[str]:
+    """
+    Positional paths, where "-" means: read them from stdin. stdin is read in
+    chunks and each path is yielded as soon as its separator arrives, so a pipe
+    (find ... -print0 | file_manager rm -0 -) is processed while it is produced.
+    """
+    sep = b"\0" if null else b"\n"
+    for source in sources:
+        if source != "-":
+            yield source
+            continue
+        stdin = sys.stdin.buffer
+        rest = b""
+        # read1 devuelve lo que haya disponible, sin esperar a llenar el bloque
+        while chunk := stdin.read1(STDIN_CHUNK):
+            *complete, rest = (rest + chunk).split(sep)
+            for raw in complete:
+                if raw:
+                    yield os.fsdecode(raw)
+        if rest:
+            yield os.fsdecode(rest)
+
+
+def _size(text: str) -> int:
+    """'1500', '10K', '2.5G' -> bytes."""
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+    text = text.strip().upper().removesuffix("B")
+    try:
+        if text and text[-1] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {text!r}") from None
+
+
+def _error(message: str):
+    print(f"file_manager: {message}", file=sys.stderr)
+
+
+def _file_manager(args: argparse.Namespace, search_dir: str):
+    from .file_manager import FileManager
+
+    fm = FileManager(workers=args.jobs or 1)
+    fm.set_search_dir(search_dir)
+    fm.set_max_depth(args.max_depth)
+    fm.set_follow_symlinks(args.follow_symlinks)
+    if getattr(args, "ignore", None) or getattr(args, "ignore_file", None):
+        fm.set_ignore(args.ignore, args.ignore_file)
+    if getattr(args, "prune", None):
+        fm.prune_dirs(*args.prune)
+    return fm
+
+
+# -----------------------------------------
+# --------  Commands
+# -----------------------------------------
+
+
+def cmd_find(args: argparse.Namespace) -> int:
+    fm = _file_manager(args, args.search_dir)
+    for extension in args.extension:
+        fm.filter_by_extension(extension)
+    for extension in args.exclude_extension:
+        fm.filter_by_extension(extension, filter_out=True)
+    if args.name:
+        fm.filter_by_names(args.name)
+    for regex in args.match:
+        fm.filter_by_regex_match(regex)
+    for regex in args.search:
+        fm.filter_by_regex_search(regex)
+    for regex in args.exclude:
+        fm.filter_by_regex_search(regex, filter_out=True)
+    if args.type:
+        fm.filter_by_type({"f": "file", "d": "dir", "l": "symlink"}[args.type])
+    if args.min_size is not None or args.max_size is not None:
+        fm.filter_by_size(args.min_size, args.max_size)
+    if args.newer is not None or args.older is not None:
+        from datetime import timedelta
+
+        fm.filter_by_mtime(
+            after=None if args.newer is None else timedelta(days=args.newer),
+            before=None if args.older is None else timedelta(days=args.older),
+        )
+    for regex in args.content:
+        fm.filter_by_content(
+            os.fsencode(regex), ignore_case=args.ignore_case, workers=args.procs
+        )
+
+    if args.top:
+        paths = fm.top_k(args.top, by=args.by, largest=not args.reverse)
+    elif args.sort:
+        paths = fm.sort_by(args.sort, reverse=args.reverse)
+    else:
+        paths = fm.iter_collect()
+    if args.limit:
+        from itertools import islice
+
+        paths = islice(paths, args.limit)
+    _write_paths(paths, args.null)
+    return 0
+
+
+def cmd_copy(args: argparse.Namespace) -> int:
+    from .copier import BulkCopier
+
+    copier = BulkCopier(
+        workers=args.jobs or 8,
+        preserve_metadata=args.preserve,
+        skip_unchanged=args.update,
+        mode=args.mode,
+    )
+    result = copier.copy(_read_paths(args.sources, args.null), args.target)
+    if args.verbose:
+        _write_paths(result.copied, args.null)
+    for path, error in result.errors.items():
+        _error(f"{path}: {error}")
+    print(result, file=sys.stderr)
+    return 1 if result.errors else 0
+
+
+def cmd_sync(args: argparse.Namespace) -> int:
+    fm = _file_manager(args, args.source)
+    for extension in args.exclude_extension:
+        fm.filter_by_extension(extension, filter_out=True)
+    for regex in args.exclude:
+        fm.filter_by_regex_search(regex, filter_out=True)
+    result = fm.sync(
+        args.target,
+        delete_extras=args.delete,
+        dry_run=args.dry_run,
+        modify_window=args.modify_window,
+        workers=args.jobs or 8,
+    )
+    if args.dry_run:
+        if diff := result.plan.diff():
+            print(diff)
+        print(result.plan, file=sys.stderr)
+    else:
+        print(result, file=sys.stderr)
+    for path, error in result.errors.items():
+        _error(f"{path}: {error}")
+    return 1 if result.errors else 0
+
+
+def cmd_rm(args: argparse.Namespace) -> int:
+    from .deleter import BulkDeleter
+
+    deleter = BulkDeleter(workers=args.jobs or 8, trash_dir=args.trash)
+    result = deleter.delete(_read_paths(args.paths, args.null))
+    if args.verbose:
+        _write_paths(result.deleted, args.null)
+    for path, error in result.errors.items():
+        _error(f"{path}: {error}")
+    print(result, file=sys.stderr)
+    return 1 if result.errors else 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    from .archive import BulkArchiver
+
+    archiver = BulkArchiver(
+        args.format or BulkArchiver.format_of(args.target),
+        workers=args.jobs or 4,
+        level=args.level,
+        max_size=args.max_size,
+        base_dir=args.base_dir,
+    )
+    result = archiver.export(_read_paths(args.sources, args.null), args.target)
+    if args.verbose:
+        _write_paths(result.added, args.null)
+    for path, error in result.errors.items():
+        _error(f"{path}: {error}")
+    print(result, file=sys.stderr)
+    return 1 if result.errors else 0
+
+
+def cmd_dedupe(args: argparse.Namespace) -> int:
+    from .dedupe import (
+        DuplicateFinder,
+        clean_copy_name,
+        clean_numbered_name,
+        plan_dedupe,
+        plan_name_cleanup,
+        prefer_original,
+        prefer_unnumbered,
+    )
+
+    fm = _file_manager(args, args.search_dir)
+    files = [p for p in fm.iter_collect() if p.is_file()]
+    finder = DuplicateFinder(workers=args.jobs or 4)
+    keep, clean = prefer_unnumbered, clean_numbered_name
+    if args.similar_names:
+        from .clusters import NameClusterer, within_clusters
+
+        # Solo se leen los archivos con nombres parecidos
+        clusters = NameClusterer(args.similar_names).cluster(files)
+        candidates = [path for cluster in clusters for path in cluster]
+        groups = within_clusters(finder.find(candidates), clusters)
+        keep, clean = prefer_original, clean_copy_name
+    else:
+        groups = finder.find(files)
+    to_delete = plan_dedupe(groups, keep)
+    # Se listan aunque no se borren, para usar la salida en un pipe con --dry-run
+    _write_paths(to_delete, args.null)
+
+    failed = len(finder.errors)
+    for path, error in finder.errors.items():
+        _error(f"{path}: {error}")
+    if args.dry_run:
+        return 1 if failed else 0
+
+    for path in to_delete:
+        try:
+            path.unlink()
+        except OSError as e:
+            _error(f"{path}: {e}")
+            failed += 1
+    if args.clean_names:
+        for path, new in plan_name_cleanup(files, to_delete, clean).items():
+            try:
+                path.rename(new)
+            except OSError as e:
+                _error(f"{path}: {e}")
+                failed += 1
+    return 1 if failed else 0
+
+
+def _char(text: str) -> str:
+    if len(text) != 1:
+        raise ValueError(f"expected one character, got {text!r}")
+    return text
+
+
+# Pasos que acepta "rename -s": nombre -> (argumentos obligatorios, conversión de
+# cada argumento). Solo los que transforman un str en otro str
+RENAME_STEPS: dict[str, tuple[int, tuple[Callable[[str], object], ...]]] = {
+    "capitalize": (0, ()),
+    "casefold": (0, ()),
+    "lower": (0, ()),
+    "swapcase": (0, ()),
+    "title": (0, ()),
+    "upper": (0, ()),
+    "strip": (0, (str,)),
+    "lstrip": (0, (str,)),
+    "rstrip": (0, (str,)),
+    "removeprefix": (1, (str,)),
+    "removesuffix": (1, (str,)),
+    "replace": (2, (str, str)),
+    "center": (1, (int, _char)),
+    "ljust": (1, (int, _char)),
+    "rjust": (1, (int, _char)),
+    "zfill": (1, (int,)),
+    "expandtabs": (0, (int,)),
+    "filter": (1, (str,)),
+    "keep_after": (0, (str,)),
+    "normalize_spaces_lower": (0, ()),
+    "remove_copy_markers": (0, ()),
+    "strip_accents": (0, ()),
+}
+# Pasos que reciben todos sus argumentos como una sola lista de palabras
+RENAME_WORD_STEPS = frozenset({"add_dash_after_keywords", "smart_title"})
+
+
+def _builder(steps: list[str]):
+    """
+    ["lower", "replace:_: ", "center:30:*"] -> ESNameBuilder().lower()
+    .replace("_", " ").center(30, "*"). Arguments go after the step name, split by
+    ":", and are converted to the type the step expects (see RENAME_STEPS).
+
+    Raises:
+        ValueError: unknown step, wrong number of arguments or invalid argument.
+    """
+    from .name_builder import ESNameBuilder
+
+    builder = ESNameBuilder()
+    for step in steps:
+        name, *step_args = step.split(":")
+        if name in RENAME_WORD_STEPS:
+            getattr(builder, name)(*([tuple(step_args)] if step_args else []))
+            continue
+        if name not in RENAME_STEPS:
+            known = ", ".join(sorted(RENAME_STEPS.keys() | RENAME_WORD_STEPS))
+            raise ValueError(f"unknown rename step {name!r} (known: {known})")
+        required, converters = RENAME_STEPS[name]
+        if not required <= len(step_args) <= len(converters):
+            expected = (
+                str(required)
+                if required == len(converters)
+                else f"{required} to {len(converters)}"
+            )
+            raise ValueError(
+                f"rename step {name!r} takes {expected} arguments, got {len(step_args)}"
+            )
+        try:
+            values = [conv(arg) for conv, arg in zip(converters, step_args)]
+        except ValueError as e:
+            raise ValueError(f"rename step {step!r}: {e}") from None
+        getattr(builder, name)(*values)
+    return builder
+
+
+def cmd_rename(args: argparse.Namespace) -> int:
+    from pathlib import Path
+
+    from .renamer import plan_renames
+
+    paths = [Path(p) for p in _read_paths(args.paths, args.null)]
+    if not args.step:
+        raise SystemExit("file_manager: rename needs at least one --step")
+    plan = plan_renames(paths, _builder(args.step))
+    if args.dry_run or plan.collisions:
+        if plan.mapping:
+            print(plan.diff())
+        for target, sources in plan.collisions.items():
+            _error(f"{target.name} is wanted by {len(sources)} files or already exists")
+        return 1 if plan.collisions else 0
+    plan.execute(args.journal)
+    _write_paths(plan.mapping.values(), args.null)
+    return 0
+
+
+def cmd_flatten(args: argparse.Namespace) -> int:
+    fm = _file_manager(args, args.base_dir)
+    result = fm.flatten(pattern=args.pattern, mode=args.mode, workers=args.jobs or 8)
+    if args.verbose:
+        _write_paths(result.copied, args.null)
+    for path, error in result.errors.items():
+        _error(f"{path}: {error}")
+    print(result, file=sys.stderr)
+    return 1 if result.errors else 0
+
+
+def cmd_touch(args: argparse.Namespace) -> int:
+    from .file_creator import FileCreator
+
+    FileCreator(workers=args.jobs or 8).create_files(args.files, args.target_dir)
+    return 0
+
+
+# -----------------------------------------
+# --------  Parser
+# -----------------------------------------
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="file_manager", description="Find, copy, dedupe and rename files."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Opciones compartidas
+    jobs = argparse.ArgumentParser(add_help=False)
+    jobs.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="threads used to list folders (default 1), copy/remove (8) or hash and"
+        " compress (4)",
+    )
+    walk = argparse.ArgumentParser(add_help=False)
+    walk.add_argument(
+        "-d",
+        "--max-depth",
+        type=int,
+        default=0,
+        help="folder levels to descend (0: only the given folder)",
+    )
+    walk.add_argument("-L", "--follow-symlinks", action="store_true")
+    walk.add_argument(
+        "-I",
+        "--ignore",
+        action="append",
+        default=[],
+        help="gitignore-style pattern; ignored folders are not listed",
+    )
+    walk.add_argument(
+        "--ignore-file",
+        action="append",
+        default=[],
+        help='per-folder ignore file to read, e.g. ".gitignore"',
+    )
+    walk.add_argument(
+        "--prune",
+        action="append",
+        default=[],
+        help='folder name glob not to descend into, e.g. "node_modules"',
+    )
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument(
+        "-0",
+        "--null",
+        action="store_true",
+        help="paths end with NUL instead of a newline (also for paths read from -)",
+    )
+
+    find = commands.add_parser(
+        "find", parents=[jobs, walk, output], help="list matching paths"
+    )
+    find.add_argument("search_dir")
+    find.add_argument("-e", "--extension", action="append", default=[])
+    find.add_argument("-E", "--exclude-extension", action="append", default=[])
+    find.add_argument("-n", "--name", action="append", help="file stem (no extension)")
+    find.add_argument("-m", "--match", action="append", default=[], help="re.match")
+    find.add_argument("-s", "--search", action="append", default=[], help="re.search")
+    find.add_argument("-x", "--exclude", action="append", default=[], help="re.search")
+    find.add_argument("-t", "--type", choices=("f", "d", "l"))
+    find.add_argument("--min-size", type=_size, help="bytes, or with K/M/G/T")
+    find.add_argument("--max-size", type=_size)
+    find.add_argument("--newer", type=float, help="modified in the last N days")
+    find.add_argument("--older", type=float, help="modified more than N days ago")
+    find.add_argument(
+        "-g",
+        "--content",
+        action="append",
+        default=[],
+        help="regex searched in the content of the files (binary files are skipped)",
+    )
+    find.add_argument("-i", "--ignore-case", action="store_true", help="for -g")
+    find.add_argument("-P", "--procs", type=int, help="processes for -g (all CPUs)")
+    find.add_argument("--limit", type=int, help="stop after this many paths")
+    keys = ("size", "mtime", "ctime", "name", "path")
+    find.add_argument(
+        "--top", type=int, help="only the N largest (or newest) by --by, in order"
+    )
+    find.add_argument("--by", choices=keys, default="size")
+    find.add_argument("--sort", choices=keys, help="sort the whole result")
+    find.add_argument(
+        "-r", "--reverse", action="store_true", help="--sort descending/--top smallest"
+    )
+    find.set_defaults(func=cmd_find)
+
+    copy = commands.add_parser(
+        "copy", parents=[jobs, output], help="copy files and folders"
+    )
+    copy.add_argument("sources", nargs="+", help='paths, or "-" to read from stdin')
+    copy.add_argument("target")
+    copy.add_argument("-p", "--preserve", action="store_true", help="keep times")
+    copy.add_argument(
+        "-u",
+        "--update",
+        action="store_true",
+        help="skip files whose target has the same size and mtime (with -p)",
+    )
+    copy.add_argument(
+        "--mode", choices=("copy", "reflink", "hardlink", "move"), default="copy"
+    )
+    copy.add_argument("-v", "--verbose", action="store_true", help="print copied")
+    copy.set_defaults(func=cmd_copy)
+
+    sync = commands.add_parser(
+        "sync", parents=[jobs], help="mirror a folder, copying only what changed"
+    )
+    sync.add_argument("source")
+    sync.add_argument("target")
+    sync.add_argument(
+        "--delete", action="store_true", help="remove what is not in the source"
+    )
+    sync.add_argument("-n", "--dry-run", action="store_true")
+    sync.add_argument("-E", "--exclude-extension", action="append", default=[])
+    sync.add_argument("-x", "--exclude", action="append", default=[], help="re.search")
+    sync.add_argument(
+        "--modify-window", type=float, default=0, help="seconds (e.g. 2 for FAT)"
+    )
+    sync.set_defaults(func=cmd_sync, max_depth=0, follow_symlinks=False)
+
+    rm = commands.add_parser(
+        "rm", parents=[jobs, output], help="remove files and folder trees"
+    )
+    rm.add_argument("paths", nargs="+", help='paths, or "-" to read from stdin')
+    rm.add_argument(
+        "--trash", help="move to this folder instead, with a journal to restore them"
+    )
+    rm.add_argument("-v", "--verbose", action="store_true", help="print removed")
+    rm.set_defaults(func=cmd_rm)
+
+    export = commands.add_parser(
+        "export", parents=[jobs, output], help="stream files into zip/tar archives"
+    )
+    export.add_argument("sources", nargs="+", help='paths, or "-" to read from stdin')
+    export.add_argument("target", help=".zip, .tar, .tar.gz or .tar.zst")
+    export.add_argument(
+        "-C", "--base-dir", help="names in the archive are relative to this folder"
+    )
+    export.add_argument(
+        "--format", choices=("zip", "tar", "tar.gz", "tar.zst"), help="see target"
+    )
+    export.add_argument("--level", type=int, help="compression level")
+    export.add_argument(
+        "--max-size", type=_size, help="split in archives of at most this size"
+    )
+    export.add_argument("-v", "--verbose", action="store_true", help="print added")
+    export.set_defaults(func=cmd_export)
+
+    dedupe = commands.add_parser(
+        "dedupe",
+        parents=[jobs, walk, output],
+        help="delete files with the same content, printing them",
+    )
+    dedupe.add_argument("search_dir")
+    dedupe.add_argument("-n", "--dry-run", action="store_true")
+    dedupe.add_argument(
+        "--keep-names",
+        dest="clean_names",
+        action="store_false",
+        help="don't remove '(1)' from names that are left without an original",
+    )
+    dedupe.add_argument(
+        "--similar-names",
+        type=float,
+        nargs="?",
+        const=0.8,
+        metavar="THRESHOLD",
+        help="only delete copies with similar names ('x - copia', 'Copy of x'...),"
+        " reading just those files",
+    )
+    dedupe.set_defaults(func=cmd_dedupe)
+
+    rename = commands.add_parser(
+        "rename", parents=[output], help="rename with an ESNameBuilder pipeline"
+    )
+    rename.add_argument("paths", nargs="+", help='paths, or "-" to read from stdin')
+    rename.add_argument(
+        "-s",
+        "--step",
+        action="append",
+        help='pipeline step, with arguments split by ":" (e.g. "replace:_: ",'
+        ' "center:30:*"); see cli.RENAME_STEPS',
+    )
+    rename.add_argument("-n", "--dry-run", action="store_true")
+    rename.add_argument("--journal", help="journal file (see resume_renames)")
+    rename.set_defaults(func=cmd_rename)
+
+    flatten = commands.add_parser(
+        "flatten",
+        parents=[jobs, output],
+        help="bring files in subfolders up to the base folder",
+    )
+    flatten.add_argument("base_dir")
+    flatten.add_argument("-p", "--pattern", default="*")
+    flatten.add_argument(
+        "--mode", choices=("copy", "reflink", "hardlink", "move"), default="copy"
+    )
+    flatten.add_argument("-v", "--verbose", action="store_true")
+    flatten.set_defaults(func=cmd_flatten, max_depth=0, follow_symlinks=False)
+
+    touch = commands.add_parser("touch", parents=[jobs], help="create empty files")
+    touch.add_argument("files", nargs="+")
+    touch.add_argument("-C", "--target-dir", default=".")
+    touch.set_defaults(func=cmd_touch)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # p.ej. "find ... | head": el lector cerró el pipe, no es un error
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError) as e:
+        _error(str(e))
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import math
+import os
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .name_builder import ESNameBuilder
+from .stats import OperationStats
+
+# Largo de los n-gramas del índice
+NGRAM = 3
+
+
+def default_normalizer() -> ESNameBuilder:
+    """
+    'Copia de Sesión_Ordinaria - copia (2)' -> 'sesion ordinaria': without copy
+    markers, accents, case, "_" and repeated spaces.
+    """
+    return (
+        ESNameBuilder()
+        .remove_copy_markers()
+        .strip_accents()
+        .replace("_", " ")
+        .normalize_spaces_lower()
+    )
+
+
+def _grams(key: str) -> frozenset[str]:
+    # Con relleno, así el principio y el final del nombre pesan en la similitud
+    padded = f"{' ' * (NGRAM - 1)}{key} "
+    return frozenset(padded[i : i + NGRAM] for i in range(len(padded) - NGRAM + 1))
+
+
+def _ceil(x: float) -> int:
+    # 0.7 * 10 da 7.000000000000001: sin el margen el prefijo queda corto
+    return math.ceil(x - 1e-9)
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        i, j = self.find(i), self.find(j)
+        if i != j:
+            self.parent[max(i, j)] = min(i, j)
+
+
+class NameClusterer:
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        normalizer: Optional[ESNameBuilder] = None,
+        same_suffix: bool = True,
+        same_folder: bool = False,
+        stats: Optional[OperationStats] = None,
+    ):
+        """
+        Groups files with similar names ("informe.xlsx", "Informe (10).xlsx",
+        "Copia de informe - copia.xlsx", "INFORME_final.xlsx"...), without
+        reading them.
+
+        Names go through the normalizer pipeline first; equal keys are one
+        cluster. Then keys whose trigram sets have a Jaccard similarity of at
+        least threshold are joined. Pairs are found with an inverted index over
+        the rarest trigrams of each key (prefix filtering), so a key is only
+        compared with the few keys that could reach the threshold instead of
+        with every other key.
+
+        Args:
+            threshold (float): Minimum trigram similarity, 0-1. 1 only groups
+                equal keys.
+            normalizer (ESNameBuilder): Pipeline applied to each stem. See
+                default_normalizer().
+            same_suffix (bool): Only group names with the same extension
+                (case-insensitive).
+            same_folder (bool): Only group names in the same folder.
+            stats (OperationStats): Counts names, keys and pairs_compared, and the
+                time of the "normalize" and "match" phases.
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.normalizer = normalizer or default_normalizer()
+        self.same_suffix = same_suffix
+        self.same_folder = same_folder
+        self.stats = stats
+
+    def cluster(self, paths: Iterable[str | Path]) -> list[list[Path]]:
+        """
+        Returns the clusters of 2 or more paths. Paths in a cluster and the
+        clusters themselves are sorted, as in DuplicateFinder.find().
+        """
+        start = time.perf_counter()
+        paths = [Path(p) for p in paths]
+        keys = self.normalizer.apply_many(p.stem for p in paths)
+        # Bloques: solo se comparan nombres con la misma extensión (y carpeta)
+        blocks: dict[tuple, dict[str, list[int]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for i, (path, key) in enumerate(zip(paths, keys)):
+            block = (
+                path.suffix.lower() if self.same_suffix else "",
+                path.parent if self.same_folder else None,
+            )
+            blocks[block][key].append(i)
+        if self.stats is not None:
+            self.stats.count("names", len(paths))
+            self.stats.count("keys", sum(len(b) for b in blocks.values()))
+            self.stats.add_time("normalize", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        union = _UnionFind(len(paths))
+        for by_key in blocks.values():
+            for members in by_key.values():
+                for i in members[1:]:
+                    union.union(members[0], i)
+            if self.threshold < 1:
+                for a, b in self._similar_pairs(list(by_key)):
+                    union.union(by_key[a][0], by_key[b][0])
+
+        clusters: dict[int, list[Path]] = defaultdict(list)
+        for i, path in enumerate(paths):
+            clusters[union.find(i)].append(path)
+        if self.stats is not None:
+            self.stats.add_time("match", time.perf_counter() - start)
+        return sorted(sorted(c) for c in clusters.values() if len(c) > 1)
+
+    def _similar_pairs(self, keys: list[str]) -> Iterable[tuple[str, str]]:
+        """
+        Pairs of keys with trigram similarity >= threshold.
+
+        Two sets with Jaccard >= t share at least ceil(t * |larger|) trigrams, so
+        with the trigrams of every key in the same global order (rarest first)
+        they share one among the first |x| - ceil(t * |x|) + 1 of each. Keys are
+        processed from the smallest and probe the index of the smaller keys with
+        that prefix; as the keys that come later are not smaller, a key only
+        indexes its first |x| - ceil(2t / (1 + t) * |x|) + 1 trigrams. Index
+        entries of keys too short for the current one are skipped for good.
+        """
+        threshold = self.threshold
+        rows = sorted(((_grams(k), k) for k in keys if k), key=lambda r: len(r[0]))
+        frequency = Counter(g for key_grams, _ in rows for g in key_grams)
+        rank = {g: i for i, g in enumerate(sorted(frequency, key=frequency.get))}
+        sizes = [len(key_grams) for key_grams, _ in rows]
+        index_ratio = 2 * threshold / (1 + threshold)
+        # gram -> [primera posición aún útil, claves...]
+        index: dict[str, list[int]] = {}
+        compared = 0
+        for i, (key_grams, key) in enumerate(rows):
+            size = sizes[i]
+            min_size = threshold * size
+            ordered = sorted(key_grams, key=rank.__getitem__)
+            candidates: set[int] = set()
+            for g in ordered[: size - _ceil(min_size) + 1]:
+                postings = index.get(g)
+                if postings is None:
+                    continue
+                first = postings[0]
+                while first < len(postings) and sizes[postings[first]] < min_size:
+                    first += 1
+                postings[0] = first
+                candidates.update(postings[first:])
+            compared += len(candidates)
+            for j in candidates:
+                shared = len(key_grams & rows[j][0])
+                if shared >= threshold * (size + sizes[j] - shared):
+                    yield rows[j][1], key
+            for g in ordered[: size - _ceil(index_ratio * size) + 1]:
+                postings = index.get(g)
+                if postings is None:
+                    index[g] = [1, i]
+                else:
+                    postings.append(i)
+        if self.stats is not None:
+            self.stats.count("pairs_compared", compared)
+
+
+def within_clusters(
+    groups: list[list[Path]], clusters: list[list[Path]]
+) -> list[list[Path]]:
+    """
+    Splits groups (e.g. of identical content, see DuplicateFinder) so that the
+    paths of each group are also in the same name cluster. Subgroups of one path
+    are dropped.
+    """
+    cluster_of = {
+        os.fspath(path): i for i, cluster in enumerate(clusters) for path in cluster
+    }
+    result = []
+    for group in groups:
+        split: dict[int, list[Path]] = defaultdict(list)
+        for path in group:
+            cluster = cluster_of.get(os.fspath(path))
+            if cluster is not None:
+                split[cluster].append(path)
+        result.extend(sorted(s) for s in split.values() if len(s) > 1)
+    return sorted(result)
@@ -0,0 +1,159 @@
+import mmap
+import os
+import re
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from .stats import OperationStats
+
+# (pattern, flags, include_binary, filter_out), ver ContentFilter.spec
+Spec = tuple[bytes, int, bool, bool]
+
+# Igual que grep: un NUL en el primer bloque marca el archivo como binario
+BINARY_PROBE = 8192
+# Los archivos más grandes se leen por bloques en vez de mapearse enteros
+MMAP_LIMIT = 1 << 30
+CHUNK_SIZE = 16 << 20
+# Un match que cruza el borde entre dos bloques se encuentra si mide menos que esto
+CHUNK_OVERLAP = 64 << 10
+# Archivos por tarea del pool. Con menos candidatos en total no se crea el pool:
+# levantar los procesos cuesta más que buscar en el proceso actual
+BATCH_SIZE = 32
+
+
+def _search_chunks(file, regexes: list[re.Pattern]) -> list[bool]:
+    found = [False] * len(regexes)
+    tail = b""
+    while not all(found) and (data := file.read(CHUNK_SIZE)):
+        buffer = tail + data
+        for i, regex in enumerate(regexes):
+            if not found[i] and regex.search(buffer):
+                found[i] = True
+        tail = buffer[-CHUNK_OVERLAP:]
+    return found
+
+
+def _search_mmap(file, regexes: list[re.Pattern]) -> list[bool]:
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return [regex.search(mapped) is not None for regex in regexes]
+
+
+def search_file(path: str, specs: list[Spec]) -> bool:
+    """
+    True if the file passes every spec. The file is opened once for all of them;
+    files that can't be read don't pass.
+    """
+    try:
+        with open(path, "rb") as file:
+            head = file.read(BINARY_PROBE)
+            if b"\0" in head and not all(spec[2] for spec in specs):
+                return False
+            regexes = [re.compile(pattern, flags) for pattern, flags, *_ in specs]
+            if len(head) < BINARY_PROBE:
+                # Ya está entero en memoria
+                found = [regex.search(head) is not None for regex in regexes]
+            elif os.fstat(file.fileno()).st_size <= MMAP_LIMIT:
+                try:
+                    found = _search_mmap(file, regexes)
+                except (OSError, ValueError):
+                    # Archivos especiales o filesystems sin mmap
+                    file.seek(0)
+                    found = _search_chunks(file, regexes)
+            else:
+                file.seek(0)
+                found = _search_chunks(file, regexes)
+    except OSError:
+        return False
+    return all(hit != spec[3] for hit, spec in zip(found, specs))
+
+
+def _search_batch(paths: list[str], specs: list[Spec]) -> list[bool]:
+    return [search_file(path, specs) for path in paths]
+
+
+def _is_file(entry) -> bool:
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+def _batches(entries: Iterable, size: int) -> Iterator[list]:
+    it = iter(entries)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def search_contents(
+    entries: Iterator,
+    specs: list[Spec],
+    workers: Optional[int] = None,
+    stats: Optional[OperationStats] = None,
+) -> Iterator:
+    """
+    Walk entries of the files that pass specs, in the same order as entries.
+
+    The files are searched on a pool of `workers` processes (all the CPUs by
+    default), since the regex engine holds the GIL. Only a few batches are in
+    flight at a time, so the walk isn't consumed ahead of the caller; closing
+    the iterator cancels the pending batches and closes entries.
+
+    With the spawn/forkserver start methods (Windows, macOS) the calling script
+    needs the usual `if __name__ == "__main__":` guard.
+    """
+    batches = _batches(filter(_is_file, entries), BATCH_SIZE)
+    pool = None
+    try:
+        first = next(batches, [])
+        if len(first) < BATCH_SIZE:
+            results = _timed(stats, _search_batch, _paths(first), specs)
+            yield from _passed(first, results, stats)
+            return
+
+        # Importado acá: concurrent.futures arrastra logging y el CLI no lo necesita
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=workers)
+        pending: deque = deque()
+        for batch in _chain(first, batches):
+            pending.append((batch, pool.submit(_search_batch, _paths(batch), specs)))
+            if len(pending) > 2 * workers:
+                batch, future = pending.popleft()
+                yield from _passed(batch, _timed(stats, future.result), stats)
+        while pending:
+            batch, future = pending.popleft()
+            yield from _passed(batch, _timed(stats, future.result), stats)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        entries.close()
+
+
+def _paths(batch: list) -> list[str]:
+    return [entry.path for entry in batch]
+
+
+def _chain(first: list, rest: Iterator[list]) -> Iterator[list]:
+    yield first
+    yield from rest
+
+
+def _timed(stats: Optional[OperationStats], func, *args) -> list[bool]:
+    if stats is None:
+        return func(*args)
+    with stats.phase("content"):
+        return func(*args)
+
+
+def _passed(
+    batch: list, results: list[bool], stats: Optional[OperationStats]
+) -> Iterator:
+    if stats is not None:
+        stats.count("content_searched", len(batch))
+    for entry, passed in zip(batch, results):
+        if passed:
+            yield entry
+        elif stats is not None:
+            stats.reject("content")
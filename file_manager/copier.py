@@ -0,0 +1,300 @@
+import errno
+import os
+import shutil
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from .stats import OperationStats
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl de Linux para clonar un archivo (reflink) en btrfs/xfs/bcachefs
+FICLONE = 0x40049409
+# Errores con los que se pasa al siguiente método de copia en lugar de fallar
+UNSUPPORTED = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.ENOTTY,
+    errno.EBADF,
+}
+CHUNK_SIZE = 8 * 1024 * 1024
+MODES = ("copy", "reflink", "hardlink", "move")
+
+
+class CopyResult:
+    def __init__(self):
+        self.copied: list[Path] = []
+        self.skipped: list[Path] = []
+        self.errors: dict[Path, Exception] = {}
+        self.bytes_copied: int = 0
+        self.elapsed: float = 0.0
+
+    def record(self, src: Path, future: Future):
+        """
+        Adds the outcome of a finished copy_file call (a concurrent.futures or an
+        asyncio future): copied, skipped, or its OSError.
+        """
+        try:
+            copied = future.result()
+        except OSError as e:
+            self.errors[src] = e
+            return
+        if copied is None:
+            self.skipped.append(src)
+        else:
+            self.copied.append(src)
+            self.bytes_copied += copied
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second."""
+        return self.bytes_copied / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"CopyResult(copied={len(self.copied)}, skipped={len(self.skipped)}, "
+            f"errors={len(self.errors)}, {self.throughput / 1e6:.1f} MB/s)"
+        )
+
+
+class BulkCopier:
+    def __init__(
+        self,
+        workers: int = 8,
+        preserve_metadata: bool = False,
+        skip_unchanged: bool = False,
+        reflink: bool = True,
+        modify_window: float = 0,
+        mode: str = "copy",
+        stats: Optional[OperationStats] = None,
+    ):
+        """
+        Copies many files at the same time on a bounded thread pool.
+
+        Data is copied inside the kernel when possible: reflink (FICLONE) on
+        filesystems with copy-on-write, then os.copy_file_range, then os.sendfile,
+        and a plain read/write loop as last resort.
+
+        Args:
+            workers (int): Files copied at the same time.
+            preserve_metadata (bool): Copy times and flags too (shutil.copystat).
+                The permission bits are always copied, like shutil.copy.
+            skip_unchanged (bool): Don't copy files whose target already has the same
+                size and mtime. Use it with preserve_metadata, otherwise the
+                target's mtime is the time of the copy and nothing is skipped.
+            reflink (bool): Try to clone the file before copying its data.
+            modify_window (float): Accepted mtime difference in seconds (like rsync).
+            mode (str): How each file gets to its target:
+                - "copy": the methods above.
+                - "reflink": clone only, fails where the filesystem can't clone.
+                - "hardlink": os.link, no data is duplicated (same filesystem).
+                - "move": os.rename, or a copy + delete across filesystems.
+            stats (OperationStats): Counts stat_calls, files_copied, files_skipped,
+                errors and bytes_copied, and the time of the "copy" phase.
+        """
+        if mode not in MODES:
+            raise ValueError(f"'mode' should be one of {MODES}, got: {mode!r}")
+        self.workers = workers
+        self.preserve_metadata = preserve_metadata
+        self.skip_unchanged = skip_unchanged
+        self.reflink = reflink and fcntl is not None
+        self.modify_window = modify_window
+        self.modify_window_ns = int(modify_window * 1e9)
+        self.mode = mode
+        self.stats = stats
+
+    def copy(self, paths: Iterable[str | Path], target_dir: str | Path) -> CopyResult:
+        """
+        Copies every path into target_dir. Directories are copied with their
+        content to target_dir / dir.name. Errors are reported per file in the
+        result and don't stop the batch.
+        """
+        result = CopyResult()
+        target_dir = Path(target_dir)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        return self.copy_pairs(self.plan(paths, target_dir, result), result)
+
+    def copy_pairs(
+        self,
+        pairs: Iterable[tuple[Path, Path]],
+        result: Optional[CopyResult] = None,
+    ) -> CopyResult:
+        """Copies already planned (src, dst) file pairs. Target folders must exist."""
+        result = result if result is not None else CopyResult()
+        start = time.perf_counter()
+        # Máximo de copias en cola, para no tener millones de futures en memoria
+        max_pending = self.workers * 4
+        pending: deque[tuple[Path, Future]] = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for src, dst in pairs:
+                if len(pending) >= max_pending:
+                    result.record(*pending.popleft())
+                pending.append((src, pool.submit(self.copy_file, src, dst)))
+            while pending:
+                result.record(*pending.popleft())
+
+        result.elapsed = time.perf_counter() - start
+        if self.stats is not None:
+            self.stats.add_time("copy", result.elapsed)
+            self.stats.count("files_copied", len(result.copied))
+            self.stats.count("files_skipped", len(result.skipped))
+            self.stats.count("errors", len(result.errors))
+            self.stats.count("bytes_copied", result.bytes_copied)
+        return result
+
+    def plan(
+        self, paths: Iterable[str | Path], target_dir: Path, result: CopyResult
+    ) -> Iterator[tuple[Path, Path]]:
+        """
+        Lazily yields the (src, dst) file pairs of copy(), to pass to copy_file.
+        Folders are walked as the pairs are consumed and their target folders are
+        created here, once; paths that don't exist and folders that can't be
+        created are added to result.errors.
+        """
+        for path in map(Path, paths):
+            if path.is_dir():
+                root = target_dir / path.name
+                for dir_path, _dirs, files in os.walk(path):
+                    out = root / os.path.relpath(dir_path, path)
+                    try:
+                        out.mkdir(parents=True, exist_ok=True)
+                    except OSError as e:
+                        result.errors[Path(dir_path)] = e
+                        continue
+                    for name in files:
+                        yield Path(dir_path, name), out / name
+            elif path.exists():
+                yield path, target_dir / path.name
+            else:
+                result.errors[path] = FileNotFoundError(
+                    errno.ENOENT, "No such file or directory", str(path)
+                )
+
+    def copy_file(self, src: Path, dst: Path) -> Optional[int]:
+        """
+        Copies one file. Returns the bytes copied, or None if it was skipped.
+        Copying a file onto itself raises shutil.SameFileError, like shutil.copy
+        (opening the target would empty the source).
+        """
+        src_stat = os.stat(src)
+        try:
+            dst_stat: Optional[os.stat_result] = os.stat(dst)
+        except OSError:
+            dst_stat = None
+        if self.stats is not None:
+            self.stats.count("stat_calls", 2)
+        if dst_stat is not None and os.path.samestat(src_stat, dst_stat):
+            raise shutil.SameFileError(f"{src} and {dst} are the same file")
+        if self.skip_unchanged and self._unchanged(src_stat, dst_stat):
+            return None
+        if self.mode == "hardlink":
+            os.link(src, dst)
+            return src_stat.st_size
+        if self.mode == "move":
+            try:
+                os.rename(src, dst)
+                return src_stat.st_size
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+
+        with open(src, "rb", buffering=0) as fsrc:
+            with open(dst, "wb", buffering=0) as fdst:
+                try:
+                    copied = self._copy_data(fsrc.fileno(), fdst.fileno())
+                except OSError:
+                    # No dejar copias a medias
+                    fdst.close()
+                    os.unlink(dst)
+                    raise
+
+        if self.preserve_metadata or self.mode == "move":
+            shutil.copystat(src, dst)
+        else:
+            shutil.copymode(src, dst)
+        if self.mode == "move":
+            os.unlink(src)
+        return copied
+
+    def _unchanged(
+        self, src_stat: os.stat_result, dst_stat: Optional[os.stat_result]
+    ) -> bool:
+        if dst_stat is None:
+            return False
+        return (
+            dst_stat.st_size == src_stat.st_size
+            and abs(dst_stat.st_mtime_ns - src_stat.st_mtime_ns)
+            <= self.modify_window_ns
+        )
+
+    def _copy_data(self, src_fd: int, dst_fd: int) -> int:
+        if self.mode == "reflink":
+            if fcntl is None:
+                raise OSError(errno.EOPNOTSUPP, "reflinks are not supported here")
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            return os.fstat(src_fd).st_size
+        if self.reflink:
+            try:
+                fcntl.ioctl(dst_fd, FICLONE, src_fd)
+                return os.fstat(src_fd).st_size
+            except OSError as e:
+                if e.errno not in UNSUPPORTED:
+                    raise
+
+        for method in KERNEL_COPY:
+            try:
+                return _kernel_copy(method, src_fd, dst_fd)
+            except _Unsupported:
+                continue
+
+        copied = 0
+        while data := os.read(src_fd, CHUNK_SIZE):
+            view = memoryview(data)
+            while view:
+                view = view[os.write(dst_fd, view) :]
+            copied += len(data)
+        return copied
+
+
+class _Unsupported(Exception):
+    """The method can't be used for these files (nothing was copied)."""
+
+
+def _copy_file_range(src_fd: int, dst_fd: int) -> int:
+    return os.copy_file_range(src_fd, dst_fd, CHUNK_SIZE)
+
+
+def _sendfile(src_fd: int, dst_fd: int) -> int:
+    return os.sendfile(dst_fd, src_fd, None, CHUNK_SIZE)
+
+
+def _kernel_copy(method: Callable[[int, int], int], src_fd: int, dst_fd: int) -> int:
+    copied = 0
+    while True:
+        try:
+            n = method(src_fd, dst_fd)
+        except OSError as e:
+            # Solo se puede cambiar de método si todavía no se copió nada
+            if copied == 0 and e.errno in UNSUPPORTED:
+                raise _Unsupported from e
+            raise
+        if n == 0:
+            return copied
+        copied += n
+
+
+# Métodos disponibles en esta plataforma, en orden de preferencia
+KERNEL_COPY = [
+    method
+    for name, method in (("copy_file_range", _copy_file_range), ("sendfile", _sendfile))
+    if hasattr(os, name)
+]
@@ -0,0 +1,245 @@
+import hashlib
+import os
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from stat import S_ISREG
+from typing import Callable, Iterable, Optional
+
+from .name_builder import remove_copy_markers
+from .stats import OperationStats
+
+# Archivos descargados/copiados varias veces: "informe (1).xlsx", "informe (12).xlsx"
+NUMBERED_SUFFIX = re.compile(r"\s*\(\d+\)$")
+
+
+def clean_numbered_name(path: Path) -> Path:
+    """'informe (1).xlsx' -> 'informe.xlsx' (same folder)."""
+    return path.with_name(NUMBERED_SUFFIX.sub("", path.stem).strip() + path.suffix)
+
+
+def clean_copy_name(path: Path) -> Path:
+    """'Copia de informe - copia (10).xlsx' -> 'informe.xlsx' (see COPY_MARKERS)."""
+    return path.with_name(remove_copy_markers(path.stem) + path.suffix)
+
+
+def prefer_unnumbered(group: list[Path]) -> Path:
+    """
+    Default policy to choose the file to keep in a duplicate group: names without
+    a '(#)' suffix first, then the shortest name, then alphabetical order.
+    """
+    return min(
+        group,
+        key=lambda p: (
+            NUMBERED_SUFFIX.search(p.stem) is not None,
+            len(p.name),
+            str(p),
+        ),
+    )
+
+
+def prefer_original(group: list[Path]) -> Path:
+    """
+    Like prefer_unnumbered, but any copy marker counts ("- copia", "Copy of"...),
+    for groups found with name clusters.
+    """
+    return min(
+        group,
+        key=lambda p: (clean_copy_name(p) != p, len(p.name), str(p)),
+    )
+
+
+class DuplicateFinder:
+    def __init__(
+        self,
+        workers: int = 4,
+        block_size: int = 64 * 1024,
+        chunk_size: int = 1024 * 1024,
+        min_size: int = 1,
+        stats: Optional[OperationStats] = None,
+    ):
+        """
+        Finds files with identical content in three passes, each one only over the
+        candidates left by the previous pass:
+
+        1. Group by size (files with a unique size are never opened).
+        2. Hash of the first and last block (skipped for files that fit in them).
+        3. Full hash, read in chunks.
+
+        Hashing runs on a thread pool (hashlib releases the GIL on large buffers).
+
+        Args:
+            workers (int): Threads used to hash files.
+            block_size (int): Bytes read from each end of a file in the second pass.
+            chunk_size (int): Read size of the full hash.
+            min_size (int): Smaller files are ignored. Empty files are skipped by default.
+            stats (OperationStats): Counts stat_calls, files_hashed and bytes_hashed,
+                and the time of each pass (size, partial_hash, full_hash).
+        """
+        self.workers = workers
+        self.block_size = block_size
+        self.chunk_size = chunk_size
+        self.min_size = min_size
+        self.stats = stats
+        self.errors: dict[Path, OSError] = {}
+
+    def find(self, paths: Iterable[str | Path]) -> list[list[Path]]:
+        """
+        Returns the groups of duplicated files (2 or more paths each). Paths in a
+        group and the groups themselves are sorted. Files that can't be read are
+        left out and recorded in self.errors.
+
+        Symlinks (and anything that is not a regular file) are never grouped:
+        deleting the target of a link "duplicated" by the link loses the data.
+        Hard links to the same file count once, with the first path given.
+        """
+        self.errors = {}
+        stats = self.stats
+        start = time.perf_counter()
+        by_size: dict[int, list[Path]] = defaultdict(list)
+        sizes: dict[Path, int] = {}
+        inodes: set[tuple[int, int]] = set()
+        stat_calls = 0
+        for path in paths:
+            path = Path(path)
+            stat_calls += 1
+            try:
+                st = os.lstat(path)
+            except OSError as e:
+                self.errors[path] = e
+                continue
+            if not S_ISREG(st.st_mode) or (st.st_dev, st.st_ino) in inodes:
+                continue
+            inodes.add((st.st_dev, st.st_ino))
+            if st.st_size >= self.min_size:
+                by_size[st.st_size].append(path)
+                sizes[path] = st.st_size
+        if stats is not None:
+            stats.count("stat_calls", stat_calls)
+            stats.add_time("size", time.perf_counter() - start)
+
+        candidates = [group for group in by_size.values() if len(group) > 1]
+        if not candidates:
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # Si el archivo cabe en los dos bloques, el hash parcial ya lo cubre entero
+            small = [g for g in candidates if sizes[g[0]] <= 2 * self.block_size]
+            large = [g for g in candidates if sizes[g[0]] > 2 * self.block_size]
+            groups = self._split(pool, small, self._full_hash, "full_hash")
+            large = self._split(pool, large, self._partial_hash, "partial_hash")
+            groups += self._split(pool, large, self._full_hash, "full_hash")
+
+        return sorted(sorted(group) for group in groups)
+
+    def _split(
+        self,
+        pool: ThreadPoolExecutor,
+        groups: list[list[Path]],
+        hasher: Callable[[Path], bytes],
+        phase: str,
+    ) -> list[list[Path]]:
+        """Splits every group by hasher(path) and keeps the subgroups with 2+ paths."""
+        start = time.perf_counter()
+        paths = [path for group in groups for path in group]
+        digests = pool.map(self._safe(hasher), paths)
+        buckets: dict[tuple[int, bytes], list[Path]] = defaultdict(list)
+        group_ids = (i for i, group in enumerate(groups) for _ in group)
+        for group_id, path, digest in zip(group_ids, paths, digests):
+            if digest is not None:
+                buckets[(group_id, digest)].append(path)
+        if self.stats is not None:
+            self.stats.count("files_hashed", len(paths))
+            self.stats.add_time(phase, time.perf_counter() - start)
+        return [bucket for bucket in buckets.values() if len(bucket) > 1]
+
+    def _safe(
+        self, hasher: Callable[[Path], bytes]
+    ) -> Callable[[Path], Optional[bytes]]:
+        def _f(path: Path) -> Optional[bytes]:
+            try:
+                return hasher(path)
+            except OSError as e:
+                self.errors[path] = e
+                return None
+
+        return _f
+
+    def _partial_hash(self, path: Path) -> bytes:
+        h = hashlib.blake2b()
+        with open(path, "rb") as f:
+            head = f.read(self.block_size)
+            h.update(head)
+            size = os.fstat(f.fileno()).st_size
+            tail = b""
+            if size > self.block_size:
+                f.seek(max(self.block_size, size - self.block_size))
+                tail = f.read(self.block_size)
+                h.update(tail)
+        if self.stats is not None:
+            self.stats.count("bytes_hashed", len(head) + len(tail))
+        return h.digest()
+
+    def _full_hash(self, path: Path) -> bytes:
+        h = hashlib.blake2b()
+        with open(path, "rb", buffering=0) as f:
+            size = os.fstat(f.fileno()).st_size
+            buffer = bytearray(max(1, min(self.chunk_size, size)))
+            view = memoryview(buffer)
+            hashed = 0
+            while n := f.readinto(buffer):
+                h.update(view[:n])
+                hashed += n
+        if self.stats is not None:
+            self.stats.count("bytes_hashed", hashed)
+        return h.digest()
+
+
+def plan_dedupe(
+    groups: list[list[Path]],
+    keep: Callable[[list[Path]], Path] = prefer_unnumbered,
+) -> list[Path]:
+    """
+    Returns the paths to delete so that one file per duplicate group is kept.
+
+    Args:
+        keep (Callable): Chooses the file to keep in each group.
+    """
+    to_delete: list[Path] = []
+    for group in groups:
+        kept = keep(group)
+        to_delete.extend(p for p in group if p != kept)
+    return to_delete
+
+
+def plan_name_cleanup(
+    paths: Iterable[Path],
+    deleted: Iterable[Path] = (),
+    clean: Callable[[Path], Path] = clean_numbered_name,
+) -> dict[Path, Path]:
+    """
+    '(#)' name cleanup policy: every 'x (#).ext' that is not going to be deleted is
+    renamed to 'x.ext' when that name is free (doesn't exist or is being deleted).
+
+    Args:
+        clean (Callable): Name without the marker. clean_copy_name also removes
+            "- copia", "Copy of"...
+
+    Returns:
+        dict: {path: new path}
+    """
+    paths = list(paths)
+    deleted = set(deleted)
+    taken = set(paths) - deleted
+    renames: dict[Path, Path] = {}
+    for path in paths:
+        if path in deleted:
+            continue
+        new = clean(path)
+        if new == path or new in taken or (new not in deleted and new.exists()):
+            continue
+        renames[path] = new
+        taken.add(new)
+    return renames
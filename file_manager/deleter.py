@@ -0,0 +1,422 @@
+import json
+import os
+import shutil
+import stat
+import threading
+import time
+import uuid
+from pathlib import Path
+from queue import LifoQueue
+from typing import Callable, Iterable, Optional
+
+from .stats import OperationStats
+
+# Borrado relativo a descriptores de carpeta (Linux, macOS...). En Windows cada
+# árbol se borra con shutil.rmtree
+FD_SUPPORTED = {
+    os.open,
+    os.unlink,
+    os.rmdir,
+} <= os.supports_dir_fd and os.scandir in os.supports_fd
+DIR_FLAGS = (
+    os.O_RDONLY
+    | getattr(os, "O_DIRECTORY", 0)
+    | getattr(os, "O_NOFOLLOW", 0)
+    | getattr(os, "O_CLOEXEC", 0)
+)
+# Archivos de una misma carpeta por tarea: una carpeta enorme se reparte entre
+# los threads en vez de borrarse de a uno
+UNLINK_BATCH = 512
+JOURNAL_NAME = "journal.jsonl"
+
+
+class DeleteResult:
+    def __init__(self):
+        """
+        Attributes:
+            deleted (list): Given paths that are gone (or were moved to the trash).
+                Paths that didn't exist count as deleted.
+            errors (dict): {path: error} of what couldn't be removed. Inside a
+                folder tree the key is the entry that failed, and the folders
+                above it are kept.
+            files_removed (int): Files and links unlinked, trees included.
+            dirs_removed (int): Folders removed, trees included.
+            journal (Path): Trash journal, if the paths were moved to a trash.
+            cancelled (bool): The cancel event was set before the batch ended.
+                Paths that were not reached are neither in deleted nor in errors.
+        """
+        self.deleted: list[Path] = []
+        self.errors: dict[Path, OSError] = {}
+        self.files_removed: int = 0
+        self.dirs_removed: int = 0
+        self.journal: Optional[Path] = None
+        self.cancelled: bool = False
+        self.elapsed: float = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"DeleteResult(deleted={len(self.deleted)}, files={self.files_removed}, "
+            f"dirs={self.dirs_removed}, errors={len(self.errors)}, "
+            f"{self.elapsed:.3f}s)"
+        )
+
+
+class _Dir:
+    """Folder being removed. It is removed when its last pending task finishes."""
+
+    __slots__ = ("path", "name", "parent", "fd", "pending", "failed", "item")
+
+    def __init__(self, path: str, name: str, parent: Optional["_Dir"], item=None):
+        self.path = path
+        # Relativo a parent.fd; la ruta completa para la carpeta inicial
+        self.name = name
+        self.parent = parent
+        self.fd: Optional[int] = None
+        # El listado de la carpeta + lotes de archivos + subcarpetas sin terminar
+        self.pending = 1
+        self.failed = False
+        self.item: Optional[Path] = item
+
+
+class BulkDeleter:
+    def __init__(
+        self,
+        workers: int = 8,
+        trash_dir: Optional[str | Path] = None,
+        stats: Optional[OperationStats] = None,
+        cancel: Optional[threading.Event] = None,
+    ):
+        """
+        Removes many files and folder trees at the same time on a bounded pool of
+        threads.
+
+        Folders are removed bottom-up relative to open folder descriptors
+        (os.unlink/os.rmdir with dir_fd), so each name is resolved once instead of
+        walking the whole path for every file, and a symlink swapped in while the
+        tree is being removed is never followed. Every folder is a task and big
+        folders are split in batches of files; the tasks run newest first (depth
+        first), so only the folders being worked on keep a descriptor open.
+
+        Args:
+            workers (int): Threads removing at the same time.
+            trash_dir (str | Path): Move the paths here instead of removing them,
+                writing each move to a journal (see restore_trash/empty_trash). The
+                trash must be on the same filesystem as the paths.
+            stats (OperationStats): Counts deleted, files_removed, dirs_removed and
+                errors, and the time of the "delete" phase.
+            cancel (threading.Event): When set (from another thread), tasks that
+                didn't start are skipped: no new path, folder listing or batch of
+                files is removed, and delete() returns soon with result.cancelled.
+                Folders left half-emptied are kept.
+        """
+        self.workers = workers
+        self.trash_dir = None if trash_dir is None else Path(trash_dir)
+        self.stats = stats
+        self.cancel = cancel
+        self._tasks: LifoQueue = LifoQueue()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0
+        self._failure: Optional[BaseException] = None
+        self._result = DeleteResult()
+
+    def delete(self, paths: Iterable[str | Path]) -> DeleteResult:
+        """
+        Removes every path: files, links (never followed) and folders with their
+        content. Errors are reported per path in the result and don't stop the batch.
+        """
+        self._result = result = DeleteResult()
+        self._failure = None
+        start = time.perf_counter()
+        if self.trash_dir is not None:
+            self.trash_dir.mkdir(parents=True, exist_ok=True)
+            result.journal = self.trash_dir / JOURNAL_NAME
+            with open(result.journal, "a", encoding="utf-8") as journal:
+                self._run(paths, lambda path: self._trash(path, journal))
+        else:
+            self._run(paths, self._delete_item)
+
+        result.elapsed = time.perf_counter() - start
+        if self.stats is not None:
+            self.stats.add_time("delete", result.elapsed)
+            self.stats.count("deleted", len(result.deleted))
+            self.stats.count("files_removed", result.files_removed)
+            self.stats.count("dirs_removed", result.dirs_removed)
+            self.stats.count("errors", len(result.errors))
+        return result
+
+    def _cancelled(self) -> bool:
+        return self.cancel is not None and self.cancel.is_set()
+
+    # -----------------------------------------
+    # --------  Pool
+    # -----------------------------------------
+
+    def _run(self, paths: Iterable[str | Path], task: Callable[[Path], None]):
+        threads = [
+            threading.Thread(target=self._work, daemon=True)
+            for _ in range(max(1, self.workers))
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for path in paths:
+                if self._cancelled():
+                    break
+                self._submit(task, Path(path))
+            with self._idle:
+                while self._outstanding:
+                    self._idle.wait()
+        except BaseException as e:
+            # p.ej. Ctrl+C: las tareas en cola se descartan
+            self._failure = self._failure or e
+            raise
+        finally:
+            for _ in threads:
+                self._tasks.put(None)
+            for thread in threads:
+                thread.join()
+        if self._failure is not None:
+            raise self._failure
+        self._result.cancelled = self._cancelled()
+
+    def _submit(self, func: Callable, *args):
+        with self._lock:
+            self._outstanding += 1
+        self._tasks.put((func, args))
+
+    def _work(self):
+        while (task := self._tasks.get()) is not None:
+            func, args = task
+            try:
+                if self._failure is None:
+                    func(*args)
+            except BaseException as e:
+                self._failure = self._failure or e
+            finally:
+                with self._idle:
+                    self._outstanding -= 1
+                    if not self._outstanding:
+                        self._idle.notify_all()
+
+    def _error(self, path: str | Path, error: OSError):
+        with self._lock:
+            self._result.errors[Path(path)] = error
+
+    # -----------------------------------------
+    # --------  Removal
+    # -----------------------------------------
+
+    def _delete_item(self, path: Path):
+        if self._cancelled():
+            return
+        try:
+            if not stat.S_ISDIR(os.lstat(path).st_mode):
+                os.unlink(path)
+                with self._lock:
+                    self._result.files_removed += 1
+                    self._result.deleted.append(path)
+                return
+        except FileNotFoundError:
+            with self._lock:
+                self._result.deleted.append(path)
+            return
+        except OSError as e:
+            self._error(path, e)
+            return
+
+        if FD_SUPPORTED:
+            self._list(_Dir(str(path), str(path), None, item=path))
+        else:
+            self._rmtree(path)
+
+    def _rmtree(self, path: Path):
+        failed = False
+
+        def onexc(func, failed_path, error):
+            nonlocal failed
+            failed = True
+            self._error(failed_path, error)
+
+        shutil.rmtree(path, onexc=onexc)
+        if not failed:
+            with self._lock:
+                self._result.deleted.append(path)
+
+    def _list(self, folder: _Dir):
+        """Opens and lists a folder, queueing its files (in batches) and subfolders."""
+        if self._cancelled():
+            # La carpeta y las de arriba quedan (no están vacías)
+            folder.failed = True
+            self._done(folder)
+            return
+        parent_fd = folder.parent.fd if folder.parent is not None else None
+        try:
+            folder.fd = os.open(folder.name, DIR_FLAGS, dir_fd=parent_fd)
+            files, dirs = [], []
+            with os.scandir(folder.fd) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    (dirs if is_dir else files).append(entry.name)
+        except OSError as e:
+            self._error(folder.path, e)
+            folder.failed = True
+            self._done(folder)
+            return
+
+        batches = [
+            files[i : i + UNLINK_BATCH] for i in range(0, len(files), UNLINK_BATCH)
+        ]
+        with self._lock:
+            folder.pending += len(batches) + len(dirs)
+        for batch in batches:
+            self._submit(self._unlink, folder, batch)
+        for name in dirs:
+            child = _Dir(os.path.join(folder.path, name), name, folder)
+            self._submit(self._list, child)
+        self._done(folder)
+
+    def _unlink(self, folder: _Dir, names: list[str]):
+        if self._cancelled():
+            folder.failed = True
+            self._done(folder)
+            return
+        removed = 0
+        for name in names:
+            try:
+                os.unlink(name, dir_fd=folder.fd)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self._error(os.path.join(folder.path, name), e)
+                folder.failed = True
+        with self._lock:
+            self._result.files_removed += removed
+        self._done(folder)
+
+    def _done(self, folder: Optional[_Dir]):
+        """
+        Marks one task of folder as finished. The last one removes the folder and
+        finishes a task of its parent, and so on up to the given path.
+        """
+        while folder is not None:
+            with self._lock:
+                folder.pending -= 1
+                if folder.pending:
+                    return
+            if folder.fd is not None:
+                os.close(folder.fd)
+                folder.fd = None
+            parent = folder.parent
+            if not folder.failed:
+                try:
+                    os.rmdir(folder.name, dir_fd=parent.fd if parent else None)
+                    with self._lock:
+                        self._result.dirs_removed += 1
+                        if folder.item is not None:
+                            self._result.deleted.append(folder.item)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self._error(folder.path, e)
+                    folder.failed = True
+            if parent is not None and folder.failed:
+                parent.failed = True
+            folder = parent
+
+    # -----------------------------------------
+    # --------  Trash
+    # -----------------------------------------
+
+    def _trash(self, path: Path, journal):
+        if self._cancelled():
+            return
+        path = path.absolute()
+        name = f"{uuid.uuid4().hex[:12]}-{path.name}"
+        # Se anota antes de mover: una línea sin archivo en la papelera se ignora
+        record = {"from": str(path), "to": name, "time": time.time()}
+        with self._lock:
+            journal.write(json.dumps(record) + "\n")
+            journal.flush()
+        try:
+            os.rename(path, self.trash_dir / name)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self._error(path, e)
+            return
+        with self._lock:
+            self._result.deleted.append(path)
+
+
+def _read_journal(trash_dir: Path) -> list[dict]:
+    try:
+        with open(trash_dir / JOURNAL_NAME, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def _write_journal(trash_dir: Path, records: list[dict]):
+    journal = trash_dir / JOURNAL_NAME
+    temp = journal.with_suffix(".tmp")
+    with open(temp, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, journal)
+
+
+def restore_trash(
+    trash_dir: str | Path, paths: Optional[Iterable[str | Path]] = None
+) -> list[Path]:
+    """
+    Moves trashed paths back to where they were (all of them, or the given
+    original paths), newest first. A path whose original place is taken again
+    stays in the trash.
+
+    Returns:
+        list: Restored paths.
+    """
+    trash_dir = Path(trash_dir)
+    wanted = None if paths is None else {str(Path(p).absolute()) for p in paths}
+    restored: list[Path] = []
+    kept: list[dict] = []
+    for record in reversed(_read_journal(trash_dir)):
+        trashed = trash_dir / record["to"]
+        if not os.path.lexists(trashed):
+            continue
+        original = Path(record["from"])
+        if (wanted is not None and record["from"] not in wanted) or os.path.lexists(
+            original
+        ):
+            kept.append(record)
+            continue
+        original.parent.mkdir(parents=True, exist_ok=True)
+        os.rename(trashed, original)
+        restored.append(original)
+    _write_journal(trash_dir, kept[::-1])
+    return restored
+
+
+def empty_trash(
+    trash_dir: str | Path, older_than: Optional[float] = None, workers: int = 8
+) -> DeleteResult:
+    """
+    Removes for good what is in the trash, or only what was trashed more than
+    older_than seconds ago.
+    """
+    trash_dir = Path(trash_dir)
+    now = time.time()
+    records = _read_journal(trash_dir)
+    expired = [r for r in records if older_than is None or now - r["time"] > older_than]
+    result = BulkDeleter(workers).delete(trash_dir / r["to"] for r in expired)
+    # Lo que no se pudo borrar sigue en la papelera y en el journal
+    _write_journal(
+        trash_dir, [r for r in records if os.path.lexists(trash_dir / r["to"])]
+    )
+    return result
@@ -1,12 +1,26 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
+
+# Archivos por tarea del pool: suficientes para que el costo de la tarea no domine
+BATCH_SIZE = 1000
+
+
+def _relative(name: str) -> Path:
+    """Name as a path inside the target folder: no root, drive or ".." parts"""
+    path = Path(name)
+    if path.anchor or ".." in path.parts:
+        raise ValueError(f"file name must stay inside target_dir: {name!r}")
+    return path
 
 
 class FileCreator:
     USER_WD = Path.cwd()
 
-    def __init__(self) -> None:
-        pass
+    def __init__(self, workers: int = 8) -> None:
+        self.workers = workers
 
     @staticmethod
     def _create_file(file_name: str, target_dir: Path) -> Path:
@@ -14,16 +28,90 @@ class FileCreator:
         created_path.touch()
         return created_path
 
+    @staticmethod
+    def expand(template: str, values: Iterable) -> list[str]:
+        """
+        Names from a template, e.g. expand("cuentas_{}.xlsx", range(1, 5)).
+        Each value can be a tuple to fill several fields.
+        """
+        return [
+            template.format(*v) if isinstance(v, tuple) else template.format(v)
+            for v in values
+        ]
+
     def create_file(self, file_name: str) -> Path:
         return self._create_file(file_name, self.USER_WD)
 
     def create_files(
-        self, files: list[str | Path], target_dir: Path
-    ) -> Optional[list[Path]]:
-        if all(isinstance(f, str) for f in files):
-            return [self._create_file(file, target_dir) for file in files]
-
-        elif all(isinstance(f, Path) for f in files):
-            return [self._create_file(file.name, target_dir) for file in files]
-        else:
-            raise TypeError("Files should a list of str or Path, do not combine types")
+        self,
+        files: Iterable[str | Path],
+        target_dir: Path,
+        size: int = 0,
+        sparse: bool = True,
+        template_file: Optional[Path] = None,
+    ) -> list[Path]:
+        """
+        Creates many files at once with os.open on a thread pool.
+
+        Names given as str can include subfolders ("2024/enero.xlsx"); for Path only
+        the name is used. Missing folders are created once per folder. Existing
+        files are not truncated (like touch) unless a size or template is given.
+
+        Args:
+            size (int): Size in bytes of every file.
+            sparse (bool): Only set the size (ftruncate). With False the space is
+                reserved on disk (posix_fallocate), which is slower.
+            template_file (Path): Every file gets the content of this file (read once).
+
+        Returns:
+            list: Created paths, in the same order as files.
+
+        Raises:
+            ValueError: A str name is absolute or has "..", so the file would end up
+                outside target_dir. Nothing is created.
+        """
+        target_dir = Path(target_dir)
+        paths = [
+            target_dir / (f.name if isinstance(f, Path) else _relative(f))
+            for f in files
+        ]
+        for folder in {p.parent for p in paths}:
+            folder.mkdir(parents=True, exist_ok=True)
+
+        content = Path(template_file).read_bytes() if template_file else None
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        if content is not None or size:
+            flags |= os.O_TRUNC
+
+        def create_batch(batch: list[Path]):
+            for path in batch:
+                fd = os.open(path, flags, 0o666)
+                try:
+                    if content:
+                        _write_all(fd, content)
+                    if size:
+                        _resize(fd, size, sparse)
+                finally:
+                    os.close(fd)
+
+        it = iter(paths)
+        batches = iter(lambda: list(islice(it, BATCH_SIZE)), [])
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # list() para que los errores se propaguen
+            list(pool.map(create_batch, batches))
+        return paths
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _resize(fd: int, size: int, sparse: bool):
+    if not sparse and hasattr(os, "posix_fallocate"):
+        os.posix_fallocate(fd, 0, size)
+        # posix_fallocate no achica el archivo si el template era más grande
+        os.ftruncate(fd, size)
+    else:
+        os.ftruncate(fd, size)
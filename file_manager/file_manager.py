@@ -1,31 +1,85 @@
-import logging
+from __future__ import annotations
+
+import fnmatch
+import heapq
+import os
 import re
-import shutil
+import sys
+import time
 import warnings
+from itertools import islice
 from pathlib import Path
-from typing import Callable, Iterable, Optional, Self, Sequence
-
-from .file_creator import FileCreator
-
-# Configuración del logging para guardar en el archivo con ruta personalizada
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Self, Sequence
+
+from .filters import (
+    SORT_KEYS,
+    ContentFilter,
+    ExtensionFilter,
+    Moment,
+    NamesFilter,
+    Predicate,
+    RegexFilter,
+    SizeFilter,
+    TimeFilter,
+    TypeFilter,
+    compile_filters,
+    extension_sets,
+)
+from .stats import OperationStats, StatsHook, logging_hook
+from .walker import TreeWalker
+
+# El resto de los módulos se importa al usarlos: el CLI arranca miles de veces
+# desde cron/pipelines y un find no necesita sqlite3, ctypes ni hashlib
+if TYPE_CHECKING:
+    import logging
+    import threading
+
+    from .archive import ArchiveResult
+    from .copier import CopyResult
+    from .deleter import DeleteResult
+    from .file_creator import FileCreator
+    from .ignore import DirFilter, Pruner
+    from .index import DirectoryIndex
+    from .name_builder import ESNameBuilder
+    from .pathlist import PathList
+    from .renamer import RenamePlan
+    from .sync import SyncResult
+    from .watcher import Watcher
+
+
+def _logger() -> logging.Logger:
+    # logging cuesta ~10 ms de arranque y solo lo usa la instrumentación
+    import logging
+
+    return logging.getLogger(__name__)
 
 
 # TODO: Add function to copy files with a specific extension
 class FileManager:
-    def __init__(self):
+    def __init__(self, workers: int = 1):
         """
         Initializes File Manager for managing files in the specified directory.
 
         Args:
-            search_directory (str): Directory to search for files. Should be a valid path string.
+            workers (int): Threads used to list directories in parallel. Use more than
+                one for network or synced folders, where each listing is slow.
         """
         self.SEARCH_DIR: str | Path
         # self.USER_CWD = Path.cwd()
         self.creator: Optional[FileCreator] = None
         self.max_depth: int = 0
-        self.current_depth: int = 0
+        self.follow_symlinks: bool = False
+        self.workers: int = workers
+        self.index: Optional[DirectoryIndex] = None
+        # Reglas de poda del walk (ver set_ignore/prune_dirs)
+        self.ignore_patterns: list[str] = []
+        self.ignore_files: list[str] = []
+        self.dir_filters: list[str | DirFilter] = []
         self.file_paths: list[Path] = []
         self.conditions: list[Callable] = []
+        # None: sin instrumentación (ver set_instrumentation)
+        self.stats_hooks: Optional[list[StatsHook]] = None
+        self.last_stats: Optional[OperationStats] = None
 
     # -----------------------------------------
     # --------  Basic functionality
@@ -50,38 +104,402 @@ class FileManager:
     def set_max_depth(self, max_depth: int):
         self.max_depth = max_depth
 
-    def copy(self, paths: list[Path], target_dir: Path):
-        for path in paths:
-            if path.is_dir():
-                shutil.copytree(src=path, dst=target_dir)
-            elif path.is_file():
-                shutil.copy(src=path, dst=target_dir)
-            else:
-                raise TypeError(
-                    f"All paths should be of type 'Path', got: {type(path)}"
-                )
+    def set_follow_symlinks(self, follow_symlinks: bool):
+        self.follow_symlinks = follow_symlinks
 
-    def delete(self, paths: list[Path]):
-        for item in paths:
-            item.unlink(missing_ok=True)
+    def set_ignore(
+        self, patterns: Sequence[str] = (), ignore_files: Sequence[str] = ()
+    ):
+        """
+        gitignore-style rules checked during the walk, before a folder is listed,
+        so ignored subtrees cost nothing. Like max_depth they stay set for every
+        operation (see ignore.Pruner).
 
-    def rename(self, paths: list[Path], mapping: dict[str, str]):
-        not_used_names = set(list(mapping.values()))
-        for item in paths:
-            try:
-                new_name = mapping[item.name]
-            except KeyError:
-                continue
-            item.with_name(new_name)
-            try:
-                not_used_names.remove(new_name)
-            except KeyError:
-                pass
-
-        if not_used_names:
-            warnings.warn(
-                f"Some new names were not used in the mapping: {not_used_names}"
+            fm.set_ignore(["*.tmp", "build/", "!build/keep.txt"], [".gitignore"])
+
+        Args:
+            patterns (list): Lines relative to SEARCH_DIR.
+            ignore_files (list): Names of per-folder ignore files to read.
+        """
+        self.ignore_patterns = list(patterns)
+        self.ignore_files = list(ignore_files)
+
+    def prune_dirs(self, *dir_filters: str | DirFilter) -> Self:
+        """
+        Folders not to descend into: a glob on the folder name ("node_modules",
+        ".git", "*.bak") or a callable that takes the folder's walk entry and
+        returns True to cut the branch. They stay set like set_ignore.
+        """
+        self.dir_filters.extend(dir_filters)
+        return self
+
+    def set_index(self, index_path: Optional[str | Path] = None):
+        """
+        Uses a persistent index (SQLite) for the walk, so later collects only list the
+        directories that changed. By default the index is stored in the user cache
+        dir, one file per search dir. Call set_search_dir first.
+        """
+        from .index import DirectoryIndex, default_index_path
+
+        if index_path is None:
+            index_path = default_index_path(self.SEARCH_DIR)
+        if self.index is not None:
+            self.index.close()
+        self.index = DirectoryIndex(index_path)
+
+    def set_instrumentation(
+        self, enabled: bool = True, hooks: Optional[Iterable[StatsHook]] = None
+    ):
+        """
+        Opt-in counters and timings per operation (see OperationStats). After each
+        operation its stats are kept in self.last_stats and passed to every hook.
+
+        Args:
+            hooks (Iterable[StatsHook]): Callables that receive the stats. By default
+                they are logged to this module's logger at INFO level
+                (stats.logging_hook), which also attaches them as record.stats.
+        """
+        if not enabled:
+            self.stats_hooks = None
+        elif hooks is None:
+            self.stats_hooks = [logging_hook(_logger())]
+        else:
+            self.stats_hooks = list(hooks)
+
+    def _start_stats(self, operation: str) -> Optional[OperationStats]:
+        if self.stats_hooks is None:
+            return None
+        return OperationStats(operation)
+
+    def _finish_stats(self, stats: Optional[OperationStats]):
+        if stats is None:
+            return
+        stats.finish()
+        self.last_stats = stats
+        for hook in self.stats_hooks:
+            hook(stats)
+
+    def _walk(
+        self,
+        search_dir: str | Path,
+        stats: Optional[OperationStats] = None,
+        extensions: tuple[Optional[set[str]], set[str]] = (None, set()),
+    ) -> Iterator:
+        """
+        Entries of the walk, with the index if there is one. extensions is
+        (included, excluded) as returned by extension_sets(): with the index they
+        are filtered in SQL for the directories read from it; the caller's
+        predicate still checks them.
+        """
+        if self.index is not None:
+            suffixes, exclude_suffixes = extensions
+            return self.index.walk(
+                search_dir,
+                self.max_depth,
+                self.follow_symlinks,
+                stats=stats,
+                pruner=self._pruner(),
+                suffixes=suffixes,
+                exclude_suffixes=exclude_suffixes,
             )
+        return self._walker(stats).walk(search_dir)
+
+    def _walker(self, stats: Optional[OperationStats] = None) -> TreeWalker:
+        return TreeWalker(
+            max_depth=self.max_depth,
+            follow_symlinks=self.follow_symlinks,
+            workers=self.workers,
+            stats=stats,
+            pruner=self._pruner(),
+        )
+
+    def _pruner(self) -> Optional[Pruner]:
+        if not (self.ignore_patterns or self.ignore_files or self.dir_filters):
+            return None
+        from .ignore import Pruner
+
+        return Pruner(self.ignore_patterns, self.ignore_files, self.dir_filters)
+
+    def copy(
+        self,
+        paths: list[Path],
+        target_dir: Path,
+        preserve_metadata: bool = False,
+        skip_unchanged: bool = False,
+        workers: int = 8,
+    ) -> CopyResult:
+        """
+        Copies files and folders into target_dir (folders go to target_dir / name).
+        Errors are reported per path in the returned CopyResult instead of stopping
+        the batch. See BulkCopier.
+        """
+        from .copier import BulkCopier
+
+        stats = self._start_stats("copy")
+        copier = BulkCopier(
+            workers=workers,
+            preserve_metadata=preserve_metadata,
+            skip_unchanged=skip_unchanged,
+            stats=stats,
+        )
+        result = copier.copy(paths, target_dir)
+        self._finish_stats(stats)
+        return result
+
+    def flatten(
+        self,
+        base_dir: Optional[Path] = None,
+        pattern: str = "*",
+        mode: str = "copy",
+        workers: int = 8,
+    ) -> CopyResult:
+        """
+        Copia un nivel arriba (al directorio base) todos los archivos contenidos en
+        subdirectorios (a cualquier profundidad).
+        - Mantiene solo archivos (no copia carpetas).
+        - Si hay colisión de nombre, antepone el nombre de la carpeta origen (y un
+          contador si hiciera falta).
+
+        Args:
+            base_dir (Path): Directorio base. Por defecto SEARCH_DIR.
+            pattern (str): Patrón glob que deben cumplir los nombres.
+            mode (str): "copy", "reflink", "hardlink" o "move" (ver BulkCopier).
+                Con "hardlink"/"reflink" no se duplican los datos si el origen y el
+                directorio base están en el mismo filesystem.
+        """
+        base_dir = Path(base_dir if base_dir is not None else self.SEARCH_DIR)
+        if not base_dir.is_dir():
+            raise NotADirectoryError(f"{base_dir} no es un directorio")
+        from .copier import BulkCopier
+
+        stats = self._start_stats("flatten")
+        copier = BulkCopier(
+            workers=workers,
+            preserve_metadata=True,
+            skip_unchanged=False,
+            mode=mode,
+            stats=stats,
+        )
+        start = time.perf_counter()
+        pairs = self._plan_flatten(base_dir, pattern, stats)
+        if stats is not None:
+            stats.add_time("plan", time.perf_counter() - start)
+        result = copier.copy_pairs(pairs)
+        self._finish_stats(stats)
+        return result
+
+    def sync(
+        self,
+        target_dir: str | Path,
+        delete_extras: bool = False,
+        dry_run: bool = False,
+        modify_window: float = 0,
+        workers: int = 8,
+        clear_conditions: bool = True,
+    ) -> SyncResult:
+        """
+        Mirrors SEARCH_DIR into target_dir copying only new and changed files (see
+        sync.TreeSync). The conditions select the source files; the whole tree is
+        compared, whatever max_depth is. Paths ignored with set_ignore/prune_dirs
+        are skipped on both sides: neither copied nor removed.
+
+        Args:
+            delete_extras (bool): Also remove what is only in target_dir.
+            dry_run (bool): Only compute the plan (result.plan.diff()).
+            modify_window (float): Accepted mtime difference in seconds.
+        """
+        from .sync import TreeSync
+
+        self._validate_dir(self.SEARCH_DIR)
+        stats = self._start_stats("sync")
+        predicate = compile_filters(self.conditions) if self.conditions else None
+        if clear_conditions:
+            self.conditions.clear()
+        syncer = TreeSync(
+            workers=workers,
+            delete_extras=delete_extras,
+            modify_window=modify_window,
+            predicate=predicate,
+            pruner=self._pruner(),
+            stats=stats,
+        )
+        result = syncer.sync(self.SEARCH_DIR, target_dir, dry_run)
+        self._finish_stats(stats)
+        return result
+
+    def export(
+        self,
+        target: str | Path,
+        format: Optional[str] = None,
+        max_size: Optional[int] = None,
+        level: Optional[int] = None,
+        workers: int = 4,
+        clear_conditions: bool = True,
+    ) -> ArchiveResult:
+        """
+        Streams the matching paths into a zip or tar archive as the walk finds
+        them, compressing on a thread pool (see archive.BulkArchiver). Names are
+        relative to SEARCH_DIR. Folders that match are stored as entries, not
+        walked: filter_by_type("file") to leave them out.
+
+        Args:
+            format (str): "zip", "tar", "tar.gz" or "tar.zst". By default, from
+                the extension of target.
+            max_size (int): Split in archives of at most this many bytes.
+        """
+        from .archive import BulkArchiver
+
+        stats = self._start_stats("export")
+        archiver = BulkArchiver(
+            format or BulkArchiver.format_of(target),
+            workers=workers,
+            level=level,
+            max_size=max_size,
+            base_dir=self.SEARCH_DIR,
+            stats=stats,
+        )
+        result = archiver.export(self.iter_collect(clear_conditions), target)
+        self._finish_stats(stats)
+        return result
+
+    def _plan_flatten(
+        self, base_dir: Path, pattern: str, stats: Optional[OperationStats] = None
+    ) -> list[tuple[Path, Path]]:
+        """
+        Resuelve todos los destinos antes de copiar, contra un set en memoria de los
+        nombres ya ocupados (sin un exists() por archivo).
+        """
+        key = os.path.normcase
+        matches = re.compile(fnmatch.translate(key(pattern))).match
+        with os.scandir(base_dir) as it:
+            taken = {key(entry.name) for entry in it}
+        # Siguiente contador a probar para cada "carpeta - nombre"
+        counters: dict[str, int] = {}
+
+        walker = TreeWalker(
+            max_depth=sys.maxsize, follow_symlinks=self.follow_symlinks, stats=stats
+        )
+        pairs = []
+        for entry in walker.walk(base_dir):
+            parent = os.path.dirname(entry.path)
+            if parent == os.fspath(base_dir):
+                continue
+            if not entry.is_file() or not matches(key(entry.name)):
+                continue
+            target_name = entry.name
+            if key(target_name) in taken:
+                parent_name = os.path.basename(parent)
+                target_name = f"{parent_name} - {entry.name}"
+                counter_key = key(target_name)
+                i = counters.get(counter_key, 1)
+                while key(target_name) in taken:
+                    target_name = f"{parent_name} - {i} - {entry.name}"
+                    i += 1
+                counters[counter_key] = i
+            taken.add(key(target_name))
+            pairs.append((Path(entry.path), base_dir / target_name))
+        return pairs
+
+    def delete(
+        self,
+        paths: Iterable[Path],
+        trash_dir: Optional[str | Path] = None,
+        workers: int = 8,
+        cancel: Optional[threading.Event] = None,
+    ) -> DeleteResult:
+        """
+        Removes files, links and folder trees (e.g. what collect() returns past
+        max_depth) on a thread pool. Missing paths are ignored, and a failure is
+        reported in the result without stopping the batch.
+
+        Args:
+            trash_dir (str | Path): Move the paths to this folder instead, with a
+                journal to undo it (deleter.restore_trash) or remove them for good
+                later (deleter.empty_trash).
+            workers (int): Threads removing at the same time.
+            cancel (threading.Event): Set it from another thread to stop the
+                batch early (see BulkDeleter).
+        """
+        from .deleter import BulkDeleter
+
+        stats = self._start_stats("delete")
+        deleter = BulkDeleter(
+            workers=workers, trash_dir=trash_dir, stats=stats, cancel=cancel
+        )
+        result = deleter.delete(paths)
+        self._finish_stats(stats)
+        return result
+
+    def rename(
+        self,
+        paths: list[Path],
+        mapping: dict[str, str] | ESNameBuilder,
+        dry_run: bool = False,
+        journal_path: Optional[Path] = None,
+    ) -> RenamePlan:
+        """
+        Renames paths on disk with {old name: new name} or an ESNameBuilder pipeline.
+        The whole plan is checked for collisions first and executed with a journal
+        (see renamer.plan_renames). With dry_run nothing is renamed; print
+        plan.diff() to review it.
+        """
+        from .renamer import plan_renames
+
+        stats = self._start_stats("rename")
+        start = time.perf_counter()
+        plan = plan_renames(paths, mapping)
+        if stats is not None:
+            stats.add_time("plan", time.perf_counter() - start)
+            stats.count("renames", len(plan.mapping))
+            stats.count("collisions", len(plan.collisions))
+        if isinstance(mapping, dict):
+            not_used_names = set(mapping.values()) - {
+                mapping[item.name] for item in paths if item.name in mapping
+            }
+            if not_used_names:
+                warnings.warn(
+                    f"Some new names were not used in the mapping: {not_used_names}"
+                )
+        if not dry_run:
+            start = time.perf_counter()
+            plan.execute(journal_path)
+            if stats is not None:
+                stats.add_time("execute", time.perf_counter() - start)
+        self._finish_stats(stats)
+        return plan
+
+    def find_duplicates(self, paths: list[Path], workers: int = 4) -> list[list[Path]]:
+        """Groups of paths with identical content (see DuplicateFinder)."""
+        from .dedupe import DuplicateFinder
+
+        stats = self._start_stats("find_duplicates")
+        groups = DuplicateFinder(workers=workers, stats=stats).find(paths)
+        if stats is not None:
+            stats.count("groups", len(groups))
+        self._finish_stats(stats)
+        return groups
+
+    def cluster_names(
+        self,
+        paths: list[Path],
+        threshold: float = 0.8,
+        normalizer: Optional[ESNameBuilder] = None,
+    ) -> list[list[Path]]:
+        """
+        Groups of paths with similar names, copy markers, case and accents aside
+        (see NameClusterer). Pass them through within_clusters() with the groups
+        of find_duplicates() to only dedupe copies of the same file, and use
+        plan_name_cleanup(..., clean=clean_copy_name) for the names left.
+        """
+        from .clusters import NameClusterer
+
+        stats = self._start_stats("cluster_names")
+        clusterer = NameClusterer(threshold, normalizer, stats=stats)
+        clusters = clusterer.cluster(paths)
+        if stats is not None:
+            stats.count("clusters", len(clusters))
+        self._finish_stats(stats)
+        return clusters
 
     def append_to_name(self, paths: list[Path]):
         pass
@@ -90,34 +508,19 @@ class FileManager:
         """
         Lista los nombres de archivos presentes en el directorio de búsqueda.
         Si encuentra un folder, entra al folder y busca archivos recursivamente
-        dependiendo de max_depth.
+        dependiendo de max_depth. Los folders que quedan más abajo de max_depth
+        se devuelven como rutas.
 
         Args:
         ---------
-            max_depth (int):
-                Máximo de iteraciones recursivas
+            search_dir (Path):
+                Directorio de búsqueda
 
         Returns:
-            list: Lista de nombres de archivos filtrados y formateados según los parámetros.
+            list: Lista de rutas encontradas (vacía si el directorio está vacío).
         """
-        self.current_depth += 1
         self._validate_dir(search_dir)
-
-        found_file_paths = []
-        for file in search_dir.iterdir():
-            if file.is_dir():
-                if self.current_depth <= self.max_depth:
-                    found_file_paths.extend(self._list_files_recursive(file))
-                else:
-                    found_file_paths.append(file)
-            elif file.is_file():
-                found_file_paths.append(file)
-
-        if not found_file_paths:
-            raise ValueError("No se encontraron archivos en la carpeta")
-
-        self.current_depth = 0
-        return found_file_paths
+        return [Path(entry.path) for entry in self._walk(search_dir)]
 
     # TODO: Move to file_filterer or smth
     def filter_by_extension(
@@ -129,12 +532,7 @@ class FileManager:
         if extension and not extension[0] == ".":
             raise ValueError("'extension' should start with a '.'")
 
-        if filter_out:
-            condition = lambda x: x if x.suffix != extension else None
-        else:
-            condition = lambda x: x if x.suffix == extension else None
-
-        self.conditions.append(condition)
+        self.conditions.append(ExtensionFilter(extension, filter_out=filter_out))
         return self
 
     def filter_by_regex_match(
@@ -143,71 +541,312 @@ class FileManager:
         filter_out: bool = False,
         # file_paths: Optional[list[Path]] = None,
     ) -> Self:
-        if filter_out:
-            condition = (
-                lambda x: x if not re.match(pattern=regex, string=x.stem) else None
-            )
-        else:
-            condition = lambda x: x if re.match(pattern=regex, string=x.stem) else None
-
-        self.conditions.append(condition)
+        self.conditions.append(RegexFilter(regex, search=False, filter_out=filter_out))
         return self
-        
+
     def filter_by_regex_search(
         self,
         regex: str,
         filter_out: bool = False,
         # file_paths: Optional[list[Path]] = None,
     ) -> Self:
-        if filter_out:
-            condition = (
-                lambda x: x if not re.search(pattern=regex, string=x.stem) else None
-            )
-        else:
-            condition = lambda x: x if re.search(pattern=regex, string=x.stem) else None
-
-        self.conditions.append(condition)
+        self.conditions.append(RegexFilter(regex, search=True, filter_out=filter_out))
         return self
 
     def filter_by_names(self, names: Sequence[str], filter_out: bool = False) -> Self:
-        names_set = set(names)
+        self.conditions.append(NamesFilter(names, filter_out=filter_out))
+        return self
 
-        if filter_out:
-            condition = lambda x: x if x.stem not in names_set else None
-        else:
-            condition = lambda x: x if x.stem in names_set else None
+    def filter_by_size(
+        self,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        filter_out: bool = False,
+    ) -> Self:
+        """Size in bytes between min_size and max_size (both included)."""
+        self.conditions.append(SizeFilter(min_size, max_size, filter_out=filter_out))
+        return self
 
-        self.conditions.append(condition)
+    def filter_by_mtime(
+        self,
+        after: Optional[Moment] = None,
+        before: Optional[Moment] = None,
+        filter_out: bool = False,
+    ) -> Self:
+        """
+        Modified between after and before (timestamp, datetime, or timedelta for
+        "this long ago"), e.g. before=timedelta(days=30) for files older than a month.
+        """
+        self.conditions.append(TimeFilter("mtime", after, before, filter_out))
         return self
 
+    def filter_by_ctime(
+        self,
+        after: Optional[Moment] = None,
+        before: Optional[Moment] = None,
+        filter_out: bool = False,
+    ) -> Self:
+        """Like filter_by_mtime with st_ctime (creation time on Windows)."""
+        self.conditions.append(TimeFilter("ctime", after, before, filter_out))
+        return self
+
+    def filter_by_type(self, kind: str, filter_out: bool = False) -> Self:
+        """kind: "file", "dir" or "symlink"."""
+        self.conditions.append(TypeFilter(kind, filter_out=filter_out))
+        return self
+
+    def filter_by_content(
+        self,
+        pattern: str | bytes,
+        ignore_case: bool = False,
+        include_binary: bool = False,
+        filter_out: bool = False,
+        workers: Optional[int] = None,
+    ) -> Self:
+        """
+        Files whose content matches the regex pattern (see ContentFilter). It runs
+        after every other condition, whatever the order they were added in, so
+        combine it with cheap name/size filters to open as few files as possible.
+
+        Args:
+            workers (int): Processes searching the files. All the CPUs by default.
+        """
+        self.conditions.append(
+            ContentFilter(pattern, ignore_case, include_binary, filter_out, workers)
+        )
+        return self
+
+    def iter_collect(self, clear_conditions: bool = True) -> Iterator[Path]:
+        """
+        Lazy version of collect(). Paths are yielded as the walk finds them, after
+        passing every condition, so the caller can stop early.
+
+        The conditions are taken (and cleared) when this method is called, not when
+        the iteration starts. With instrumentation the stats are reported when the
+        iteration ends or the iterator is closed.
+        """
+        return self._paths(self._iter_entries("collect", clear_conditions))
+
+    @staticmethod
+    def _paths(entries: Iterator) -> Iterator[Path]:
+        try:
+            for entry in entries:
+                yield Path(entry.path)
+        finally:
+            entries.close()
+
+    def _iter_entries(self, operation: str, clear_conditions: bool) -> Iterator:
+        """Walk entries that pass the conditions (see iter_collect)."""
+        self._validate_dir(self.SEARCH_DIR)
+        stats = self._start_stats(operation)
+        # Los filtros de contenido van al final, sobre lo que pasó todo lo demás
+        content = [c for c in self.conditions if isinstance(c, ContentFilter)]
+        predicate = compile_filters(
+            [c for c in self.conditions if not isinstance(c, ContentFilter)], stats
+        )
+        extensions = extension_sets(self.conditions)
+        if clear_conditions:
+            self.conditions.clear()
+        if stats is not None:
+            return self._iter_matches_instrumented(
+                predicate, content, stats, extensions
+            )
+        return self._search_contents(self._iter_matches(predicate, extensions), content)
+
+    @staticmethod
+    def _search_contents(
+        entries: Iterator,
+        content: list[ContentFilter],
+        stats: Optional[OperationStats] = None,
+    ) -> Iterator:
+        if not content:
+            return entries
+        from .content import search_contents
+
+        workers = max((c.workers or 0 for c in content), default=0) or None
+        return search_contents(entries, [c.spec() for c in content], workers, stats)
+
+    def _iter_matches(
+        self,
+        predicate: Predicate,
+        extensions: tuple[Optional[set[str]], set[str]] = (None, set()),
+    ) -> Iterator:
+        for entry in self._walk(self.SEARCH_DIR, extensions=extensions):
+            if predicate(entry):
+                yield entry
+
+    def _iter_matches_instrumented(
+        self,
+        predicate: Predicate,
+        content: list[ContentFilter],
+        stats: OperationStats,
+        extensions: tuple[Optional[set[str]], set[str]] = (None, set()),
+    ) -> Iterator:
+        """Same as _iter_matches, timing the walk and the filters separately."""
+        clock = time.perf_counter
+        walk_time = filter_time = 0.0
+
+        def candidates() -> Iterator:
+            nonlocal walk_time, filter_time
+            entries = iter(self._walk(self.SEARCH_DIR, stats, extensions))
+            while True:
+                t0 = clock()
+                entry = next(entries, None)
+                t1 = clock()
+                walk_time += t1 - t0
+                if entry is None:
+                    break
+                accepted = predicate(entry)
+                filter_time += clock() - t1
+                if accepted:
+                    yield entry
+
+        matches = self._search_contents(candidates(), content, stats)
+        try:
+            for entry in matches:
+                stats.count("matches")
+                yield entry
+        finally:
+            matches.close()
+            stats.add_time("walk", walk_time)
+            stats.add_time("filter", filter_time)
+            self._finish_stats(stats)
+
     def collect(self, clear_conditions: bool = True) -> list[Path]:
-        file_paths = self._list_files_recursive(self.SEARCH_DIR)
-        file_paths_filtered = [
-            path
-            for path in file_paths
-            if all(cond(path) is not None for cond in self.conditions)
-        ]
+        return list(self.iter_collect(clear_conditions))
+
+    def collect_compact(
+        self, with_stat: bool = False, clear_conditions: bool = True
+    ) -> PathList:
+        """
+        Same as collect() in a PathList, several times smaller than a list[Path]
+        for big scans. With with_stat, size and mtime are kept too (see PathList).
+        """
+        from .pathlist import PathList
+
+        entries = self._iter_entries("collect", clear_conditions)
+        try:
+            return PathList.from_entries(entries, with_stat)
+        finally:
+            entries.close()
+
+    def first(self, n: int = 1, clear_conditions: bool = True) -> list[Path]:
+        """Returns up to n matching paths, stopping the walk as soon as they are found."""
+        return list(islice(self.iter_collect(clear_conditions), n))
+
+    def exists(self, clear_conditions: bool = True) -> bool:
+        """True if at least one path matches the conditions."""
+        return bool(self.first(1, clear_conditions))
+
+    def _keyed(self, operation: str, by: str, clear_conditions: bool) -> Iterator:
+        """(key, entry) pairs of the matching entries that can be read."""
+        if by not in SORT_KEYS:
+            raise ValueError(f"'by' should be one of {tuple(SORT_KEYS)}, got: {by!r}")
+        key = SORT_KEYS[by]
+        entries = self._iter_entries(operation, clear_conditions)
+        try:
+            for entry in entries:
+                try:
+                    yield key(entry), entry
+                except OSError:
+                    continue
+        finally:
+            entries.close()
+
+    def sort_by(
+        self, by: str = "name", reverse: bool = False, clear_conditions: bool = True
+    ) -> list[Path]:
+        """
+        collect() sorted by "name", "path", "size", "mtime" or "ctime". The stat data
+        is the one the walk entries already have (one stat per entry at most).
+        """
+        keyed = sorted(
+            self._keyed("sort_by", by, clear_conditions),
+            key=lambda pair: pair[0],
+            reverse=reverse,
+        )
+        return [Path(entry.path) for _key, entry in keyed]
+
+    def top_k(
+        self,
+        k: int,
+        by: str = "size",
+        largest: bool = True,
+        clear_conditions: bool = True,
+    ) -> list[Path]:
+        """
+        The k matching paths with the largest (or smallest) key, e.g. the 100 biggest
+        files: fm.filter_by_type("file").top_k(100). A heap of k entries is kept
+        while walking (O(n log k)), the whole result is never sorted or kept in
+        memory. Ties keep walk order.
+        """
+        select = heapq.nlargest if largest else heapq.nsmallest
+        keyed = self._keyed("top_k", by, clear_conditions)
+        top = select(k, keyed, key=lambda pair: pair[0])
+        return [Path(entry.path) for _key, entry in top]
+
+    def watch(
+        self,
+        debounce: float = 0.1,
+        backend: str = "auto",
+        poll_interval: float = 1.0,
+        clear_conditions: bool = True,
+    ) -> Watcher:
+        """
+        Collects once and keeps the result up to date from filesystem events
+        instead of walking the tree again. Changes are read in debounced batches:
+
+            with fm.filter_by_extension(".xlsx").watch() as watcher:
+                for batch in watcher:
+                    print(batch.added, batch.removed)
+
+        watcher.paths is the current result set. See Watcher for the arguments.
+        """
+        self._validate_dir(self.SEARCH_DIR)
+        predicate = compile_filters(self.conditions)
         if clear_conditions:
             self.conditions.clear()
-        return file_paths_filtered
+        from .watcher import Watcher
+
+        return Watcher(
+            self.SEARCH_DIR,
+            predicate,
+            max_depth=self.max_depth,
+            follow_symlinks=self.follow_symlinks,
+            debounce=debounce,
+            backend=backend,
+            poll_interval=poll_interval,
+            pruner=self._pruner(),
+        )
 
     def __assert_creator(self):
         if not self.creator:
+            from .file_creator import FileCreator
+
             self.creator = FileCreator()
 
     def touch(self, file: str | list[str]) -> None:
         """Creates a file in user CWD"""
         self.__assert_creator()
         if isinstance(file, str):
-            self.creator.create_file(file_name)
+            self.creator.create_file(file)
         elif isinstance(file, list):
             for file_name in file:
                 self.creator.create_file(file_name)
 
-    def create_files(self, files: Iterable[str | Path], target_dir: Path):
-        """Creates a file in target_dir"""
+    def create_files(
+        self,
+        files: Iterable[str | Path],
+        target_dir: Path,
+        size: int = 0,
+        sparse: bool = True,
+        template_file: Optional[Path] = None,
+    ) -> list[Path]:
+        """Creates files in target_dir (see FileCreator.create_files)"""
         self.__assert_creator()
-        return self.creator.create_files(files, target_dir)
+        return self.creator.create_files(
+            files, target_dir, size=size, sparse=sparse, template_file=template_file
+        )
 
     # @staticmethod
     # def sort_files_by_number(file_list: list) -> list:
@@ -0,0 +1,432 @@
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from .stats import OperationStats
+
+# Un predicado recibe una entrada del walk (os.DirEntry o IndexEntry)
+Predicate = Callable[[object], bool]
+
+
+def split_name(name: str) -> tuple[str, str]:
+    """Returns (stem, suffix) of a file name with the same rules as Path.stem/Path.suffix."""
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[:i], name[i:]
+    return name, ""
+
+
+class Filter:
+    """
+    Base class of the conditions stored in FileManager.conditions.
+
+    Calling a filter with a Path keeps the old interface of the conditions
+    (returns the path or None); compile_filters() reads their attributes instead
+    to build a single predicate.
+    """
+
+    def __init__(self, filter_out: bool = False):
+        self.filter_out = filter_out
+
+    def accepts(self, stem: str, suffix: str) -> bool:
+        raise NotImplementedError
+
+    def __call__(self, path: Path) -> Optional[Path]:
+        return path if self.accepts(path.stem, path.suffix) else None
+
+    def __repr__(self) -> str:
+        out = ", filter_out=True" if self.filter_out else ""
+        return f"{type(self).__name__}({self._describe()}{out})"
+
+    def _describe(self) -> str:
+        return ""
+
+
+class ExtensionFilter(Filter):
+    def __init__(self, extension: str, filter_out: bool = False):
+        super().__init__(filter_out)
+        self.extension = extension
+
+    def accepts(self, stem: str, suffix: str) -> bool:
+        return (suffix == self.extension) != self.filter_out
+
+    def _describe(self) -> str:
+        return repr(self.extension)
+
+
+class NamesFilter(Filter):
+    def __init__(self, names: Iterable[str], filter_out: bool = False):
+        super().__init__(filter_out)
+        self.names = frozenset(names)
+
+    def accepts(self, stem: str, suffix: str) -> bool:
+        return (stem in self.names) != self.filter_out
+
+    def _describe(self) -> str:
+        return repr(sorted(self.names))
+
+
+class RegexFilter(Filter):
+    def __init__(self, regex: str, search: bool = False, filter_out: bool = False):
+        """
+        Args:
+            regex (str): Pattern applied to the file stem.
+            search (bool): Use re.search instead of re.match.
+        """
+        super().__init__(filter_out)
+        self.regex = regex
+        self.search = search
+        self.pattern = re.compile(regex)
+
+    def accepts(self, stem: str, suffix: str) -> bool:
+        method = self.pattern.search if self.search else self.pattern.match
+        return (method(stem) is not None) != self.filter_out
+
+    def _describe(self) -> str:
+        return repr(self.regex) + (", search=True" if self.search else "")
+
+
+class EntryFilter(Filter):
+    """
+    Condition on the walk entry itself (type or stat data) instead of its name.
+    The stat data comes from the entry: os.DirEntry and IndexEntry cache it after
+    the first call (on Windows scandir already has it), so it is read at most once
+    per entry, also when sorting afterwards.
+    """
+
+    def accepts_entry(self, entry) -> bool:
+        raise NotImplementedError
+
+    def accepts(self, stem: str, suffix: str) -> bool:
+        raise TypeError(f"{type(self).__name__} needs the entry, not only the name")
+
+    def __call__(self, path: Path) -> Optional[Path]:
+        # Path tiene la misma interfaz que las entradas (stat, is_file, is_dir...)
+        return path if self.accepts_entry(path) else None
+
+
+def entry_stat(entry) -> Optional[os.stat_result]:
+    """Stat data of a walk entry, or None if it can't be read (e.g. broken link)."""
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+
+class SizeFilter(EntryFilter):
+    def __init__(
+        self,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        filter_out: bool = False,
+    ):
+        """Size in bytes between min_size and max_size (both included)."""
+        super().__init__(filter_out)
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def accepts_entry(self, entry) -> bool:
+        st = entry_stat(entry)
+        if st is None:
+            return False
+        inside = (self.min_size is None or st.st_size >= self.min_size) and (
+            self.max_size is None or st.st_size <= self.max_size
+        )
+        return inside != self.filter_out
+
+    def _describe(self) -> str:
+        return f"min_size={self.min_size}, max_size={self.max_size}"
+
+
+# Un instante: timestamp, datetime, o timedelta = hace cuánto (relativo a ahora)
+Moment = float | datetime | timedelta
+
+
+def _timestamp(moment: Optional[Moment]) -> Optional[float]:
+    if moment is None or isinstance(moment, (int, float)):
+        return moment
+    if isinstance(moment, timedelta):
+        return time.time() - moment.total_seconds()
+    return moment.timestamp()
+
+
+class TimeFilter(EntryFilter):
+    FIELDS = ("mtime", "ctime")
+
+    def __init__(
+        self,
+        field: str = "mtime",
+        after: Optional[Moment] = None,
+        before: Optional[Moment] = None,
+        filter_out: bool = False,
+    ):
+        """
+        Time of the entry between after and before. A timedelta is relative to the
+        moment the filter is created: after=timedelta(days=7) keeps what changed in
+        the last week, before=timedelta(days=30) what is older than 30 days.
+
+        Args:
+            field (str): "mtime" or "ctime" (metadata change on Unix, creation time
+                on Windows).
+        """
+        if field not in self.FIELDS:
+            raise ValueError(f"'field' should be one of {self.FIELDS}, got: {field!r}")
+        super().__init__(filter_out)
+        self.field = field
+        self.after = _timestamp(after)
+        self.before = _timestamp(before)
+        self._attr = f"st_{field}"
+
+    def accepts_entry(self, entry) -> bool:
+        st = entry_stat(entry)
+        if st is None:
+            return False
+        t = getattr(st, self._attr)
+        inside = (self.after is None or t >= self.after) and (
+            self.before is None or t < self.before
+        )
+        return inside != self.filter_out
+
+    def _describe(self) -> str:
+        return f"{self.field!r}, after={self.after}, before={self.before}"
+
+
+class TypeFilter(EntryFilter):
+    KINDS = ("file", "dir", "symlink")
+
+    def __init__(self, kind: str, filter_out: bool = False):
+        """File type from the walk (no stat on Linux/Windows: scandir knows it)."""
+        if kind not in self.KINDS:
+            raise ValueError(f"'kind' should be one of {self.KINDS}, got: {kind!r}")
+        super().__init__(filter_out)
+        self.kind = kind
+
+    def accepts_entry(self, entry) -> bool:
+        if self.kind == "file":
+            is_kind = entry.is_file()
+        elif self.kind == "dir":
+            is_kind = entry.is_dir()
+        else:
+            is_kind = entry.is_symlink()
+        return is_kind != self.filter_out
+
+    def _describe(self) -> str:
+        return repr(self.kind)
+
+
+class ContentFilter(EntryFilter):
+    def __init__(
+        self,
+        pattern: str | bytes,
+        ignore_case: bool = False,
+        include_binary: bool = False,
+        filter_out: bool = False,
+        workers: Optional[int] = None,
+    ):
+        """
+        Bytes regex searched in the content of files (a str pattern is encoded as
+        UTF-8). Folders, unreadable files and, unless include_binary, binary files
+        (a NUL byte in the first 8 KiB) never pass, also with filter_out.
+
+        compile_filters() checks it after every other condition, one file at a
+        time; FileManager.iter_collect instead searches on a process pool the
+        entries that passed the rest (see content.py).
+        """
+        super().__init__(filter_out)
+        self.pattern = pattern.encode() if isinstance(pattern, str) else pattern
+        self.flags = re.IGNORECASE if ignore_case else 0
+        self.include_binary = include_binary
+        self.workers = workers
+        # Errores del patrón acá y no en un proceso del pool
+        re.compile(self.pattern, self.flags)
+
+    def spec(self) -> tuple[bytes, int, bool, bool]:
+        """Picklable description for the worker processes."""
+        return self.pattern, self.flags, self.include_binary, self.filter_out
+
+    def accepts_entry(self, entry) -> bool:
+        from .content import search_file
+
+        return entry.is_file() and search_file(os.fspath(entry), [self.spec()])
+
+    def _describe(self) -> str:
+        return repr(self.pattern)
+
+
+# Claves de orden para FileManager.sort_by/top_k, sobre las entradas del walk
+SORT_KEYS: dict[str, Callable[[object], object]] = {
+    "name": lambda entry: entry.name,
+    "path": lambda entry: entry.path,
+    "size": lambda entry: entry.stat().st_size,
+    "mtime": lambda entry: entry.stat().st_mtime,
+    "ctime": lambda entry: entry.stat().st_ctime,
+}
+
+
+def _merge_patterns(filters: list[RegexFilter]) -> list[re.Pattern]:
+    """
+    Joins the patterns in a single alternation when it is safe (no groups, so no
+    backreferences get renumbered). Otherwise each pattern is kept on its own.
+    """
+    if len(filters) > 1 and all(f.pattern.groups == 0 for f in filters):
+        try:
+            return [re.compile("|".join(f"(?:{f.regex})" for f in filters))]
+        except re.error:
+            # p.ej. flags globales "(?i)" que no pueden ir en medio del patrón
+            pass
+    return [f.pattern for f in filters]
+
+
+def _entry_filter_cost(f: EntryFilter) -> int:
+    if isinstance(f, TypeFilter):
+        return 0
+    return 2 if isinstance(f, ContentFilter) else 1
+
+
+def extension_sets(
+    conditions: Iterable[Callable],
+) -> tuple[Optional[set[str]], set[str]]:
+    """
+    (included, excluded) extensions of the ExtensionFilters among conditions,
+    merged as compile_filters() does. included is None when no extension filter
+    requires one; when it isn't, excluded is already subtracted from it.
+    """
+    include_ext: Optional[set[str]] = None
+    exclude_ext: set[str] = set()
+    for cond in conditions:
+        if not isinstance(cond, ExtensionFilter):
+            continue
+        if cond.filter_out:
+            exclude_ext.add(cond.extension)
+        elif include_ext is None:
+            include_ext = {cond.extension}
+        else:
+            include_ext &= {cond.extension}
+    if include_ext is not None and exclude_ext:
+        include_ext -= exclude_ext
+        exclude_ext = set()
+    return include_ext, exclude_ext
+
+
+def compile_filters(
+    conditions: Iterable[Callable], stats: Optional[OperationStats] = None
+) -> Predicate:
+    """
+    Turns the conditions of a FileManager into one predicate over walk entries.
+
+    - Stem and suffix are computed once per entry.
+    - Extension and name filters become set lookups (includes are intersected,
+      excludes are merged).
+    - Regexes are precompiled; excluding regexes of the same kind are merged into
+      one alternation.
+    - Cheap checks run first: sets, then regexes, then type and stat filters
+      (only for entries that passed the name checks), then content filters, then
+      any other callable, which still receives a Path.
+
+    With stats, every rejected entry is checked again against each condition to
+    count it in stats.rejected under the first condition that rejects it. Accepted
+    entries don't pay for it.
+    """
+    conditions = list(conditions)
+    include_ext, exclude_ext = extension_sets(conditions)
+    include_names: Optional[frozenset[str]] = None
+    exclude_names: set[str] = set()
+    include_regex: list[RegexFilter] = []
+    exclude_match: list[RegexFilter] = []
+    exclude_search: list[RegexFilter] = []
+    entry_filters: list[EntryFilter] = []
+    others: list[Callable] = []
+
+    for cond in conditions:
+        if isinstance(cond, ExtensionFilter):
+            continue  # ya están en include_ext/exclude_ext
+        elif isinstance(cond, NamesFilter):
+            if cond.filter_out:
+                exclude_names |= cond.names
+            elif include_names is None:
+                include_names = cond.names
+            else:
+                include_names &= cond.names
+        elif isinstance(cond, EntryFilter):
+            entry_filters.append(cond)
+        elif isinstance(cond, RegexFilter):
+            if not cond.filter_out:
+                include_regex.append(cond)
+            elif cond.search:
+                exclude_search.append(cond)
+            else:
+                exclude_match.append(cond)
+        else:
+            others.append(cond)
+
+    if include_names is not None and exclude_names:
+        include_names -= exclude_names
+        exclude_names = set()
+    if include_ext == set() or include_names == frozenset():
+        # Condiciones contradictorias: nada puede pasar
+        if stats is not None:
+            return _counting(lambda entry: False, conditions, stats)
+        return lambda entry: False
+
+    includes = [
+        f.pattern.search if f.search else f.pattern.match for f in include_regex
+    ]
+    excludes = [p.match for p in _merge_patterns(exclude_match)]
+    excludes += [p.search for p in _merge_patterns(exclude_search)]
+    # El tipo no necesita stat, va primero; el contenido abre el archivo, al final
+    entry_checks = [
+        f.accepts_entry for f in sorted(entry_filters, key=_entry_filter_cost)
+    ]
+
+    def predicate(entry) -> bool:
+        stem, suffix = split_name(entry.name)
+        if include_ext is not None and suffix not in include_ext:
+            return False
+        if exclude_ext and suffix in exclude_ext:
+            return False
+        if include_names is not None and stem not in include_names:
+            return False
+        if exclude_names and stem in exclude_names:
+            return False
+        for method in excludes:
+            if method(stem) is not None:
+                return False
+        for method in includes:
+            if method(stem) is None:
+                return False
+        for check in entry_checks:
+            if not check(entry):
+                return False
+        if others:
+            path = Path(entry.path)
+            return all(cond(path) is not None for cond in others)
+        return True
+
+    if stats is not None:
+        return _counting(predicate, conditions, stats)
+    return predicate
+
+
+def _counting(
+    predicate: Predicate, conditions: list[Callable], stats: OperationStats
+) -> Predicate:
+    def counted(entry) -> bool:
+        if predicate(entry):
+            return True
+        stem, suffix = split_name(entry.name)
+        for cond in conditions:
+            if isinstance(cond, EntryFilter):
+                rejected = not cond.accepts_entry(entry)
+            elif isinstance(cond, Filter):
+                rejected = not cond.accepts(stem, suffix)
+            else:
+                rejected = cond(Path(entry.path)) is None
+            if rejected:
+                stats.reject(repr(cond))
+                break
+        return False
+
+    return counted
@@ -0,0 +1,220 @@
+import fnmatch
+import os
+import re
+from typing import Callable, Iterable, Optional, Sequence
+
+# Condición sobre una carpeta (entrada del walk): True la poda con todo su contenido
+DirFilter = Callable[[object], bool]
+
+
+def _translate(glob: str) -> str:
+    """gitignore glob (without the anchoring rules) to a regex over '/' paths."""
+    out = []
+    i, n = 0, len(glob)
+    while i < n:
+        c = glob[i]
+        if glob.startswith("**", i):
+            at_start = i == 0 or glob[i - 1] == "/"
+            at_end = i + 2 == n or glob[i + 2] == "/"
+            if at_start and i + 2 == n:
+                out.append(".*")  # "a/**": todo lo que está adentro
+                i += 2
+                continue
+            if at_start and at_end:
+                out.append("(?:.*/)?")  # "**/a", "a/**/b": cero o más carpetas
+                i += 3
+                continue
+            out.append("[^/]*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            j = glob.find("]", i + 2 if glob.startswith(("[!", "[]"), i) else i + 1)
+            if j < 0:
+                out.append(r"\[")
+                i += 1
+                continue
+            body = glob[i + 1 : j]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = j + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+class IgnorePattern:
+    __slots__ = ("pattern", "regex", "negated", "dir_only")
+
+    def __init__(self, pattern: str):
+        """
+        One line of a .gitignore. Lines with a "/" (other than a trailing one) are
+        relative to the folder of the rules; the rest match the name at any depth.
+        A trailing "/" only matches folders, "!" re-includes what a previous line
+        excluded, and "**" spans folders.
+        """
+        self.pattern = pattern
+        self.negated = pattern.startswith("!")
+        if self.negated:
+            pattern = pattern[1:]
+        elif pattern.startswith(("\\!", "\\#")):
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        body = _translate(pattern.lstrip("/"))
+        self.regex = re.compile(body if anchored else f"(?:.*/)?{body}", re.DOTALL)
+
+    def __repr__(self) -> str:
+        return f"IgnorePattern({self.pattern!r})"
+
+
+def parse_ignore_lines(lines: Iterable[str]) -> list[IgnorePattern]:
+    patterns = []
+    for line in lines:
+        line = line.rstrip("\n\r")
+        # Los espacios finales se ignoran salvo escapados con "\"
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "
+        if stripped and not stripped.startswith("#"):
+            patterns.append(IgnorePattern(stripped))
+    return patterns
+
+
+class IgnoreRules:
+    def __init__(self, patterns: Sequence[IgnorePattern]):
+        """
+        Patterns of one folder, checked like git does: the last matching pattern
+        decides. Without "!" patterns the lines are joined in one regex per kind
+        (any entry / folders only), so each check is at most two matches.
+        """
+        self.patterns = list(patterns)
+        self._merged: Optional[tuple[Optional[re.Pattern], Optional[re.Pattern]]] = None
+        if not any(p.negated for p in self.patterns):
+            self._merged = (
+                _join(p for p in self.patterns if not p.dir_only),
+                _join(p for p in self.patterns if p.dir_only),
+            )
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included with "!", None if no line matches."""
+        if self._merged is not None:
+            any_entry, dirs_only = self._merged
+            if any_entry is not None and any_entry.fullmatch(rel_path):
+                return True
+            if is_dir and dirs_only is not None and dirs_only.fullmatch(rel_path):
+                return True
+            return None
+        for pattern in reversed(self.patterns):
+            if pattern.dir_only and not is_dir:
+                continue
+            if pattern.regex.fullmatch(rel_path):
+                return not pattern.negated
+        return None
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+
+def _join(patterns: Iterable[IgnorePattern]) -> Optional[re.Pattern]:
+    sources = [p.regex.pattern for p in patterns]
+    if not sources:
+        return None
+    return re.compile("|".join(f"(?:{s})" for s in sources), re.DOTALL)
+
+
+class Pruner:
+    def __init__(
+        self,
+        patterns: Sequence[str] = (),
+        ignore_files: Sequence[str] = (),
+        dir_filters: Sequence[str | DirFilter] = (),
+    ):
+        """
+        Rules checked by the walker before yielding an entry or descending into a
+        folder, so ignored subtrees are never listed.
+
+        Args:
+            patterns (list): gitignore-style lines, relative to the search dir.
+            ignore_files (list): Names of per-folder ignore files (e.g. ".gitignore").
+                Their lines apply to the folder they are in and below, after the
+                lines of the folders above (a deeper file can re-include with "!").
+            dir_filters (list): Folders to cut off with all their content: a glob
+                matched on the folder name (e.g. "node_modules", "*.bak") or a
+                callable that takes the folder's walk entry and returns True to
+                prune it.
+        """
+        self.rules = IgnoreRules(parse_ignore_lines(patterns))
+        self.ignore_files = frozenset(ignore_files)
+        globs = [f for f in dir_filters if isinstance(f, str)]
+        self._dir_names = None
+        if globs:
+            joined = "|".join(fnmatch.translate(g) for g in globs)
+            self._dir_names = re.compile(joined).match
+        self._dir_checks = [f for f in dir_filters if not isinstance(f, str)]
+
+    def root(self) -> "IgnoreScope":
+        scopes = ((0, self.rules),) if self.rules else ()
+        return IgnoreScope(self, "", scopes)
+
+    def prunes_dir(self, entry) -> bool:
+        if self._dir_names is not None and self._dir_names(entry.name):
+            return True
+        return any(check(entry) for check in self._dir_checks)
+
+
+class IgnoreScope:
+    __slots__ = ("pruner", "prefix", "scopes")
+
+    def __init__(
+        self, pruner: Pruner, prefix: str, scopes: tuple[tuple[int, IgnoreRules], ...]
+    ):
+        """
+        Rules in effect inside one folder. prefix is the folder relative to the
+        search dir ("" or ending in "/"); scopes are (len of the prefix of the
+        folder that defined them, rules), shallowest first.
+        """
+        self.pruner = pruner
+        self.prefix = prefix
+        self.scopes = scopes
+
+    def load(self, dir_path: str, names: Iterable[str]) -> "IgnoreScope":
+        """Adds the rules of the ignore files among names (the folder's listing)."""
+        files = self.pruner.ignore_files
+        if not files:
+            return self
+        patterns: list[IgnorePattern] = []
+        for name in sorted(files.intersection(names)):
+            try:
+                with open(os.path.join(dir_path, name), encoding="utf-8") as f:
+                    patterns += parse_ignore_lines(f)
+            except (OSError, UnicodeDecodeError):
+                continue
+        if not patterns:
+            return self
+        scopes = self.scopes + ((len(self.prefix), IgnoreRules(patterns)),)
+        return IgnoreScope(self.pruner, self.prefix, scopes)
+
+    def child(self, name: str) -> "IgnoreScope":
+        return IgnoreScope(self.pruner, f"{self.prefix}{name}/", self.scopes)
+
+    def excluded(self, entry, is_dir: bool) -> bool:
+        if is_dir and self.pruner.prunes_dir(entry):
+            return True
+        rel_path = self.prefix + entry.name
+        # El archivo más profundo manda, como en git
+        for start, rules in reversed(self.scopes):
+            ignored = rules.match(rel_path[start:], is_dir)
+            if ignored is not None:
+                return ignored
+        return False
@@ -0,0 +1,382 @@
+import hashlib
+import os
+import re
+import sqlite3
+import stat
+import threading
+from pathlib import Path
+from typing import Collection, Iterator, Optional, Self, Sequence
+
+from .ignore import IgnoreScope, Pruner
+from .stats import OperationStats
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS entries (
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    suffix TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    is_file INTEGER NOT NULL,
+    is_link INTEGER NOT NULL,
+    mode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    ctime REAL NOT NULL,
+    PRIMARY KEY (parent, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_suffix ON entries (suffix);
+"""
+
+COLUMNS = "parent, name, suffix, is_dir, is_file, is_link, mode, size, mtime, ctime"
+# Lo que necesita IndexEntry: size/mtime guardados no se usan en el walk
+ENTRY_COLUMNS = "parent, name, suffix, is_dir, is_file, is_link"
+
+
+def default_index_path(search_dir: str | Path) -> Path:
+    """Index file for search_dir inside the user cache dir ($XDG_CACHE_HOME or ~/.cache)."""
+    cache_dir = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    key = hashlib.sha1(os.fsencode(os.path.abspath(search_dir))).hexdigest()[:16]
+    return cache_dir / "file_manager" / f"{key}.sqlite"
+
+
+class IndexEntry:
+    """
+    Row of the index. Has the same interface as os.DirEntry (path, name, is_dir,
+    is_file, is_symlink, stat) so it can be used wherever the walker's entries are.
+
+    Type and name come from the index. Size and times don't: the content of a file
+    can change without touching its folder's mtime, so the stored ones may be
+    stale. stat() reads them from the filesystem on the first call and caches
+    them, like os.DirEntry.
+    """
+
+    __slots__ = ("path", "name", "_is_dir", "_is_file", "_is_link", "_stat", "_lstat")
+
+    def __init__(
+        self, parent: str, name: str, is_dir: bool, is_file: bool, is_link: bool
+    ):
+        self.path = os.path.join(parent, name)
+        self.name = name
+        self._is_dir = bool(is_dir)
+        self._is_file = bool(is_file)
+        self._is_link = bool(is_link)
+        self._stat: Optional[os.stat_result] = None
+        self._lstat: Optional[os.stat_result] = None
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        return self._is_dir and (follow_symlinks or not self._is_link)
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        return self._is_file and (follow_symlinks or not self._is_link)
+
+    def is_symlink(self) -> bool:
+        return self._is_link
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        if not follow_symlinks and self._is_link:
+            if self._lstat is None:
+                self._lstat = os.stat(self.path, follow_symlinks=False)
+            return self._lstat
+        if self._stat is None:
+            self._stat = os.stat(self.path)
+        return self._stat
+
+    def __fspath__(self) -> str:
+        return self.path
+
+    def __repr__(self) -> str:
+        return f"<IndexEntry {self.name!r}>"
+
+
+class DirectoryIndex:
+    def __init__(self, index_path: str | Path):
+        """
+        Persistent SQLite index of a directory tree (path, size, mtime and type of
+        every entry).
+
+        A directory is only listed again when its own mtime changed since the last
+        walk, i.e. when entries were added, removed or renamed inside it. Changes to
+        the content of a file don't touch its directory's mtime, so size/mtime of
+        files are only refreshed when their directory is listed again (or with
+        full=True).
+
+        Args:
+            index_path (str | Path): SQLite file. Created if it doesn't exist.
+
+        The connection can be used from any thread (e.g. the executor threads of
+        AsyncFileManager, which may resume a walk on a different thread per batch);
+        access to it is serialized with a lock.
+        """
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.index_path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.conn.create_function("REGEXP", 2, _regexp, deterministic=True)
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -----------------------------------------
+    # --------  Walk
+    # -----------------------------------------
+
+    def walk(
+        self,
+        search_dir: str | Path,
+        max_depth: int = 0,
+        follow_symlinks: bool = False,
+        full: bool = False,
+        stats: Optional[OperationStats] = None,
+        pruner: Optional[Pruner] = None,
+        suffixes: Optional[Collection[str]] = None,
+        exclude_suffixes: Collection[str] = (),
+    ) -> Iterator[IndexEntry]:
+        """
+        Yields the same entries as TreeWalker.walk, but unchanged directories are
+        read from the index instead of being listed. The index is updated as the
+        walk goes and committed when it ends.
+
+        Unlike TreeWalker the walk runs in the calling thread only (there is no
+        workers option) and the entries of each directory come sorted by name.
+
+        Args:
+            full (bool): List every directory again, ignoring the stored mtimes.
+            stats (OperationStats): Counts dirs_visited, dirs_listed (not read from
+                the index), entries_seen and stat_calls.
+            pruner (Pruner): Ignore rules, same as TreeWalker. Ignored directories
+                are neither listed nor read from the index.
+            suffixes / exclude_suffixes (Collection[str]): Extensions filtered in
+                the SQL query of the directories read from the index, e.g. from the
+                extension filters of a FileManager. Only a pre-filter: folders are
+                always read, and listed directories return every entry, so the
+                caller still checks its own conditions.
+        """
+        where, params = _entry_filter(suffixes, exclude_suffixes, pruner)
+        root = os.path.abspath(search_dir)
+        visited: set[str] = set()
+        scope = pruner.root() if pruner is not None else None
+        stack: list[tuple[str, int, Optional[IgnoreScope]]] = [(root, 0, scope)]
+        try:
+            while stack:
+                dir_path, depth, scope = stack.pop()
+                if follow_symlinks:
+                    real = os.path.realpath(dir_path)
+                    if real in visited:
+                        continue
+                    visited.add(real)
+
+                subdirs = []
+                children = self._children(dir_path, full, stats, where, params)
+                if stats is not None:
+                    stats.count("dirs_visited")
+                    stats.count("entries_seen", len(children))
+                if scope is not None:
+                    scope = scope.load(dir_path, (entry.name for entry in children))
+                for entry in children:
+                    is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+                    if scope is not None and scope.excluded(entry, is_dir):
+                        continue
+                    if is_dir:
+                        if depth < max_depth:
+                            subdirs.append(entry)
+                        else:
+                            yield entry
+                    elif entry.is_file(follow_symlinks=follow_symlinks) or (
+                        not follow_symlinks and entry.is_symlink()
+                    ):
+                        yield entry
+                for entry in reversed(subdirs):
+                    child = None if scope is None else scope.child(entry.name)
+                    stack.append((entry.path, depth + 1, child))
+        finally:
+            with self._lock:
+                self.conn.commit()
+
+    def _children(
+        self,
+        dir_path: str,
+        full: bool,
+        stats: Optional[OperationStats] = None,
+        where: str = "",
+        params: Sequence = (),
+    ) -> list[IndexEntry]:
+        mtime_ns = os.stat(dir_path).st_mtime_ns
+        if stats is not None:
+            stats.count("stat_calls")
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT mtime_ns FROM dirs WHERE path = ?", (dir_path,)
+            ).fetchone()
+            if not full and row is not None and row[0] == mtime_ns:
+                rows = self.conn.execute(
+                    f"SELECT {ENTRY_COLUMNS} FROM entries WHERE parent = ?{where}"
+                    " ORDER BY name",
+                    (dir_path, *params),
+                ).fetchall()
+                return [_entry_from_row(r) for r in rows]
+        if stats is not None:
+            stats.count("dirs_listed")
+        return self._rescan(dir_path, mtime_ns)
+
+    def _rescan(self, dir_path: str, mtime_ns: int) -> list[IndexEntry]:
+        rows = []
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                rows.append(_row_from_dir_entry(dir_path, entry))
+        # Mismo orden que al leer del índice (ORDER BY name)
+        rows.sort(key=lambda r: r[1])
+        with self._lock:
+            self._store(dir_path, mtime_ns, rows)
+        return [_entry_from_row(r) for r in rows]
+
+    def _store(self, dir_path: str, mtime_ns: int, rows: list[tuple]):
+        old_dirs = {
+            name
+            for (name,) in self.conn.execute(
+                "SELECT name FROM entries WHERE parent = ? AND is_dir = 1", (dir_path,)
+            )
+        }
+        new_dirs = {r[1] for r in rows if r[3]}
+        for name in old_dirs - new_dirs:
+            self._purge(os.path.join(dir_path, name))
+
+        self.conn.execute("DELETE FROM entries WHERE parent = ?", (dir_path,))
+        self.conn.executemany(
+            f"INSERT INTO entries ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, mtime_ns) VALUES (?, ?)",
+            (dir_path, mtime_ns),
+        )
+
+    def _purge(self, dir_path: str):
+        """Removes a deleted directory and everything below it from the index."""
+        prefix = dir_path + os.sep
+        for table, column in (("entries", "parent"), ("dirs", "path")):
+            self.conn.execute(
+                f"DELETE FROM {table} WHERE {column} = ? OR substr({column}, 1, ?) = ?",
+                (dir_path, len(prefix), prefix),
+            )
+
+    # -----------------------------------------
+    # --------  Queries
+    # -----------------------------------------
+
+    def query(
+        self,
+        search_dir: str | Path,
+        suffixes: Sequence[str] = (),
+        regex: Optional[str] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ) -> list[Path]:
+        """
+        Runs a query against the index without walking the tree. Returns the
+        files under search_dir, at any indexed depth, that match every given filter.
+        Files added or removed since the last walk are not seen.
+
+        Args:
+            suffixes (Sequence[str]): Accepted extensions, e.g. [".xlsx", ".csv"].
+            regex (str): Pattern searched (re.search) in the file stem.
+            min_size / max_size (int): Size bounds in bytes. The stored sizes may
+                be stale (see IndexEntry), so they are checked with a stat of
+                each file that matched the other filters.
+        """
+        root = os.path.abspath(search_dir)
+        prefix = root + os.sep
+        sql = [
+            "SELECT parent, name FROM entries WHERE is_file = 1",
+            "AND (parent = ? OR substr(parent, 1, ?) = ?)",
+        ]
+        params: list = [root, len(prefix), prefix]
+        if suffixes:
+            sql.append(f"AND suffix IN ({', '.join('?' * len(suffixes))})")
+            params.extend(suffixes)
+        if regex is not None:
+            sql.append("AND REGEXP(?, name)")
+            params.append(regex)
+        with self._lock:
+            rows = self.conn.execute(" ".join(sql), params).fetchall()
+        paths = [Path(parent, name) for parent, name in rows]
+        if min_size is None and max_size is None:
+            return paths
+        result = []
+        for path in paths:
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                continue
+            if (min_size is None or size >= min_size) and (
+                max_size is None or size <= max_size
+            ):
+                result.append(path)
+        return result
+
+
+def _entry_filter(
+    suffixes: Optional[Collection[str]],
+    exclude_suffixes: Collection[str],
+    pruner: Optional[Pruner],
+) -> tuple[str, list]:
+    """SQL condition (and its parameters) for the entries read in a walk."""
+    if suffixes is None and not exclude_suffixes:
+        return "", []
+    sql = []
+    params: list = []
+    if suffixes is not None:
+        sql.append(f"suffix IN ({', '.join('?' * len(suffixes))})")
+        params.extend(suffixes)
+    if exclude_suffixes:
+        sql.append(f"suffix NOT IN ({', '.join('?' * len(exclude_suffixes))})")
+        params.extend(exclude_suffixes)
+    # Las carpetas se recorren igual, y los archivos de ignore se tienen que leer
+    keep = ["is_dir = 1"]
+    if pruner is not None and pruner.ignore_files:
+        keep.append(f"name IN ({', '.join('?' * len(pruner.ignore_files))})")
+        params = list(pruner.ignore_files) + params
+    return f" AND ({' OR '.join(keep)} OR ({' AND '.join(sql)}))", params
+
+
+def _regexp(pattern: str, name: str) -> bool:
+    return re.search(pattern, Path(name).stem) is not None
+
+
+def _row_from_dir_entry(parent: str, entry: os.DirEntry) -> tuple:
+    is_link = entry.is_symlink()
+    try:
+        st = entry.stat()
+    except OSError:
+        # Symlink roto
+        st = entry.stat(follow_symlinks=False)
+    is_dir = stat.S_ISDIR(st.st_mode)
+    is_file = stat.S_ISREG(st.st_mode)
+    return (
+        parent,
+        entry.name,
+        Path(entry.name).suffix,
+        is_dir,
+        is_file,
+        is_link,
+        st.st_mode,
+        st.st_size,
+        st.st_mtime,
+        st.st_ctime,
+    )
+
+
+def _entry_from_row(row: tuple) -> IndexEntry:
+    parent, name, _suffix, is_dir, is_file, is_link = row[:6]
+    return IndexEntry(parent, name, is_dir, is_file, is_link)
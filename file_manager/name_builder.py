@@ -1,6 +1,17 @@
-import shutil
+import re
+import unicodedata
+from functools import lru_cache
+from operator import methodcaller
 from pathlib import Path
-from typing import Callable, Protocol, Self, runtime_checkable
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Optional,
+    Protocol,
+    Self,
+    runtime_checkable,
+)
 
 
 @runtime_checkable
@@ -58,22 +69,74 @@ class StringMethodsProtocol(Protocol):
     def zfill(self, width: int) -> Self: ...
 
 
-class ESNameBuilder(StringMethodsProtocol):
-    def __init__(self):
-        #  self.path = path
+# Métodos de str sin argumentos que aplicados dos veces seguidas dan lo mismo
+IDEMPOTENT = frozenset(
+    {"lower", "upper", "casefold", "strip", "lstrip", "rstrip", "title", "capitalize"}
+)
+
+
+# Marcas que agregan los exploradores y las descargas repetidas: "informe (10)",
+# "informe - copia (2)", "informe - Copy", "informe copy 2", "Copia de informe",
+# "Copy (2) of informe". "Copia de seguridad" es un nombre, no una marca
+COPY_MARKERS = re.compile(
+    r"^(?:cop(?:ia|y)(?:\s*\(\d+\))?\s+(?:de|of)\s+(?!seguridad\b))+"
+    r"|(?:\s*\(\d+\)|(?:\s*[-_]\s*|\s+)(?:copia|copy)(?:\s*\(?\d+\)?)?)+$",
+    re.IGNORECASE,
+)
+
+
+def remove_copy_markers(name: str) -> str:
+    """'Copia de informe - copia (2)' -> 'informe'. Keeps case and accents."""
+    clean = COPY_MARKERS.sub("", name).strip()
+    # Un nombre que es solo la marca ("Copy", "(1)") se deja como está
+    return clean or name
+
+
+def strip_accents(name: str) -> str:
+    """'Sesión Año' -> 'Sesion Ano'."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+# El Protocol solo sirve para el autocompletado: si fuera la clase base en runtime,
+# sus métodos vacíos (que devuelven None) taparían a __getattr__
+if TYPE_CHECKING:
+    _StringMethods = StringMethodsProtocol
+else:
+    _StringMethods = object
+
+
+class ESNameBuilder(_StringMethods):
+    def __init__(self, path: Optional[Path] = None, cache_size: int = 65536):
+        """
+        Pipeline de transformaciones de nombres. Se compila la primera vez que se
+        aplica (apply / apply_many) y se vuelve a compilar si se le agregan pasos.
+
+        Args:
+            path (Path): Ruta usada por build() y rename() si no se les pasa otra.
+            cache_size (int): Máximo de nombres recordados por el caché LRU.
+        """
+        self.path = path
+        self.cache_size = cache_size
         self._pipeline: list[Callable] = []
-        self._excepciones = (
-            "de",
-            "del",
-            "la",
-            "el",
-            "en",
-            "y",
-            "con",
-            "a",
-            "los",
-            "las",
-            "e",
+        # Descripción de cada paso para compilarlo sin wrapper: ("str", método, args,
+        # kwargs), ("replace", old, new) o None si es una función propia
+        self._specs: list[Optional[tuple]] = []
+        self._compiled: Optional[Callable[[str], str]] = None
+        self._excepciones = frozenset(
+            (
+                "de",
+                "del",
+                "la",
+                "el",
+                "en",
+                "y",
+                "con",
+                "a",
+                "los",
+                "las",
+                "e",
+            )
         )
 
     def __getattr__(self, name: str):
@@ -94,8 +157,7 @@ class ESNameBuilder(StringMethodsProtocol):
                     def _f(s: str) -> str:
                         return str_method(s, *args, **kwargs)
 
-                    self._pipeline.append(_f)
-                    return self
+                    return self._add(_f, ("str", name, args, kwargs))
 
                 return wrapper
 
@@ -104,6 +166,12 @@ class ESNameBuilder(StringMethodsProtocol):
             f"'{type(self).__name__}' object has no attribute '{name}'"
         )
 
+    def _add(self, step: Callable[[str], str], spec: Optional[tuple] = None) -> Self:
+        self._pipeline.append(step)
+        self._specs.append(spec)
+        self._compiled = None
+        return self
+
     # ==== Métodos de construcción del pipeline ====
     def filter(self, keyword: str, filter_out: bool = False) -> Self:
         def _f(name: str) -> str:
@@ -112,8 +180,7 @@ class ESNameBuilder(StringMethodsProtocol):
             else:
                 return name if keyword in name else ""
 
-        self._pipeline.append(_f)
-        return self
+        return self._add(_f)
 
     def keep_after(self, char: str = "-") -> Self:
         def _f(name: str) -> str:
@@ -122,19 +189,23 @@ class ESNameBuilder(StringMethodsProtocol):
                 return parts[0].split(".")[-1].strip()
             return " ".join(parts[1:]).strip()
 
-        self._pipeline.append(_f)
-        return self
+        return self._add(_f)
 
     def replace(self, old: str, new: str) -> Self:
         def _f(name: str) -> str:
             return name.replace(old, new)
 
-        self._pipeline.append(_f)
-        return self
+        return self._add(_f, ("replace", old, new))
 
     def normalize_spaces_lower(self) -> Self:
-        self._pipeline.append(lambda s: " ".join(s.split()).lower())
-        return self
+        return self._add(lambda s: " ".join(s.split()).lower())
+
+    def remove_copy_markers(self) -> Self:
+        """Quita "(1)", "- copia", "Copy of"... (ver COPY_MARKERS)"""
+        return self._add(remove_copy_markers)
+
+    def strip_accents(self) -> Self:
+        return self._add(strip_accents)
 
     def add_dash_after_keywords(
         self, keywords=("encuentro prospectivo", "nota de actualidad")
@@ -145,72 +216,143 @@ class ESNameBuilder(StringMethodsProtocol):
                     name = name.replace(k, f"{k} -")
             return name
 
-        self._pipeline.append(_f)
-        return self
+        return self._add(_f)
 
     # Si toda la palabra está en mayúsculas dejarla así
     def smart_title(self, excepciones=None) -> Self:
         if excepciones:
-            self._excepciones = excepciones
+            self._excepciones = frozenset(excepciones)
+        excepciones = self._excepciones
 
         def _f(name: str) -> str:
             palabras = name.split()
-            resultado = []
-            for i, palabra in enumerate(palabras):
-                if palabra.lower() in self._excepciones and i != 0:
-                    resultado.append(palabra.lower())
+            if not palabras:
+                return ""
+            resultado = [palabras[0].capitalize()]
+            for palabra in palabras[1:]:
+                minuscula = palabra.lower()
+                if minuscula in excepciones:
+                    resultado.append(minuscula)
                 else:
                     resultado.append(palabra.capitalize())
             return " ".join(resultado)
 
-        self._pipeline.append(_f)
-        return self
+        return self._add(_f)
+
+    # ==== Compilación ====
+    def compile(self) -> Callable[[str], str]:
+        """
+        Devuelve el pipeline como una sola función (con caché LRU si cache_size > 0).
+        Los pasos que son métodos de str (incluido replace) se llaman directamente,
+        sin pasar por los wrappers de __getattr__. Un método idempotente repetido
+        (.lower().lower()) se aplica una vez. Los pasos no se fusionan: cada uno
+        sigue siendo una llamada, y sin caché el costo es casi el de apply_steps.
+        La ganancia viene de no recalcular los nombres repetidos.
+        """
+        if self._compiled is None:
+            apply = _compile_pipeline(self._pipeline, self._specs)
+            if self.cache_size > 0:
+                apply = lru_cache(maxsize=self.cache_size)(apply)
+            self._compiled = apply
+        return self._compiled
 
     # ==== Aplicación ====
-    def build(self) -> str:
-        # nombre inicial (stem si archivo, name si carpeta)
-        name = self.path.name if self.path.is_dir() else self.path.stem
+    def apply_steps(self, name: str) -> str:
+        """Aplica el pipeline paso por paso, sin compilar ni caché"""
         for f in self._pipeline:
             name = f(name)
         return name
 
-    def rename(self) -> Path:
-        new_name = self.build()
+    def apply(self, name: str) -> str:
+        """Aplica el pipeline a un nombre (sin tocar el disco)"""
+        return self.compile()(name)
+
+    def apply_many(self, names: Iterable[str]) -> list[str]:
+        """Aplica el pipeline a muchos nombres; los repetidos se calculan una vez"""
+        apply = self.compile()
+        return [apply(name) for name in names]
+
+    def build_many(self, paths: Iterable[Path]) -> list[str]:
+        """build() para muchas rutas: stem si es archivo, name si es carpeta"""
+        paths = list(paths)
+        return self.apply_many(p.name if p.is_dir() else p.stem for p in paths)
+
+    def _path(self, path: Optional[Path]) -> Path:
+        path = path if path is not None else self.path
+        if path is None:
+            raise ValueError("A path is needed: ESNameBuilder(path) or build(path)")
+        return path
+
+    def build(self, path: Optional[Path] = None) -> str:
+        path = self._path(path)
+        # nombre inicial (stem si archivo, name si carpeta)
+        name = path.name if path.is_dir() else path.stem
+        return self.apply(name)
+
+    def rename(self, path: Optional[Path] = None) -> Path:
+        path = self._path(path)
+        new_name = self.build(path)
         if not new_name:
-            return self.path
+            return path
         else:
-            if self.path.is_dir():
-                new_path = self.path.with_name(new_name)
+            if path.is_dir():
+                new_path = path.with_name(new_name)
             else:
-                new_path = self.path.with_stem(new_name)
+                new_path = path.with_stem(new_name)
 
-            self.path.rename(new_path)
+            path.rename(new_path)
         return new_path
 
 
-def flatten_to_base(base_dir: Path, pattern: str = "*") -> None:
+def _compile_pipeline(
+    pipeline: list[Callable], specs: list[Optional[tuple]]
+) -> Callable[[str], str]:
+    """
+    Junta los pasos en una tupla de funciones que se aplican en un solo bucle.
+    Los métodos de str (incluido replace) se llaman con operator.methodcaller, sin
+    pasar por los wrappers de __getattr__, y un método idempotente repetido sin
+    argumentos se aplica una vez.
+    """
+    steps: list[Callable[[str], str]] = []
+    last_method: Optional[str] = None
+    for step, spec in zip(pipeline, specs):
+        if spec is None:
+            steps.append(step)
+            last_method = None
+            continue
+
+        if spec[0] == "replace":
+            name, args, kwargs = "replace", spec[1:], {}
+        else:
+            _, name, args, kwargs = spec
+        if not args and not kwargs and name == last_method and name in IDEMPOTENT:
+            continue
+        steps.append(methodcaller(name, *args, **kwargs))
+        last_method = name
+
+    if len(steps) == 1:
+        return steps[0]
+    funcs = tuple(steps)
+
+    def compiled(name: str) -> str:
+        for f in funcs:
+            name = f(name)
+        return name
+
+    return compiled
+
+
+def flatten_to_base(base_dir: Path, pattern: str = "*", mode: str = "copy"):
     """
     Copia un nivel arriba (al directorio base) todos los archivos contenidos en subdirectorios.
     - Mantiene solo archivos (no copia carpetas).
     - Si hay colisión de nombre, antepone el nombre de la carpeta origen.
+
+    Se mantiene por compatibilidad: usa FileManager.flatten.
     """
-    if not base_dir.is_dir():
-        raise NotADirectoryError(f"{base_dir} no es un directorio")
-
-    for file_path in base_dir.rglob(pattern):
-        if file_path.is_file() and file_path.parent != base_dir:
-            target = base_dir / file_path.name
-            if target.exists():
-                # Resolver colisión con el nombre de la carpeta origen y un contador si hiciera falta
-                parent_name = file_path.parent.name
-                candidate = base_dir / f"{parent_name} - {file_path.name}"
-                i = 1
-                while candidate.exists():
-                    candidate = base_dir / f"{parent_name} - {i} - {file_path.name}"
-                    i += 1
-                target = candidate
-            # copiar en lugar de mover
-            shutil.copy2(str(file_path), str(target))
+    from .file_manager import FileManager
+
+    return FileManager().flatten(base_dir, pattern=pattern, mode=mode)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,238 @@
+import os
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Self, overload
+
+from .filters import compile_filters
+
+# Nombres distintos que se comparten como máximo (los más repetidos aparecen
+# primero: __init__.py, index.js...)
+INTERN_LIMIT = 1 << 16
+
+
+class _StoredStat:
+    """
+    stat() of a _Row from the sizes and mtimes columns. Other fields (st_ctime,
+    st_mode...) are read from disk on first use.
+    """
+
+    __slots__ = ("st_size", "st_mtime", "_path")
+
+    def __init__(self, path: str, size: int, mtime: float):
+        self.st_size = size
+        self.st_mtime = mtime
+        self._path = path
+
+    def __getattr__(self, name: str):
+        if not name.startswith("st_"):
+            raise AttributeError(name)
+        return getattr(os.stat(self._path), name)
+
+
+class _Row:
+    """Walk entry view of one path of a PathList, for compile_filters()."""
+
+    __slots__ = ("path", "name", "_stat")
+
+    def __init__(self, path: str, name: str, stat: Optional[_StoredStat] = None):
+        self.path = path
+        self.name = name
+        self._stat = stat
+
+    def stat(self) -> os.stat_result | _StoredStat:
+        st = self._stat
+        if st is None:
+            return os.stat(self.path)
+        if st.st_size < 0:
+            # Como la entrada del recorrido: no se pudo leer (ver _add_stat)
+            raise OSError(f"no stat data for {self.path!r}")
+        return st
+
+    def is_file(self) -> bool:
+        return os.path.isfile(self.path)
+
+    def is_dir(self) -> bool:
+        return os.path.isdir(self.path)
+
+    def is_symlink(self) -> bool:
+        return os.path.islink(self.path)
+
+    def __fspath__(self) -> str:
+        return self.path
+
+
+class PathList(Sequence):
+    def __init__(self, with_stat: bool = False):
+        """
+        Compact list of paths, for collections of millions of entries where a
+        list[Path] takes several GB (see benchmarks/bench_memory.py).
+
+        Columnar storage: every folder is stored once, and each path is the index
+        of its folder plus the offset and length of its name in one UTF-8 buffer.
+        Repeated names (index.js, __init__.py...) point to the same bytes. Path
+        objects are created on access; strings() gives the str paths without
+        creating them.
+
+        Args:
+            with_stat (bool): Also keep size and mtime of each path in arrays
+                (from the walk entry, usually already cached). -1 and NaN when
+                they can't be read.
+        """
+        self._dirs: list[str] = []
+        self._dir_index: dict[str, int] = {}
+        self._parents = array("I")
+        self._starts = array("Q")
+        self._lengths = array("H")
+        self._buffer = bytearray()
+        # Nombres ya guardados -> offset. Solo mientras se agregan rutas
+        self._interned: dict[str, int] = {}
+        self.sizes: Optional[array] = array("q") if with_stat else None
+        self.mtimes: Optional[array] = array("d") if with_stat else None
+
+    @classmethod
+    def from_entries(cls, entries: Iterable, with_stat: bool = False) -> Self:
+        """From walk entries (os.DirEntry, IndexEntry...), e.g. FileManager's."""
+        paths = cls(with_stat)
+        for entry in entries:
+            path, name = entry.path, entry.name
+            paths._add(path[: len(path) - len(name)], name)
+            if with_stat:
+                paths._add_stat(entry)
+        paths._interned = {}
+        return paths
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str | os.PathLike]) -> Self:
+        result = cls()
+        for path in paths:
+            folder, name = os.path.split(os.fspath(path))
+            if folder and not folder.endswith(os.sep):
+                folder += os.sep
+            result._add(folder, name)
+        result._interned = {}
+        return result
+
+    def _add(self, folder: str, name: str):
+        # folder termina en el separador: la ruta es folder + name
+        index = self._dir_index.get(folder)
+        if index is None:
+            index = self._dir_index[folder] = len(self._dirs)
+            self._dirs.append(folder)
+        self._parents.append(index)
+
+        encoded = name.encode("utf-8", "surrogateescape")
+        start = self._interned.get(name)
+        if start is None:
+            start = len(self._buffer)
+            self._buffer += encoded
+            # Los nombres comunes aparecen enseguida; la tabla no crece sin límite
+            if len(self._interned) < INTERN_LIMIT:
+                self._interned[name] = start
+        self._starts.append(start)
+        self._lengths.append(len(encoded))
+
+    def _add_stat(self, entry):
+        try:
+            st = entry.stat()
+            self.sizes.append(st.st_size)
+            self.mtimes.append(st.st_mtime)
+        except OSError:
+            self.sizes.append(-1)
+            self.mtimes.append(float("nan"))
+
+    def _select(self, index: slice | list[int]) -> Self:
+        """New PathList with the given rows. Folders and names are shared."""
+        result = type(self)()
+        result._dirs, result._dir_index = self._dirs, self._dir_index
+        result._buffer = self._buffer
+        columns = ["_parents", "_starts", "_lengths"]
+        if self.sizes is not None:
+            columns += ["sizes", "mtimes"]
+        for column in columns:
+            values: array = getattr(self, column)
+            if isinstance(index, slice):
+                setattr(result, column, values[index])
+            else:
+                setattr(
+                    result,
+                    column,
+                    array(values.typecode, map(values.__getitem__, index)),
+                )
+        return result
+
+    def _name(self, index: int) -> str:
+        start = self._starts[index]
+        raw = self._buffer[start : start + self._lengths[index]]
+        return raw.decode("utf-8", "surrogateescape")
+
+    # -----------------------------------------
+    # --------  Sequence
+    # -----------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def str_at(self, index: int) -> str:
+        return self._dirs[self._parents[index]] + self._name(index)
+
+    @overload
+    def __getitem__(self, index: int) -> Path: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Self: ...
+
+    def __getitem__(self, index: int | slice) -> Path | Self:
+        if isinstance(index, slice):
+            return self._select(index)
+        return Path(self.str_at(index))
+
+    def _rows(self) -> Iterator[tuple[str, str]]:
+        """(folder, name) of every path."""
+        dirs, buffer = self._dirs, memoryview(self._buffer)
+        for parent, start, length in zip(self._parents, self._starts, self._lengths):
+            name = str(buffer[start : start + length], "utf-8", "surrogateescape")
+            yield dirs[parent], name
+
+    def strings(self) -> Iterator[str]:
+        for folder, name in self._rows():
+            yield folder + name
+
+    def __iter__(self) -> Iterator[Path]:
+        return map(Path, self.strings())
+
+    def __contains__(self, path: object) -> bool:
+        if not isinstance(path, (str, os.PathLike)):
+            return False
+        target = os.fspath(path)
+        return any(s == target for s in self.strings())
+
+    def __repr__(self) -> str:
+        return f"PathList({len(self)} paths)"
+
+    # -----------------------------------------
+    # --------  Filtering
+    # -----------------------------------------
+
+    def filter(self, *conditions: Callable) -> Self:
+        """
+        Paths that pass every condition, with the same conditions as
+        FileManager.conditions (its filters or callables that take a Path).
+        With with_stat, size and mtime come from the stored columns, without
+        touching the disk.
+        """
+        predicate = compile_filters(conditions)
+        if self.sizes is None:
+            keep = [
+                i
+                for i, (folder, name) in enumerate(self._rows())
+                if predicate(_Row(folder + name, name))
+            ]
+        else:
+            keep = []
+            rows = zip(self._rows(), self.sizes, self.mtimes)
+            for i, ((folder, name), size, mtime) in enumerate(rows):
+                path = folder + name
+                if predicate(_Row(path, name, _StoredStat(path, size, mtime))):
+                    keep.append(i)
+        return self._select(keep)
@@ -0,0 +1,285 @@
+import errno
+import json
+import os
+import tempfile
+import uuid
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Self
+
+from .name_builder import ESNameBuilder
+
+# Forma de calcular el nombre nuevo: pipeline, {nombre viejo: nombre nuevo} o función
+Renamer = ESNameBuilder | dict[str, str] | Callable[[str], str]
+
+
+def _key(path: Path) -> str:
+    # En Windows "Informe.xlsx" e "informe.xlsx" son el mismo archivo
+    return os.path.normcase(str(path))
+
+
+class RenamePlan:
+    def __init__(self, mapping: dict[Path, Path], collisions: dict[Path, list[Path]]):
+        """
+        Old -> new paths of a batch rename, computed in memory.
+
+        Attributes:
+            mapping (dict): {old path: new path}, only for names that change.
+            collisions (dict): {target: sources} for targets wanted by several
+                sources or already taken by a file that is not being renamed.
+            cycles (list): Groups of renames that swap names (a -> b, b -> a).
+                They are executed through a temporary name.
+            steps (list): Renames in execution order, temporary names included.
+        """
+        self.mapping = mapping
+        self.collisions = collisions
+        self.cycles: list[list[Path]] = []
+        self.steps: list[tuple[Path, Path]] = [] if collisions else self._order_steps()
+
+    def diff(self) -> str:
+        """Dry run: one 'old -> new' line per rename, collisions marked with '!'."""
+        lines = []
+        for src, dst in self.mapping.items():
+            mark = "!" if dst in self.collisions else " "
+            lines.append(f"{mark} {src} -> {dst.name}")
+        return "\n".join(lines)
+
+    def execute(self, journal_path: Optional[str | Path] = None) -> list[Path]:
+        """
+        Renames on disk, writing every step to a journal first. If the run is
+        interrupted the journal is kept and can be passed to resume_renames() or
+        rollback_renames(); the exception carries its path in a journal_path
+        attribute and a note. It is removed when every rename is done.
+
+        A target that appeared after the plan was made stops the batch with
+        FileExistsError instead of being overwritten.
+
+        Args:
+            journal_path (str | Path): Journal file. A temp file by default.
+
+        Returns:
+            list: New paths, in the order of mapping.
+        """
+        if self.collisions:
+            raise FileExistsError(
+                f"{len(self.collisions)} target names are already taken: "
+                f"{[str(p) for p in self.collisions]}"
+            )
+        journal = RenameJournal.create(self.steps, journal_path)
+        try:
+            journal.run()
+        except BaseException as e:
+            e.journal_path = journal.path
+            e.add_note(
+                f"Rename journal kept in {journal.path}: pass it to "
+                "resume_renames() or rollback_renames()"
+            )
+            raise
+        return list(self.mapping.values())
+
+    def _order_steps(self) -> list[tuple[Path, Path]]:
+        """
+        A rename can run once its target is free, i.e. once the file that has that
+        name was moved away. Chains (a -> b, b -> c) are ordered from the end.
+        What is left are cycles, broken by moving one file to a temporary name.
+        """
+        sources = {_key(src): src for src in self.mapping}
+        # waiting[k]: source that wants the name k (k is also a source)
+        waiting: dict[str, str] = {}
+        ready: deque[str] = deque()
+        for src, dst in self.mapping.items():
+            src_key, dst_key = _key(src), _key(dst)
+            if dst_key in sources and dst_key != src_key:
+                waiting[dst_key] = src_key
+            else:
+                ready.append(src_key)
+
+        steps: list[tuple[Path, Path]] = []
+        pending = set(sources)
+
+        def drain():
+            while ready:
+                src_key = ready.popleft()
+                src = sources[src_key]
+                steps.append((src, self.mapping[src]))
+                pending.discard(src_key)
+                if src_key in waiting:
+                    ready.append(waiting.pop(src_key))
+
+        drain()
+        while pending:
+            start_key = next(iter(pending))
+            cycle = []
+            key = start_key
+            while True:
+                cycle.append(sources[key])
+                key = _key(self.mapping[sources[key]])
+                if key == start_key:
+                    break
+            self.cycles.append(cycle)
+
+            start = sources[start_key]
+            temp = start.with_name(f".{start.name}.{uuid.uuid4().hex[:8]}.tmp")
+            steps.append((start, temp))
+            pending.discard(start_key)
+            # start llega a su destino desde temp, al final del ciclo
+            del waiting[_key(self.mapping[start])]
+            ready.append(waiting.pop(start_key))
+            drain()
+            steps.append((temp, self.mapping[start]))
+        return steps
+
+
+def plan_renames(paths: Iterable[str | Path], renamer: Renamer) -> RenamePlan:
+    """
+    Builds the rename plan of paths. Each parent folder is listed once, and
+    collisions are checked against those listings in memory (no exists() per file).
+
+    With an ESNameBuilder the pipeline is applied to the stem of files (the
+    extension is kept) and to the whole name of folders, like ESNameBuilder.rename.
+    A dict or a function receives and returns the whole name. Paths whose new name
+    is empty or unchanged are left out.
+    """
+    paths = [Path(p) for p in paths]
+    listings: dict[Path, dict[str, bool]] = {}
+    for parent in {p.parent for p in paths}:
+        with os.scandir(parent) as it:
+            listings[parent] = {os.path.normcase(e.name): e.is_dir() for e in it}
+
+    mapping: dict[Path, Path] = {}
+    for path in paths:
+        is_dir = listings[path.parent].get(os.path.normcase(path.name))
+        if is_dir is None:
+            raise FileNotFoundError(f"'{path}' does not exist")
+        new_name = _new_name(path.name, is_dir, renamer)
+        if new_name and new_name != path.name:
+            mapping[path] = path.with_name(new_name)
+
+    sources = {_key(src) for src in mapping}
+    claimants: dict[str, list[Path]] = defaultdict(list)
+    for src, dst in mapping.items():
+        claimants[_key(dst)].append(src)
+
+    collisions: dict[Path, list[Path]] = {}
+    for src, dst in mapping.items():
+        dst_key = _key(dst)
+        taken = os.path.normcase(dst.name) in listings[dst.parent] and (
+            dst_key not in sources
+        )
+        if taken or len(claimants[dst_key]) > 1:
+            collisions[dst] = claimants[dst_key]
+    return RenamePlan(mapping, collisions)
+
+
+def _new_name(name: str, is_dir: bool, renamer: Renamer) -> Optional[str]:
+    if isinstance(renamer, ESNameBuilder):
+        if is_dir:
+            return renamer.apply(name)
+        path = Path(name)
+        stem = renamer.apply(path.stem)
+        return stem + path.suffix if stem else None
+    if isinstance(renamer, dict):
+        return renamer.get(name)
+    return renamer(name)
+
+
+class RenameJournal:
+    def __init__(self, path: Path, steps: list[tuple[Path, Path]], done: int = 0):
+        """
+        Write-ahead journal of a rename batch (JSON lines): the first line has every
+        step, then one line is appended after each step is done.
+        """
+        self.path = path
+        self.steps = steps
+        self.done = done
+
+    @classmethod
+    def create(
+        cls, steps: list[tuple[Path, Path]], path: Optional[str | Path] = None
+    ) -> Self:
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="rename-", suffix=".journal")
+            os.close(fd)
+        path = Path(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"steps": [[str(s), str(d)] for s, d in steps]}, f)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return cls(path, steps)
+
+    @classmethod
+    def load(cls, path: str | Path) -> Self:
+        path = Path(path)
+        with open(path, encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            records = [json.loads(line) for line in f if line.strip()]
+        steps = [(Path(s), Path(d)) for s, d in header["steps"]]
+        done = sum(1 for r in records if "done" in r)
+        undone = len(records) - done
+        journal = cls(path, steps, done - undone)
+
+        # La última operación pudo hacerse sin llegar a anotarse. Antes de un paso el
+        # origen existe y el destino no; después, al revés.
+        rolling_back = bool(records) and "undone" in records[-1]
+        if rolling_back and journal.done > 0:
+            src, dst = steps[journal.done - 1]
+            if os.path.lexists(src) and not os.path.lexists(dst):
+                journal.done -= 1
+        elif not rolling_back and journal.done < len(steps):
+            src, dst = steps[journal.done]
+            if not os.path.lexists(src) and os.path.lexists(dst):
+                journal.done += 1
+        return journal
+
+    def run(self):
+        """Executes the steps that are not done yet. Removes the journal at the end."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            while self.done < len(self.steps):
+                src, dst = self.steps[self.done]
+                _check_free(src, dst)
+                os.rename(src, dst)
+                self._log(f, "done")
+                self.done += 1
+        self.path.unlink()
+
+    def rollback(self):
+        """Undoes the steps that were done, last first. Removes the journal at the end."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            while self.done > 0:
+                src, dst = self.steps[self.done - 1]
+                _check_free(dst, src)
+                os.rename(dst, src)
+                self._log(f, "undone")
+                self.done -= 1
+        self.path.unlink()
+
+    def _log(self, f, action: str):
+        f.write(json.dumps({action: self.done}) + "\n")
+        f.flush()
+
+
+def _check_free(src: Path, dst: Path):
+    """
+    os.rename overwrites an existing file on POSIX: the target is checked again
+    right before, since it may have been created after the plan. The same file
+    under another case (case-insensitive filesystems) is not a conflict.
+    """
+    if not os.path.lexists(dst):
+        return
+    try:
+        if os.path.samestat(os.lstat(src), os.lstat(dst)):
+            return
+    except OSError:
+        pass
+    raise FileExistsError(errno.EEXIST, "Target already exists", str(dst))
+
+
+def resume_renames(journal_path: str | Path):
+    """Finishes an interrupted rename batch."""
+    RenameJournal.load(journal_path).run()
+
+
+def rollback_renames(journal_path: str | Path):
+    """Restores the original names of an interrupted rename batch."""
+    RenameJournal.load(journal_path).rollback()
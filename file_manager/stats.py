@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+
+if TYPE_CHECKING:
+    import logging
+
+# Recibe las estadísticas de cada operación terminada (logging, métricas, tests...)
+StatsHook = Callable[["OperationStats"], None]
+
+
+class OperationStats:
+    def __init__(self, operation: str):
+        """
+        Counters and timings of one FileManager operation (collect, copy, rename...).
+        Only created when instrumentation is enabled (FileManager.set_instrumentation).
+
+        Attributes:
+            operation (str): Name of the operation.
+            counters (Counter): e.g. dirs_visited, entries_seen, stat_calls,
+                bytes_copied, bytes_hashed. Missing counters are 0.
+            rejected (Counter): Entries rejected by each filter, keyed by the
+                filter's repr. An entry is counted for the first filter that rejects it.
+            phases (dict): Wall time in seconds per phase (walk, filter, copy...).
+            elapsed (float): Wall time of the whole operation.
+        """
+        self.operation = operation
+        self.counters: Counter[str] = Counter()
+        self.rejected: Counter[str] = Counter()
+        self.phases: dict[str, float] = {}
+        self.elapsed: float = 0.0
+        self._start = time.perf_counter()
+        # Los contadores se actualizan también desde los threads de los pools
+        self._lock = threading.Lock()
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self._start
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    def reject(self, filter_name: str):
+        with self._lock:
+            self.rejected[filter_name] += 1
+
+    def add_time(self, phase: str, seconds: float):
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def __getitem__(self, name: str) -> int:
+        return self.counters[name]
+
+    def as_dict(self) -> dict:
+        return {
+            "operation": self.operation,
+            "elapsed": self.elapsed,
+            "counters": dict(self.counters),
+            "rejected": dict(self.rejected),
+            "phases": dict(self.phases),
+        }
+
+    def __repr__(self) -> str:
+        counters = ", ".join(f"{k}={v}" for k, v in sorted(self.counters.items()))
+        phases = ", ".join(f"{k}={v:.3f}s" for k, v in self.phases.items())
+        return (
+            f"OperationStats({self.operation}, {self.elapsed:.3f}s, "
+            f"{counters or '-'}; {phases or '-'})"
+        )
+
+
+def logging_hook(logger: "logging.Logger", level: Optional[int] = None) -> StatsHook:
+    """
+    Hook that logs one line per operation (INFO by default). The whole stats are
+    also attached to the record as record.stats (a dict), for handlers that export
+    metrics.
+    """
+    if level is None:
+        import logging
+
+        level = logging.INFO
+
+    def hook(stats: OperationStats):
+        logger.log(level, "%r", stats, extra={"stats": stats.as_dict()})
+
+    return hook
@@ -0,0 +1,412 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from .copier import BulkCopier, CopyResult
+from .deleter import BulkDeleter, DeleteResult
+from .filters import Predicate
+from .stats import OperationStats
+
+if TYPE_CHECKING:
+    from .ignore import Pruner
+
+# Se guarda en la raíz del destino y no se compara ni se borra
+MANIFEST_NAME = ".file_manager-sync.json"
+MANIFEST_VERSION = 1
+
+# Ruta relativa (con "/") -> (size, mtime_ns)
+Listing = dict[str, tuple[int, int]]
+
+
+class _ScanEntry:
+    """Walk entry view for the predicate, from an entry of the scan."""
+
+    __slots__ = ("path", "name", "_entry")
+
+    def __init__(self, entry: os.DirEntry):
+        self.path = entry.path
+        self.name = entry.name
+        self._entry = entry
+
+    def stat(self) -> os.stat_result:
+        return self._entry.stat()
+
+    def is_file(self) -> bool:
+        return self._entry.is_file()
+
+    def is_dir(self) -> bool:
+        return self._entry.is_dir()
+
+    def is_symlink(self) -> bool:
+        return self._entry.is_symlink()
+
+    def __fspath__(self) -> str:
+        return self.path
+
+
+def scan_tree(
+    root: str | Path,
+    predicate: Optional[Predicate] = None,
+    errors: Optional[dict[Path, OSError]] = None,
+    pruner: Optional["Pruner"] = None,
+) -> tuple[Listing, set[str]]:
+    """
+    One scandir pass over root: {relative path: (size, mtime_ns)} of the files
+    (links to files included) and the set of relative folders. Symlinked folders
+    are not followed. Files rejected by predicate are left out, and so are the
+    files and folders ignored by pruner (see TreeWalker), whose subtrees are not
+    listed. A missing root is an empty tree.
+    """
+    files: Listing = {}
+    dirs: set[str] = set()
+    scope = pruner.root() if pruner is not None else None
+    stack = [(os.fspath(root), "", scope)]
+    while stack:
+        dir_path, prefix, scope = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = it
+                if scope is not None:
+                    entries = list(it)
+                    scope = scope.load(dir_path, (e.name for e in entries))
+                for entry in entries:
+                    rel = prefix + entry.name
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if scope is not None and scope.excluded(entry, is_dir):
+                            continue
+                        if is_dir:
+                            dirs.add(rel)
+                            child = None if scope is None else scope.child(entry.name)
+                            stack.append((entry.path, rel + "/", child))
+                        elif entry.is_file():
+                            if predicate is not None and not predicate(
+                                _ScanEntry(entry)
+                            ):
+                                continue
+                            st = entry.stat()
+                            files[rel] = (st.st_size, st.st_mtime_ns)
+                    except OSError as e:
+                        if errors is not None:
+                            errors[Path(entry.path)] = e
+        except FileNotFoundError:
+            # Destino que todavía no existe, o una carpeta borrada durante el scan
+            pass
+        except OSError as e:
+            if errors is None:
+                raise
+            errors[Path(dir_path)] = e
+    files.pop(MANIFEST_NAME, None)
+    return files, dirs
+
+
+def file_digest(path: str | Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()
+
+
+class SyncPlan:
+    def __init__(self, source: Path, target: Path):
+        """
+        What a sync has to do, as paths relative to source/target ("/"-separated).
+
+        Attributes:
+            new (list): Files missing in the target.
+            changed (list): Files whose size or content differ.
+            touch (list): Same content with a different mtime: only the target's
+                mtime is updated, so the next comparison is size+mtime only.
+            extra (list): Files and folders only in the target. A folder is listed
+                alone, not its content.
+            unchanged (int): Files with the same size and mtime (or content).
+            hashed (int): Files whose content had to be compared.
+            dirs (list): Folders to create in the target.
+        """
+        self.source = source
+        self.target = target
+        self.new: list[str] = []
+        self.changed: list[str] = []
+        self.touch: list[str] = []
+        self.extra: list[str] = []
+        self.unchanged = 0
+        self.hashed = 0
+        self.dirs: list[str] = []
+        self.errors: dict[Path, OSError] = {}
+        # Datos para el manifest: {rel: [size, src_mtime_ns, dst_mtime_ns, digest]}
+        self._source_files: Listing = {}
+        self._target_files: Listing = {}
+        self._digests: dict[str, str] = {}
+
+    def diff(self) -> str:
+        """Dry run: '+' new, '~' changed, '-' extra (removed with delete_extras)."""
+        lines = [f"+ {rel}" for rel in self.new]
+        lines += [f"~ {rel}" for rel in self.changed]
+        lines += [f"- {rel}" for rel in self.extra]
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return (
+            f"SyncPlan(new={len(self.new)}, changed={len(self.changed)}, "
+            f"touch={len(self.touch)}, extra={len(self.extra)}, "
+            f"unchanged={self.unchanged}, hashed={self.hashed})"
+        )
+
+
+class SyncResult:
+    def __init__(self, plan: SyncPlan):
+        self.plan = plan
+        self.copy = CopyResult()
+        self.delete: Optional[DeleteResult] = None
+        self.elapsed: float = 0.0
+
+    @property
+    def errors(self) -> dict[Path, OSError]:
+        errors = dict(self.plan.errors)
+        errors.update(self.copy.errors)
+        if self.delete is not None:
+            errors.update(self.delete.errors)
+        return errors
+
+    def __repr__(self) -> str:
+        deleted = len(self.delete.deleted) if self.delete is not None else 0
+        return (
+            f"SyncResult(copied={len(self.copy.copied)}, deleted={deleted}, "
+            f"unchanged={self.plan.unchanged}, errors={len(self.errors)}, "
+            f"{self.elapsed:.3f}s)"
+        )
+
+
+class TreeSync:
+    def __init__(
+        self,
+        workers: int = 8,
+        delete_extras: bool = False,
+        modify_window: float = 0,
+        use_manifest: bool = True,
+        predicate: Optional[Predicate] = None,
+        pruner: Optional["Pruner"] = None,
+        stats: Optional[OperationStats] = None,
+    ):
+        """
+        Mirrors a source tree into a target tree, copying only what changed.
+
+        1. One scandir pass per side (both at the same time) gets size and mtime
+           of every file.
+        2. Different size: changed. Same size and mtime: unchanged. Same size with
+           a different mtime is ambiguous and the content is hashed, unless the
+           manifest of the last sync already says both files are the same.
+        3. New and changed files are copied on a thread pool (BulkCopier, times
+           preserved); extras are removed if delete_extras (BulkDeleter).
+        4. A manifest with size, both mtimes and known hashes is written to the
+           target, so the next sync doesn't hash the same files again (e.g. on
+           filesystems that don't keep mtimes exactly).
+
+        Args:
+            workers (int): Threads copying, hashing and removing.
+            delete_extras (bool): Remove target files and folders that are not in
+                the source. Files rejected by predicate are never removed.
+            modify_window (float): Accepted mtime difference in seconds (like rsync,
+                e.g. 2 for FAT).
+            use_manifest (bool): Read and write the manifest.
+            predicate (Predicate): Only sync the source files it accepts (see
+                compile_filters).
+            pruner (Pruner): Ignore rules, applied to both trees as in
+                TreeWalker: ignored paths are neither copied nor removed.
+            stats (OperationStats): Counts files_scanned and files_hashed, plus
+                the counters of BulkCopier and BulkDeleter, and the time of the
+                scan, compare, copy and delete phases.
+        """
+        self.workers = workers
+        self.delete_extras = delete_extras
+        self.modify_window_ns = int(modify_window * 1e9)
+        self.use_manifest = use_manifest
+        self.predicate = predicate
+        self.pruner = pruner
+        self.stats = stats
+
+    def plan(self, source: str | Path, target: str | Path) -> SyncPlan:
+        source, target = Path(source), Path(target)
+        if not source.is_dir():
+            raise NotADirectoryError(f"{source} is not a directory")
+        plan = SyncPlan(source, target)
+        stats = self.stats
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            src_future = pool.submit(
+                scan_tree, source, self.predicate, plan.errors, self.pruner
+            )
+            dst_future = pool.submit(
+                scan_tree, target, self.predicate, plan.errors, self.pruner
+            )
+            (src_files, src_dirs), (dst_files, dst_dirs) = (
+                src_future.result(),
+                dst_future.result(),
+            )
+        plan._source_files, plan._target_files = src_files, dst_files
+        if stats is not None:
+            stats.add_time("scan", time.perf_counter() - start)
+            stats.count("files_scanned", len(src_files) + len(dst_files))
+
+        start = time.perf_counter()
+        manifest = self._read_manifest(target) if self.use_manifest else {}
+        ambiguous: list[str] = []
+        for rel, (size, mtime) in src_files.items():
+            current = dst_files.get(rel)
+            if current is None:
+                plan.new.append(rel)
+            elif current[0] != size:
+                plan.changed.append(rel)
+            elif abs(current[1] - mtime) <= self.modify_window_ns:
+                plan.unchanged += 1
+            else:
+                known = manifest.get(rel)
+                if known is not None and known[:3] == [size, mtime, current[1]]:
+                    plan.unchanged += 1
+                    if known[3]:
+                        plan._digests[rel] = known[3]
+                else:
+                    ambiguous.append(rel)
+        self._compare_contents(plan, ambiguous)
+
+        plan.dirs = sorted(src_dirs - dst_dirs)
+        if self.delete_extras:
+            extra_dirs = dst_dirs - src_dirs
+            plan.extra = sorted(
+                rel
+                for rel in extra_dirs | (dst_files.keys() - src_files.keys())
+                # Lo que está dentro de una carpeta que se borra entera no se lista
+                if not _inside(rel, extra_dirs)
+            )
+        if stats is not None:
+            stats.add_time("compare", time.perf_counter() - start)
+        return plan
+
+    def _compare_contents(self, plan: SyncPlan, ambiguous: list[str]):
+        def digests(rel: str) -> Optional[tuple[str, str]]:
+            try:
+                return file_digest(plan.source / rel), file_digest(plan.target / rel)
+            except OSError as e:
+                plan.errors[plan.source / rel] = e
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for rel, pair in zip(ambiguous, pool.map(digests, ambiguous)):
+                if pair is None:
+                    continue
+                if pair[0] == pair[1]:
+                    plan.touch.append(rel)
+                    plan._digests[rel] = pair[0]
+                else:
+                    plan.changed.append(rel)
+        plan.hashed = len(ambiguous)
+        if self.stats is not None:
+            self.stats.count("files_hashed", 2 * len(ambiguous))
+
+    def sync(
+        self, source: str | Path, target: str | Path, dry_run: bool = False
+    ) -> SyncResult:
+        """
+        Plans and executes the sync. With dry_run only the plan is computed (see
+        SyncPlan.diff). Errors are reported per path in the result.
+        """
+        start = time.perf_counter()
+        plan = self.plan(source, target)
+        result = SyncResult(plan)
+        if dry_run:
+            result.elapsed = time.perf_counter() - start
+            return result
+
+        target = plan.target
+        if self.delete_extras and plan.extra:
+            deleter = BulkDeleter(workers=self.workers, stats=self.stats)
+            result.delete = deleter.delete(target / rel for rel in plan.extra)
+
+        target.mkdir(parents=True, exist_ok=True)
+        for rel in plan.dirs:
+            try:
+                (target / rel).mkdir(exist_ok=True)
+            except OSError as e:
+                plan.errors[target / rel] = e
+
+        copier = BulkCopier(
+            workers=self.workers,
+            preserve_metadata=True,
+            skip_unchanged=False,
+            stats=self.stats,
+        )
+        pairs = ((plan.source / rel, target / rel) for rel in plan.new + plan.changed)
+        result.copy = copier.copy_pairs(pairs)
+
+        for rel in plan.touch:
+            _, mtime = plan._source_files[rel]
+            try:
+                os.utime(target / rel, ns=(time.time_ns(), mtime))
+            except OSError as e:
+                plan.errors[target / rel] = e
+
+        if self.use_manifest:
+            self._write_manifest(plan, result)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    # -----------------------------------------
+    # --------  Manifest
+    # -----------------------------------------
+
+    @staticmethod
+    def _read_manifest(target: Path) -> dict[str, list]:
+        try:
+            with open(target / MANIFEST_NAME, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("files", {})
+
+    @staticmethod
+    def _write_manifest(plan: SyncPlan, result: SyncResult):
+        """
+        One line per file now in sync: source size and mtime, target mtime and the
+        hash if it is known. Files that failed are left out, so they are compared
+        again next time.
+        """
+        failed = {os.fspath(p) for p in result.errors}
+        # Listas del plan: buscar en ellas por cada archivo es cuadrático
+        written = set(plan.touch) | set(plan.changed)
+        files: dict[str, list] = {}
+        for rel, (size, mtime) in plan._source_files.items():
+            dst = plan.target / rel
+            if os.fspath(plan.source / rel) in failed or os.fspath(dst) in failed:
+                continue
+            current = plan._target_files.get(rel)
+            if current is None or rel in written:
+                try:
+                    dst_mtime = os.stat(dst).st_mtime_ns
+                except OSError:
+                    continue
+            else:
+                dst_mtime = current[1]
+            files[rel] = [size, mtime, dst_mtime, plan._digests.get(rel)]
+
+        path = plan.target / MANIFEST_NAME
+        temp = path.with_name(path.name + ".tmp")
+        try:
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "files": files}, f)
+            os.replace(temp, path)
+        except OSError as e:
+            plan.errors[path] = e
+
+
+def _inside(rel: str, dirs: set[str]) -> bool:
+    parent = rel.rpartition("/")[0]
+    while parent:
+        if parent in dirs:
+            return True
+        parent = parent.rpartition("/")[0]
+    return False
@@ -0,0 +1,191 @@
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+
+from .stats import OperationStats
+
+if TYPE_CHECKING:
+    from .ignore import IgnoreScope, Pruner
+
+
+class TreeWalker:
+    def __init__(
+        self,
+        max_depth: int = 0,
+        follow_symlinks: bool = False,
+        onerror: Optional[Callable[[OSError], None]] = None,
+        workers: int = 1,
+        stats: Optional[OperationStats] = None,
+        pruner: Optional["Pruner"] = None,
+    ):
+        """
+        Iterative directory walker built on os.scandir.
+
+        Depth is tracked per directory: the search dir is depth 0 and a
+        subdirectory is only listed while its parent's depth is below
+        max_depth. Deeper directories are yielded as entries themselves.
+
+        Args:
+            max_depth (int): Number of directory levels to descend below the search dir.
+            follow_symlinks (bool): Descend into symlinked directories. A directory
+                reached twice is only listed once, so link cycles end.
+            onerror (Callable): Called with the OSError of a directory that can't be
+                listed. If not given, the error is raised.
+            workers (int): Threads listing directories at the same time. Useful on
+                network or synced folders, where each listing waits on latency.
+            stats (OperationStats): Counts dirs_visited, entries_seen and stat_calls.
+            pruner (Pruner): Ignore rules (see ignore.Pruner), checked while each
+                directory is listed. Ignored entries are not yielded and ignored
+                directories are not listed.
+        """
+        self.max_depth = max_depth
+        self.follow_symlinks = follow_symlinks
+        self.onerror = onerror
+        self.workers = workers
+        self.stats = stats
+        self.pruner = pruner
+
+    def walk(self, search_dir: str | Path) -> Iterator[os.DirEntry]:
+        """
+        Yields the entries found under search_dir in pre-order: the files of a
+        directory first, then the contents of each subdirectory in listing order.
+        The order is the same with one or several workers.
+        """
+        if self.workers > 1:
+            return self._walk_parallel(search_dir)
+        return self._walk_serial(search_dir)
+
+    def _walk_serial(self, search_dir: str | Path) -> Iterator[os.DirEntry]:
+        visited = self._root_visited(search_dir)
+        stack: list[tuple[str, int, Optional["IgnoreScope"]]] = [
+            (os.fspath(search_dir), 0, self._root_scope())
+        ]
+        while stack:
+            dir_path, depth, scope = stack.pop()
+            leaves, subdirs, scope = self._scan(dir_path, depth, scope)
+            if self.stats is not None:
+                self._count(leaves, subdirs)
+            yield from leaves
+            # El chequeo de visitados va en orden de listado, como en el modo
+            # paralelo: si una carpeta y un link a ella están juntos, gana la primera
+            subdirs = [e for e in subdirs if not self._seen(e, visited)]
+            for entry in reversed(subdirs):
+                stack.append((entry.path, depth + 1, _child(scope, entry)))
+
+    def _walk_parallel(self, search_dir: str | Path) -> Iterator[os.DirEntry]:
+        """
+        Subdirectories are listed on the pool ahead of the consumer, at most
+        2 * workers listings at a time (running or done but not consumed yet), so
+        a slow consumer doesn't get the whole tree listed in memory. Results are
+        taken from a stack in pre-order, which keeps the output deterministic; the
+        listings submitted are the ones nearest the top, consumed first.
+        """
+        # Se importa acá: concurrent.futures arrastra logging (~10 ms de arranque)
+        from concurrent.futures import ThreadPoolExecutor
+
+        visited = self._root_visited(search_dir)
+        limit = 2 * self.workers
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        # [carpeta, profundidad, scope, future o None si todavía no se envió]
+        stack: list[list] = [[os.fspath(search_dir), 0, self._root_scope(), None]]
+        in_flight = 0
+
+        def fill():
+            nonlocal in_flight
+            for item in reversed(stack):
+                if in_flight >= limit:
+                    return
+                if item[3] is None:
+                    item[3] = pool.submit(self._scan, item[0], item[1], item[2])
+                    in_flight += 1
+
+        try:
+            while stack:
+                fill()
+                dir_path, depth, _scope, future = stack.pop()
+                in_flight -= 1
+                leaves, subdirs, scope = future.result()
+                if self.stats is not None:
+                    self._count(leaves, subdirs)
+                yield from leaves
+                subdirs = [e for e in subdirs if not self._seen(e, visited)]
+                for entry in reversed(subdirs):
+                    stack.append([entry.path, depth + 1, _child(scope, entry), None])
+        finally:
+            # Si el consumidor se detiene antes, no seguir listando
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _root_visited(self, search_dir: str | Path) -> set[tuple[int, int]]:
+        visited: set[tuple[int, int]] = set()
+        if self.follow_symlinks:
+            if self.stats is not None:
+                self.stats.count("stat_calls")
+            st = os.stat(search_dir)
+            visited.add((st.st_dev, st.st_ino))
+        return visited
+
+    def _root_scope(self) -> Optional["IgnoreScope"]:
+        return self.pruner.root() if self.pruner is not None else None
+
+    def _scan(
+        self, dir_path: str, depth: int, scope: Optional["IgnoreScope"] = None
+    ) -> tuple[list[os.DirEntry], list[os.DirEntry], Optional["IgnoreScope"]]:
+        """
+        Lists one directory. Returns the entries to yield and the subdirectories
+        to descend into. Type checks reuse the information cached by scandir.
+
+        With a scope, the ignore files of the directory are read first and then
+        every entry is checked against the rules. The scope is returned with the
+        rules of those files added, for the subdirectories.
+        """
+        follow = self.follow_symlinks
+        leaves: list[os.DirEntry] = []
+        subdirs: list[os.DirEntry] = []
+        try:
+            with os.scandir(dir_path) as it:
+                entries = it
+                if scope is not None:
+                    entries = list(it)
+                    scope = scope.load(dir_path, (e.name for e in entries))
+                for entry in entries:
+                    is_dir = entry.is_dir(follow_symlinks=follow)
+                    if scope is not None and scope.excluded(entry, is_dir):
+                        continue
+                    if is_dir:
+                        if depth < self.max_depth:
+                            subdirs.append(entry)
+                        else:
+                            leaves.append(entry)
+                    elif entry.is_file(follow_symlinks=follow) or (
+                        not follow and entry.is_symlink()
+                    ):
+                        leaves.append(entry)
+        except OSError as e:
+            if self.onerror is None:
+                raise
+            self.onerror(e)
+        return leaves, subdirs, scope
+
+    def _count(self, leaves: list[os.DirEntry], subdirs: list[os.DirEntry]):
+        # Se cuenta en el thread que consume, así _scan no cambia con stats
+        self.stats.count("dirs_visited")
+        self.stats.count("entries_seen", len(leaves) + len(subdirs))
+
+    def _seen(self, entry: os.DirEntry, visited: set[tuple[int, int]]) -> bool:
+        # Solo hace falta cuando se siguen symlinks, si no no puede haber ciclos
+        if not self.follow_symlinks:
+            return False
+        if self.stats is not None:
+            self.stats.count("stat_calls")
+        st = entry.stat()
+        key = (st.st_dev, st.st_ino)
+        if key in visited:
+            return True
+        visited.add(key)
+        return False
+
+
+def _child(
+    scope: Optional["IgnoreScope"], entry: os.DirEntry
+) -> Optional["IgnoreScope"]:
+    return scope.child(entry.name) if scope is not None else None
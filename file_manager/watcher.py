@@ -0,0 +1,576 @@
+import ctypes
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Self
+
+from .filters import Predicate
+from .walker import TreeWalker, _child
+
+if TYPE_CHECKING:
+    from .ignore import IgnoreScope, Pruner
+
+# Constantes de <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+EVENT_HEADER = struct.Struct("iIII")
+BACKENDS = ("auto", "inotify", "polling")
+
+# Evento crudo de un backend: (tipo, ruta, cookie). Tipos:
+# created, deleted, modified, moved_from, moved_to (cookie une los dos lados),
+# removed_tree (se fue una carpeta listada, con todo lo de adentro) y overflow.
+RawEvent = tuple[str, str, Optional[object]]
+
+
+class ChangeBatch:
+    def __init__(
+        self,
+        added: Iterable[Path] = (),
+        removed: Iterable[Path] = (),
+        modified: Iterable[Path] = (),
+        moved: Optional[dict[Path, Path]] = None,
+        rescanned: bool = False,
+    ):
+        """
+        Net changes of the watched result set during one debounce window. A file
+        created and deleted in the same window doesn't show up at all.
+
+        Attributes:
+            added / removed / modified (list): Sorted paths.
+            moved (dict): {old path: new path} for matching paths that were renamed
+                (they are not in added/removed).
+            rescanned (bool): The event queue overflowed and the tree was walked again.
+        """
+        self.added = sorted(added)
+        self.removed = sorted(removed)
+        self.modified = sorted(modified)
+        self.moved = dict(sorted((moved or {}).items()))
+        self.rescanned = rescanned
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified or self.moved)
+
+    def __repr__(self) -> str:
+        return (
+            f"ChangeBatch(added={len(self.added)}, removed={len(self.removed)}, "
+            f"modified={len(self.modified)}, moved={len(self.moved)})"
+        )
+
+
+class _Entry:
+    """What a predicate needs from a walk entry, for a path that came in an event."""
+
+    __slots__ = ("name", "path", "_stat")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        self._stat: Optional[os.stat_result] = None
+
+    def stat(self) -> os.stat_result:
+        if self._stat is None:
+            self._stat = os.stat(self.path)
+        return self._stat
+
+    def is_file(self) -> bool:
+        return os.path.isfile(self.path)
+
+    def is_dir(self) -> bool:
+        return os.path.isdir(self.path)
+
+    def is_symlink(self) -> bool:
+        return os.path.islink(self.path)
+
+    def __fspath__(self) -> str:
+        return self.path
+
+
+class Watcher:
+    def __init__(
+        self,
+        search_dir: str | Path,
+        predicate: Predicate,
+        max_depth: int = 0,
+        follow_symlinks: bool = False,
+        debounce: float = 0.1,
+        backend: str = "auto",
+        poll_interval: float = 1.0,
+        pruner: Optional["Pruner"] = None,
+    ):
+        """
+        Keeps the result of a collect up to date. The tree is walked once; after
+        that only the events of the filesystem are applied (inotify on Linux, mtime
+        snapshots elsewhere), each one checked against the same predicate. The tree
+        is only walked again if the kernel event queue overflows.
+
+        Args:
+            predicate (Predicate): Compiled conditions (see compile_filters).
+            debounce (float): Seconds without new events that close a batch.
+            backend (str): "inotify", "polling", or "auto" (inotify when available).
+            poll_interval (float): Seconds between snapshots of the polling backend.
+            pruner (Pruner): Ignore rules, as in TreeWalker. Ignored folders are
+                not watched and events for ignored paths are dropped. The ignore
+                files are read when a folder is first listed; later edits to them
+                apply after a rescan.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"'backend' should be one of {BACKENDS}, got: {backend!r}")
+        self.search_dir = os.fspath(search_dir)
+        self.predicate = predicate
+        self.debounce = debounce
+        # Un flujo continuo de eventos no puede retrasar el lote para siempre
+        self.max_latency = max(10 * debounce, 1.0)
+        self.walker = TreeWalker(
+            max_depth=max_depth,
+            follow_symlinks=follow_symlinks,
+            onerror=lambda e: None,
+            pruner=pruner,
+        )
+
+        # Primero el backend y después el walk, así no se pierde nada en el medio
+        self.backend = self._open_backend(backend, poll_interval)
+        self.paths: set[Path] = set(self._scan())
+
+    def _open_backend(self, backend: str, poll_interval: float):
+        if backend != "polling" and _libc is not None:
+            try:
+                return _InotifyBackend(self.search_dir, self.walker)
+            except OSError:
+                # p.ej. límite de watches (ENOSPC)
+                if backend == "inotify":
+                    raise
+        elif backend == "inotify":
+            raise OSError(errno.ENOSYS, "inotify is not available here")
+        return _PollingBackend(self.search_dir, self.walker, poll_interval)
+
+    def _scan(self) -> Iterator[Path]:
+        for entry in self.walker.walk(self.search_dir):
+            if self.predicate(entry):
+                yield Path(entry.path)
+
+    def poll(self, timeout: Optional[float] = None) -> Optional[ChangeBatch]:
+        """
+        Waits for changes to the result set. Once an event arrives, events are read
+        until none comes for `debounce` seconds, and all of them are returned as
+        one batch. Events that don't change the result set are skipped.
+
+        Returns:
+            ChangeBatch, or None if nothing changed before the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            events = self.backend.read(remaining)
+            if not events:
+                continue
+            window_end = time.monotonic() + self.max_latency
+            while time.monotonic() < window_end:
+                more = self.backend.read(self.debounce)
+                if not more:
+                    break
+                events += more
+            batch = self._apply(events)
+            if batch:
+                return batch
+
+    def __iter__(self) -> Iterator[ChangeBatch]:
+        while True:
+            yield self.poll()
+
+    def close(self):
+        self.backend.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _apply(self, events: list[RawEvent]) -> ChangeBatch:
+        added: set[Path] = set()
+        removed: set[Path] = set()
+        modified: set[Path] = set()
+        moves_from: dict[object, Path] = {}
+        moves: dict[Path, Path] = {}
+        rescanned = False
+
+        def add(path: Path):
+            if path in self.paths:
+                return
+            self.paths.add(path)
+            if path in removed:
+                # Borrado y creado de nuevo en la misma ventana
+                removed.discard(path)
+                modified.add(path)
+            else:
+                added.add(path)
+
+        def remove(path: Path):
+            if path not in self.paths:
+                return
+            self.paths.discard(path)
+            modified.discard(path)
+            if path in added:
+                added.discard(path)
+            else:
+                removed.add(path)
+
+        for kind, path_str, cookie in events:
+            path = Path(path_str)
+            if kind == "overflow":
+                current = set(self._scan())
+                for p in self.paths - current:
+                    remove(p)
+                for p in current - self.paths:
+                    add(p)
+                self.backend.reset()
+                rescanned = True
+            elif kind == "removed_tree":
+                prefix = path_str + os.sep
+                for p in [p for p in self.paths if os.fspath(p).startswith(prefix)]:
+                    remove(p)
+            elif kind in ("deleted", "moved_from"):
+                if kind == "moved_from" and path in self.paths:
+                    moves_from[cookie] = path
+                remove(path)
+            elif self.predicate(_Entry(path_str)):
+                if kind == "modified" and path in self.paths:
+                    if path not in added:
+                        modified.add(path)
+                    continue
+                add(path)
+                if kind == "moved_to" and cookie in moves_from:
+                    moves[moves_from.pop(cookie)] = path
+            else:
+                remove(path)
+
+        moved = {
+            old: new for old, new in moves.items() if old in removed and new in added
+        }
+        removed -= moved.keys()
+        added -= set(moved.values())
+        return ChangeBatch(added, removed, modified, moved, rescanned)
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+_libc = _load_libc()
+
+
+def _check(result: int) -> int:
+    if result < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+    return result
+
+
+class _InotifyBackend:
+    def __init__(self, root: str, walker: TreeWalker):
+        """
+        One inotify watch per listed directory (the ones within max_depth). New
+        directories get their watch when they appear and their content is reported
+        as created, so files written before the watch was added are not lost.
+        """
+        self.root = root
+        self.walker = walker
+        self.fd = _check(_libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC))
+        # wd -> (carpeta, profundidad, reglas de ignore de la carpeta)
+        self.dirs: dict[int, tuple[str, int, Optional["IgnoreScope"]]] = {}
+        try:
+            self._add_tree(root, 0, scope=walker._root_scope())
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def reset(self):
+        for wd in list(self.dirs):
+            _libc.inotify_rm_watch(self.fd, wd)
+        self.dirs.clear()
+        self._add_tree(self.root, 0, scope=self.walker._root_scope())
+
+    def close(self):
+        os.close(self.fd)
+
+    def _add_tree(
+        self,
+        path: str,
+        depth: int,
+        events: Optional[list[RawEvent]] = None,
+        scope: Optional["IgnoreScope"] = None,
+    ):
+        stack = [(path, depth, scope)]
+        while stack:
+            dir_path, depth, scope = stack.pop()
+            wd = _libc.inotify_add_watch(self.fd, os.fsencode(dir_path), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOENT, errno.ENOTDIR):
+                    # Ya no existe, no hay nada que vigilar
+                    continue
+                raise OSError(err, os.strerror(err), dir_path)
+            if wd in self.dirs and self.dirs[wd][0] != dir_path:
+                # Misma carpeta por otro camino (symlink): ya está vigilada
+                continue
+            leaves, subdirs, scope = self.walker._scan(dir_path, depth, scope)
+            self.dirs[wd] = (dir_path, depth, scope)
+            if events is not None:
+                events.extend(("created", entry.path, None) for entry in leaves)
+            stack.extend(
+                (entry.path, depth + 1, _child(scope, entry))
+                for entry in reversed(subdirs)
+            )
+
+    def _remove_tree(self, path: str):
+        prefix = path + os.sep
+        for wd, (dir_path, _depth, _scope) in list(self.dirs.items()):
+            if dir_path == path or dir_path.startswith(prefix):
+                _libc.inotify_rm_watch(self.fd, wd)
+                del self.dirs[wd]
+
+    def read(self, timeout: Optional[float]) -> list[RawEvent]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events: list[RawEvent] = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                events.append(("overflow", self.root, None))
+                continue
+            if wd not in self.dirs:
+                # Eventos que quedaban en cola de un watch ya quitado
+                continue
+            dir_path, depth, scope = self.dirs[wd]
+            if mask & IN_IGNORED:
+                del self.dirs[wd]
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                if dir_path == self.root:
+                    events.append(("removed_tree", dir_path, None))
+                continue
+            self._translate(
+                events, mask, cookie, os.path.join(dir_path, name), depth, scope
+            )
+        return events
+
+    def _translate(
+        self,
+        events: list[RawEvent],
+        mask: int,
+        cookie: int,
+        path: str,
+        depth: int,
+        scope: Optional["IgnoreScope"] = None,
+    ):
+        is_dir = bool(mask & IN_ISDIR)
+        if (
+            not is_dir
+            and self.walker.follow_symlinks
+            and mask & (IN_CREATE | IN_MOVED_TO)
+        ):
+            is_dir = os.path.isdir(path)
+        if scope is not None and scope.excluded(_Entry(path), is_dir):
+            return
+        # Carpeta que se lista (no se devuelve como entrada)
+        listed = is_dir and depth < self.walker.max_depth
+
+        if mask & (IN_CREATE | IN_MOVED_TO):
+            if listed:
+                child = None if scope is None else scope.child(os.path.basename(path))
+                self._add_tree(path, depth + 1, events, child)
+            elif mask & IN_MOVED_TO:
+                events.append(("moved_to", path, cookie))
+            else:
+                events.append(("created", path, None))
+        elif mask & (IN_DELETE | IN_MOVED_FROM):
+            if listed:
+                self._remove_tree(path)
+                events.append(("removed_tree", path, None))
+            elif mask & IN_MOVED_FROM:
+                events.append(("moved_from", path, cookie))
+            else:
+                events.append(("deleted", path, None))
+        elif mask & (IN_MODIFY | IN_CLOSE_WRITE) and not listed:
+            events.append(("modified", path, None))
+
+
+class _PolledDir:
+    """Listing of a folder kept by the polling backend between snapshots."""
+
+    __slots__ = ("mtime_ns", "listed_ns", "leaves", "subdirs")
+
+    def __init__(
+        self,
+        mtime_ns: int,
+        listed_ns: int,
+        leaves: list[str],
+        subdirs: list[tuple[str, Optional["IgnoreScope"]]],
+    ):
+        self.mtime_ns = mtime_ns
+        self.listed_ns = listed_ns
+        self.leaves = leaves
+        self.subdirs = subdirs
+
+
+# Un listado hecho hasta 2 s después del mtime de la carpeta no es confiable: otro
+# cambio en el mismo tick del reloj del filesystem (2 s en FAT) no movería el mtime
+RACY_NS = 2 * 10**9
+
+
+class _PollingBackend:
+    def __init__(self, root: str, walker: TreeWalker, interval: float):
+        """
+        Portable fallback: every `interval` seconds compares (inode, size, mtime)
+        of every entry with the previous snapshot. An entry that keeps its inode,
+        size and mtime under another path is a rename.
+
+        Only folders whose mtime changed (something was added, removed or renamed
+        in them) are listed again; the entries of the others are only stat'ed.
+        """
+        self.root = root
+        self.walker = walker
+        self.interval = interval
+        self.dirs: dict[str, _PolledDir] = {}
+        self.snapshot = self._snapshot()
+
+    def reset(self):
+        self.dirs.clear()
+        self.snapshot = self._snapshot()
+
+    def close(self):
+        pass
+
+    def _snapshot(self) -> dict[str, tuple[int, int, int, int]]:
+        follow = self.walker.follow_symlinks
+        snapshot = {}
+        dirs: dict[str, _PolledDir] = {}
+        visited: set[tuple[int, int]] = set()
+        stack = [(self.root, 0, self.walker._root_scope())]
+        while stack:
+            dir_path, depth, scope = stack.pop()
+            try:
+                st = os.stat(dir_path)
+            except OSError:
+                continue
+            if follow:
+                # Carpetas enlazadas: cada una se recorre una vez, como en el walk
+                key = (st.st_dev, st.st_ino)
+                if key in visited:
+                    continue
+                visited.add(key)
+            state = self.dirs.get(dir_path)
+            if (
+                state is None
+                or state.mtime_ns != st.st_mtime_ns
+                or state.listed_ns - state.mtime_ns < RACY_NS
+            ):
+                state = self._list(dir_path, depth, scope, st.st_mtime_ns)
+            dirs[dir_path] = state
+            for path in state.leaves:
+                try:
+                    st = os.stat(path, follow_symlinks=follow)
+                except OSError:
+                    continue
+                snapshot[path] = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+            stack.extend(
+                (path, depth + 1, child) for path, child in reversed(state.subdirs)
+            )
+        # Las carpetas que ya no se alcanzan se olvidan
+        self.dirs = dirs
+        return snapshot
+
+    def _list(
+        self,
+        dir_path: str,
+        depth: int,
+        scope: Optional["IgnoreScope"],
+        mtime_ns: int,
+    ) -> _PolledDir:
+        listed_ns = time.time_ns()
+        leaves, subdirs, scope = self.walker._scan(dir_path, depth, scope)
+        return _PolledDir(
+            mtime_ns,
+            listed_ns,
+            [entry.path for entry in leaves],
+            [(entry.path, _child(scope, entry)) for entry in subdirs],
+        )
+
+    def read(self, timeout: Optional[float]) -> list[RawEvent]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.interval
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            time.sleep(wait)
+            events = self._diff(self._snapshot())
+            if events or (deadline is not None and time.monotonic() >= deadline):
+                return events
+
+    def _diff(self, new: dict[str, tuple[int, int, int, int]]) -> list[RawEvent]:
+        old, self.snapshot = self.snapshot, new
+        born = {key: path for path, key in new.items() if path not in old}
+        events: list[RawEvent] = []
+        for path, key in old.items():
+            if path in new:
+                if new[path] != key:
+                    events.append(("modified", path, None))
+            elif key in born:
+                events.append(("moved_from", path, key))
+                events.append(("moved_to", born.pop(key), key))
+            else:
+                events.append(("deleted", path, None))
+        events.extend(("created", path, None) for path in born.values())
+        return events
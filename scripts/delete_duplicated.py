@@ -1,61 +1,68 @@
-import re
 from pathlib import Path
 
 from file_manager import FileManager
+from file_manager.clusters import within_clusters
+from file_manager.dedupe import (
+    clean_copy_name,
+    clean_numbered_name,
+    plan_dedupe,
+    plan_name_cleanup,
+    prefer_original,
+    prefer_unnumbered,
+)
 
 
-def delete_duplicated(search_dir: Path, dry_run: bool = False):
+def delete_duplicated(
+    search_dir: Path,
+    dry_run: bool = False,
+    clean_names: bool = True,
+    max_depth: int = 0,
+    similar_names: bool = False,
+):
     fm = FileManager()
     fm.set_search_dir(search_dir)
+    fm.set_max_depth(max_depth)
+    files = [path for path in fm.collect() if path.is_file()]
 
-    # 1: Get files that end with (1), (2), (#)...
-    dupli_regex = r"\(\d\)$"
-    fm.filter_by_regex_search(dupli_regex)
-    maybe_duplicated = fm.collect()
-
-    # 2: We have to make sure their equivalent without (#) exist
-    # We don't want to delete files with (#) that don't have originals
-    duplicated_original_dict: dict[Path, Path] = {}
-    for duplicated_path in maybe_duplicated:
-        original_path = duplicated_path.with_name(
-            re.sub(dupli_regex, "", duplicated_path.stem).strip()
-            + duplicated_path.suffix
-        )
-        duplicated_original_dict[duplicated_path] = original_path
-
-    real_duplicates: list[Path] = []
-    false_duplicates: list[Path] = []
-    for duplic, original in duplicated_original_dict.items():
-        if original.exists():
-            real_duplicates.append(duplic)
-        else:
-            false_duplicates.append(duplic)
+    # 1: Duplicates are files with the same content, whatever their names.
+    # The kept file of each group is the one without (#) / shortest name
+    # With similar_names only copies with similar names are deleted ("x - copia",
+    # "Copy of x"...), and only those files are read
+    keep, clean = prefer_unnumbered, clean_numbered_name
+    if similar_names:
+        clusters = fm.cluster_names(files)
+        candidates = [path for cluster in clusters for path in cluster]
+        groups = within_clusters(fm.find_duplicates(candidates), clusters)
+        keep, clean = prefer_original, clean_copy_name
+    else:
+        groups = fm.find_duplicates(files)
+    real_duplicates = plan_dedupe(groups, keep)
+
+    # 2: Files that end with (1), (2), (#)... but have no original are not duplicates,
+    # we only get rid of the (#) when the clean name is free
+    renames = plan_name_cleanup(files, real_duplicates, clean) if clean_names else {}
+    false_duplicates = list(renames)
 
     print(
-        f"Paths that end with (#) that are not duplicated: {len(maybe_duplicated) - len(real_duplicates)}/{len(maybe_duplicated)}"
+        f"Duplicate groups: {len(groups)}, files to delete: {len(real_duplicates)}/{len(files)}"
     )
     # 3: We delete real duplicates and get rid of (#) for false duplicates
     if not dry_run:
         for file in real_duplicates:
             file.unlink()
-        for file in false_duplicates:
-            clean_original_name = file.with_name(
-                re.sub(dupli_regex, "", file.stem).strip() + file.suffix
-            )
+        for file, clean_original_name in renames.items():
             file.rename(clean_original_name)
-    
+
     print(f"Deleted ({len(real_duplicates)}):")
     for file in real_duplicates:
         print(f"- {file}")
     print(f"Cleaned ({len(false_duplicates)}):")
     for file in false_duplicates:
         print(f"- {file}")
-        
+
     return real_duplicates, false_duplicates
 
 
 if __name__ == "__main__":
-    from pprint import pprint
-
     path = Path(r"C:\Users\micha\Downloads")
     delete_duplicated(path, dry_run=False)
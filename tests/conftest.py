@@ -0,0 +1,26 @@
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    """
+    Crea una serie de folders y archivos (sin contenido) para probar el FileManager.
+
+    tmp_path/
+        cuentas_1.xlsx, cuentas_2.xlsx, notas.txt
+        reportes/
+            enero.xlsx, febrero (1).xlsx
+            2024/
+                resumen.pdf
+        vacio/
+    """
+    for name in ("cuentas_1.xlsx", "cuentas_2.xlsx", "notas.txt"):
+        (tmp_path / name).touch()
+    (tmp_path / "reportes" / "2024").mkdir(parents=True)
+    (tmp_path / "reportes" / "enero.xlsx").touch()
+    (tmp_path / "reportes" / "febrero (1).xlsx").touch()
+    (tmp_path / "reportes" / "2024" / "resumen.pdf").touch()
+    (tmp_path / "vacio").mkdir()
+    return tmp_path
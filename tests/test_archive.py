@@ -0,0 +1,132 @@
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from file_manager import FileManager
+from file_manager.archive import CHUNK_SIZE, BulkArchiver
+
+
+@pytest.fixture
+def files(tmp_path: Path) -> list[Path]:
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    paths = [
+        src / "acta.txt",
+        src / "sub" / "sesión.txt",
+        src / "vacío.txt",
+        src / "grande.bin",
+    ]
+    paths[0].write_text("acta " * 1000)
+    paths[1].write_text("línea\n" * 5000)
+    paths[2].touch()
+    # Varios bloques de compresión, con una parte que no se comprime
+    paths[3].write_bytes((b"abc" * 5000 + os.urandom(5000)) * 150)
+    return paths
+
+
+def read_archive(path: Path) -> dict[str, bytes]:
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            assert archive.testzip() is None
+            return {name: archive.read(name) for name in archive.namelist()}
+    with tarfile.open(path) as archive:
+        return {
+            m.name: archive.extractfile(m).read() if m.isfile() else b""
+            for m in archive
+        }
+
+
+@pytest.mark.parametrize("format", ["zip", "tar", "tar.gz"])
+def test_round_trip(files: list[Path], tmp_path: Path, format: str):
+    src = tmp_path / "src"
+    target = tmp_path / f"out.{format}"
+    assert files[3].stat().st_size > 2 * CHUNK_SIZE
+
+    result = BulkArchiver(format, workers=3, base_dir=src).export(files, target)
+    assert result.archives == [target]
+    assert result.added == files
+    assert result.bytes_read == sum(p.stat().st_size for p in files)
+    assert result.bytes_written == target.stat().st_size
+    assert not target.with_name(f"{target.name}.tmp").exists()
+    assert read_archive(target) == {
+        p.relative_to(src).as_posix(): p.read_bytes() for p in files
+    }
+
+
+def test_split_archives(files: list[Path], tmp_path: Path):
+    src = tmp_path / "src"
+    max_size = 300_000
+    result = BulkArchiver("tar.gz", base_dir=src, max_size=max_size).export(
+        files * 3, tmp_path / "out.tar.gz"
+    )
+    assert [a.name for a in result.archives][:2] == ["out-001.tar.gz", "out-002.tar.gz"]
+    contents: dict[str, bytes] = {}
+    for archive in result.archives:
+        if archive.stat().st_size > max_size:
+            # Solo un archivo más grande que max_size queda solo y lo supera
+            assert list(read_archive(archive)) == ["grande.bin"]
+        contents.update(read_archive(archive))
+    assert set(contents) == {p.relative_to(src).as_posix() for p in files}
+
+
+def test_failed_file_is_left_out_of_zip(files: list[Path], tmp_path: Path, monkeypatch):
+    real_open = open
+
+    class Broken:
+        def __init__(self, file):
+            self.file = file
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.file.close()
+
+        def read(self, size):
+            if self.file.tell():
+                raise OSError("disco desconectado")
+            return self.file.read(size)
+
+    def fake_open(path, *args, **kwargs):
+        file = real_open(path, *args, **kwargs)
+        return Broken(file) if path == files[3] else file
+
+    monkeypatch.setattr("builtins.open", fake_open)
+    target = tmp_path / "out.zip"
+    result = BulkArchiver(base_dir=tmp_path / "src").export(files, target)
+    monkeypatch.undo()
+
+    assert list(result.errors) == [files[3]]
+    assert result.added == files[:3]
+    assert sorted(read_archive(target)) == ["acta.txt", "sub/sesión.txt", "vacío.txt"]
+
+
+def test_file_manager_export_skips_the_archive(files: list[Path], tmp_path: Path):
+    src = tmp_path / "src"
+    fm = FileManager()
+    fm.set_search_dir(src)
+    fm.set_max_depth(1)
+    fm.filter_by_extension(".txt")
+    result = fm.export(src / "textos.zip")
+    assert sorted(read_archive(src / "textos.zip")) == [
+        "acta.txt",
+        "sub/sesión.txt",
+        "vacío.txt",
+    ]
+    assert result.errors == {}
+
+    # Una segunda exportación no se mete a sí misma ni a la anterior
+    fm.filter_by_type("file")
+    fm.export(src / "todo.tar")
+    assert "todo.tar" not in read_archive(src / "todo.tar")
+    assert "textos.zip" in read_archive(src / "todo.tar")
+
+
+def test_format_of():
+    assert BulkArchiver.format_of("a/b.TGZ") == "tar.gz"
+    assert BulkArchiver.format_of("b.tar.zst") == "tar.zst"
+    with pytest.raises(ValueError):
+        BulkArchiver.format_of("b.rar")
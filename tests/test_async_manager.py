@@ -0,0 +1,189 @@
+import asyncio
+import os
+import threading
+import time
+from pathlib import Path
+
+from file_manager.async_manager import AsyncFileManager
+from file_manager.copier import BulkCopier
+
+
+def make_afm(search_dir: Path, **kwargs) -> AsyncFileManager:
+    afm = AsyncFileManager(**kwargs)
+    afm.set_search_dir(search_dir)
+    afm.set_max_depth(2)
+    return afm
+
+
+def test_collect_matches_sync_api(tree: Path):
+    async def main():
+        async with make_afm(tree, batch_size=1) as afm:
+            return await afm.filter_by_extension(".xlsx").collect()
+
+    found = asyncio.run(main())
+    assert {p.name for p in found} == {
+        "cuentas_1.xlsx",
+        "cuentas_2.xlsx",
+        "enero.xlsx",
+        "febrero (1).xlsx",
+    }
+
+
+def test_collect_with_index(tree: Path, tmp_path_factory):
+    index_path = tmp_path_factory.mktemp("cache") / "index.sqlite"
+
+    async def main():
+        # Con batch_size=1 cada lote del walk puede ir a otro thread del executor
+        async with make_afm(tree, batch_size=1, max_concurrency=4) as afm:
+            afm.set_index(index_path)
+            first = await afm.filter_by_extension(".xlsx").collect()
+            second = await afm.filter_by_extension(".xlsx").collect()
+            return first, second
+
+    first, second = asyncio.run(main())
+    assert len(first) == 4
+    assert first == second
+
+
+def test_iter_collect_can_stop_early(tree: Path):
+    async def main():
+        async with make_afm(tree, batch_size=1) as afm:
+            async for path in afm.iter_collect():
+                return path
+
+    assert asyncio.run(main()).exists()
+
+
+def test_copy_and_delete_share_the_loop(tree: Path, tmp_path_factory):
+    target = tmp_path_factory.mktemp("copia")
+    xlsx = [tree / "cuentas_1.xlsx", tree / "cuentas_2.xlsx"]
+
+    async def main():
+        async with make_afm(tree, max_concurrency=2) as afm:
+            ticks = 0
+
+            async def heartbeat():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            beat = asyncio.create_task(heartbeat())
+            result = await afm.copy([tree / "reportes"], target)
+            deleted = await afm.delete(xlsx + [tree / "vacio"])
+            beat.cancel()
+            return result, deleted, ticks
+
+    result, deleted, ticks = asyncio.run(main())
+    assert len(result.copied) == 3 and not result.errors
+    assert (target / "reportes" / "2024" / "resumen.pdf").exists()
+    # Las carpetas se borran igual que con FileManager.delete
+    assert deleted.errors == {}
+    assert deleted.dirs_removed == 1
+    assert not any(p.exists() for p in xlsx + [tree / "vacio"])
+    assert ticks > 0
+
+
+def test_cancelled_copy_stops_submitting(tmp_path: Path):
+    sources = [tmp_path / f"f{i}.txt" for i in range(200)]
+    for path in sources:
+        path.write_text("x")
+    target = tmp_path / "copia"
+
+    async def main():
+        async with make_afm(tmp_path, max_concurrency=1) as afm:
+            task = asyncio.create_task(afm.copy(sources, target))
+            while not target.exists() or not any(target.iterdir()):
+                await asyncio.sleep(0)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+            return False
+
+    assert asyncio.run(main())
+    assert len(list(target.iterdir())) < len(sources)
+
+
+def test_copy_reads_the_plan_lazily(tmp_path: Path, monkeypatch):
+    source = tmp_path / "origen"
+    source.mkdir()
+    for i in range(50):
+        (source / f"f{i}.txt").write_text("x")
+    planned = []
+    plan = BulkCopier.plan
+
+    def counting_plan(self, *args):
+        for pair in plan(self, *args):
+            planned.append(pair)
+            yield pair
+
+    monkeypatch.setattr(BulkCopier, "plan", counting_plan)
+    ahead = []
+    copy_file = BulkCopier.copy_file
+
+    def copy_and_check(self, src, dst):
+        # Lo planeado y todavía no copiado no pasa de un lote más lo que está en vuelo
+        ahead.append(
+            len(planned) - len(list((tmp_path / "copia" / "origen").iterdir()))
+        )
+        return copy_file(self, src, dst)
+
+    monkeypatch.setattr(BulkCopier, "copy_file", copy_and_check)
+
+    async def main():
+        async with make_afm(tmp_path, max_concurrency=2, batch_size=4) as afm:
+            return await afm.copy([source], tmp_path / "copia")
+
+    result = asyncio.run(main())
+    assert len(result.copied) == 50 and not result.errors
+    assert max(ahead) <= 4 + 2
+
+
+def test_cancelled_delete_stops(tmp_path: Path, monkeypatch):
+    folders = [tmp_path / f"carpeta_{i}" for i in range(50)]
+    for folder in folders:
+        folder.mkdir()
+        (folder / "a.txt").write_text("x")
+    started = threading.Event()
+    unlink = os.unlink
+
+    def slow_unlink(*args, **kwargs):
+        started.set()
+        time.sleep(0.01)
+        return unlink(*args, **kwargs)
+
+    monkeypatch.setattr(os, "unlink", slow_unlink)
+
+    async def main():
+        async with make_afm(tmp_path, max_concurrency=1) as afm:
+            task = asyncio.create_task(afm.delete(folders))
+            while not started.is_set():
+                await asyncio.sleep(0.001)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+            return False
+
+    assert asyncio.run(main())
+    left = sum(folder.exists() for folder in folders)
+    assert 0 < left < len(folders)
+    # Al volver la cancelación ya no queda nada borrando
+    time.sleep(0.05)
+    assert sum(folder.exists() for folder in folders) == left
+
+
+def test_iter_collect_closed_after_aclose(tree: Path):
+    async def main():
+        afm = make_afm(tree, batch_size=1)
+        paths = afm.iter_collect()
+        first = await anext(paths)
+        await afm.aclose()
+        # Cerrar el iterador con el executor ya apagado no falla
+        await paths.aclose()
+        return first
+
+    assert asyncio.run(main()).exists()
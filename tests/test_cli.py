@@ -0,0 +1,106 @@
+import io
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+from file_manager import cli
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_find_streams_nul_delimited_paths(tree: Path, capsysbinary):
+    assert cli.main(["find", str(tree), "-d", "2", "-e", ".xlsx", "-0"]) == 0
+    out = capsysbinary.readouterr().out
+    assert out.endswith(b"\0")
+    assert {Path(p.decode()).name for p in out.split(b"\0")[:-1]} == {
+        "cuentas_1.xlsx",
+        "cuentas_2.xlsx",
+        "enero.xlsx",
+        "febrero (1).xlsx",
+    }
+
+
+def test_rename_dry_run_and_execute(tree: Path, capsys):
+    path = str(tree / "notas.txt")
+    assert cli.main(["rename", path, "-s", "upper", "--dry-run"]) == 0
+    assert "notas.txt -> NOTAS.txt" in capsys.readouterr().out
+    assert cli.main(["rename", path, "-s", "upper"]) == 0
+    assert (tree / "NOTAS.txt").exists()
+
+
+def test_rename_converts_step_arguments(tree: Path, capsys):
+    path = str(tree / "notas.txt")
+    args = ["rename", path, "-n", "-s", "smart_title:de", "-s", "center:9:*"]
+    assert cli.main(args) == 0
+    assert "notas.txt -> **Notas**.txt" in capsys.readouterr().out
+
+
+def test_rename_rejects_bad_steps(tree: Path, capsys):
+    path = str(tree / "notas.txt")
+    for step in ("__class__", "split", "center", "center:x", "center:9:**"):
+        assert cli.main(["rename", path, "-s", step]) == 1
+        assert capsys.readouterr().err.startswith("file_manager: ")
+    assert (tree / "notas.txt").exists()
+
+
+def test_dedupe_dry_run_lists_duplicates(tree: Path, capsys):
+    (tree / "cuentas_1.xlsx").write_text("igual")
+    (tree / "reportes" / "febrero (1).xlsx").write_text("igual")
+    assert cli.main(["dedupe", str(tree), "-d", "2", "-n"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        str(tree / "reportes" / "febrero (1).xlsx")
+    ]
+    assert (tree / "reportes" / "febrero (1).xlsx").exists()
+
+
+def test_find_does_not_import_heavy_modules(tree: Path):
+    # El arranque en frío importa: ver benchmarks/bench_cli.py
+    probe = (
+        "import sys; from file_manager import cli; "
+        f"cli.main(['find', {str(tree)!r}]); "
+        "heavy = ('sqlite3', 'ctypes', 'hashlib', 'asyncio', 'logging', 'json'); "
+        "print(*[m for m in heavy if m in sys.modules], file=sys.stderr)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, cwd=ROOT
+    )
+    assert result.returncode == 0
+    assert result.stderr.strip() == ""
+
+
+def test_dedupe_similar_names_only(tree: Path, capsys):
+    (tree / "cuentas.xlsx").write_text("igual")
+    (tree / "Copia de cuentas.xlsx").write_text("igual")
+    (tree / "otro nombre.xlsx").write_text("igual")
+    assert cli.main(["dedupe", str(tree), "-n", "--similar-names"]) == 0
+    assert capsys.readouterr().out.splitlines() == [str(tree / "Copia de cuentas.xlsx")]
+
+
+def test_stdin_paths_are_streamed(monkeypatch):
+    class Pipe:
+        def __init__(self, chunks):
+            self.chunks = chunks
+            self.reads = 0
+
+        def read1(self, size):
+            self.reads += 1
+            return self.chunks.pop(0) if self.chunks else b""
+
+    pipe = Pipe([b"uno\0do", b"s\0", b"tres"])
+    monkeypatch.setattr(sys, "stdin", type("Stdin", (), {"buffer": pipe}))
+    paths = cli._read_paths(["antes", "-"], null=True)
+    assert next(paths) == "antes"
+    # La primera ruta sale sin esperar el resto de la entrada
+    assert next(paths) == "uno" and pipe.reads == 1
+    assert list(paths) == ["dos", "tres"]
+
+
+def test_export_reads_paths_from_stdin(tree: Path, tmp_path: Path, monkeypatch):
+    paths = [tree / "cuentas_1.xlsx", tree / "reportes" / "enero.xlsx"]
+    stdin = io.TextIOWrapper(io.BytesIO(b"\0".join(map(bytes, paths))))
+    monkeypatch.setattr(sys, "stdin", stdin)
+    target = tmp_path / "out.zip"
+    assert cli.main(["export", "-0", "-", str(target), "-C", str(tree)]) == 0
+    with zipfile.ZipFile(target) as archive:
+        assert archive.namelist() == ["cuentas_1.xlsx", "reportes/enero.xlsx"]
@@ -0,0 +1,109 @@
+import random
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+from file_manager.clusters import (
+    NameClusterer,
+    _grams,
+    _UnionFind,
+    default_normalizer,
+    within_clusters,
+)
+from file_manager.dedupe import (
+    clean_copy_name,
+    plan_dedupe,
+    plan_name_cleanup,
+    prefer_original,
+)
+from file_manager.stats import OperationStats
+
+
+def test_copy_markers_case_and_accents():
+    names = [
+        "informe.xlsx",
+        "Informe (10).xlsx",
+        "Copia de informe - copia (2).xlsx",
+        "informe - Copy.xlsx",
+        "Sesión Ordinaria.docx",
+        "sesion_ordinaria copy 2.docx",
+        "informe.pdf",  # otra extensión
+        "acta.docx",
+        "Copia de seguridad.docx",
+        "seguridad.docx",
+    ]
+    assert NameClusterer(threshold=1).cluster(names) == [
+        sorted(map(Path, names[:4])),
+        sorted(map(Path, names[4:6])),
+    ]
+
+
+def test_near_names_are_joined():
+    names = ["informe final.xlsx", "INFORME_final.xlsx", "informe finall.xlsx"]
+    assert NameClusterer().cluster(names) == [sorted(map(Path, names))]
+    assert NameClusterer().cluster(["informe.xlsx", "presupuesto.xlsx"]) == []
+    assert NameClusterer(same_suffix=False).cluster(["a b c.pdf", "A_B_C.txt"]) == [
+        [Path("A_B_C.txt"), Path("a b c.pdf")]
+    ]
+
+
+def test_same_folder(tmp_path: Path):
+    paths = [tmp_path / "a" / "acta.docx", tmp_path / "b" / "acta (1).docx"]
+    assert NameClusterer().cluster(paths) == [sorted(paths)]
+    assert NameClusterer(same_folder=True).cluster(paths) == []
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.7, 0.9])
+def test_index_finds_the_same_pairs_as_comparing_all(threshold: float):
+    random.seed(threshold)
+    words = ["informe", "acta", "sesión", "plan", "anual", "final", "2023", "2024"]
+    names = [
+        " ".join(random.choices(words, k=random.randint(1, 4)))
+        + random.choice(["", " (1)", " - copia"])
+        + ".txt"
+        for _ in range(400)
+    ]
+    stats = OperationStats("cluster")
+    clusters = NameClusterer(threshold, stats=stats).cluster(names)
+
+    keys = default_normalizer().apply_many(Path(n).stem for n in names)
+    grams = [_grams(k) for k in keys]
+    union = _UnionFind(len(names))
+    for i in range(len(names)):
+        for j in range(i):
+            shared = len(grams[i] & grams[j])
+            if keys[i] == keys[j] or shared >= threshold * len(grams[i] | grams[j]):
+                union.union(i, j)
+    expected = defaultdict(list)
+    for i, name in enumerate(names):
+        expected[union.find(i)].append(Path(name))
+    assert clusters == sorted(sorted(c) for c in expected.values() if len(c) > 1)
+    # El índice compara bastante menos que todos los pares de claves
+    assert stats.counters["pairs_compared"] < stats.counters["keys"] ** 2 / 4
+
+
+def test_invalid_threshold():
+    with pytest.raises(ValueError):
+        NameClusterer(threshold=0)
+
+
+def test_clusters_feed_dedupe_and_cleanup(tmp_path: Path):
+    original = tmp_path / "acta.docx"
+    copy = tmp_path / "Copia de acta.docx"
+    other = tmp_path / "minuta.docx"  # mismo contenido, otro nombre
+    lonely = tmp_path / "nota - copia (2).docx"
+    for path in (original, copy, other):
+        path.write_text("igual")
+    lonely.write_text("única")
+
+    clusters = NameClusterer().cluster([original, copy, other, lonely])
+    groups = within_clusters([sorted([original, copy, other])], clusters)
+    assert groups == [sorted([original, copy])]
+
+    to_delete = plan_dedupe(groups, prefer_original)
+    assert to_delete == [copy]
+    assert plan_name_cleanup(
+        [original, copy, other, lonely], to_delete, clean_copy_name
+    ) == {lonely: tmp_path / "nota.docx"}
+    assert clean_copy_name(original) == original
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from file_manager import FileManager, content
+
+
+def test_search_file_mmap_chunks_and_binary(tmp_path: Path, monkeypatch):
+    texto = tmp_path / "texto.log"
+    texto.write_bytes(b"a" * 20000 + b"ERROR 42\n" + b"b" * 20000)
+    binario = tmp_path / "binario.bin"
+    binario.write_bytes(b"\0ERROR 42")
+    spec = (rb"ERROR \d+", 0, False, False)
+
+    assert content.search_file(str(texto), [spec])
+    assert not content.search_file(str(binario), [spec])
+    assert content.search_file(str(binario), [(rb"ERROR \d+", 0, True, False)])
+    assert not content.search_file(str(texto), [spec, (b"ERROR", 0, False, True)])
+    assert not content.search_file(str(tmp_path / "no_existe"), [spec])
+
+    # Bloques chicos: el match cruza el borde entre dos de ellos
+    monkeypatch.setattr(content, "MMAP_LIMIT", 0)
+    monkeypatch.setattr(content, "CHUNK_SIZE", 20004)
+    monkeypatch.setattr(content, "CHUNK_OVERLAP", 16)
+    assert content.search_file(str(texto), [spec])
+
+
+def test_filter_by_content_runs_after_name_filters(tree: Path, monkeypatch):
+    (tree / "notas.txt").write_text("pendiente: TODO revisar")
+    (tree / "reportes" / "enero.xlsx").write_text("todo bien")
+    for i in range(5):
+        (tree / f"log_{i}.txt").write_text("TODO" if i % 2 else "listo")
+
+    def collect(**kwargs) -> list[str]:
+        fm = FileManager()
+        fm.set_search_dir(tree)
+        fm.set_max_depth(2)
+        if kwargs:
+            fm.filter_by_content("todo", **kwargs)
+        fm.filter_by_extension(".txt")
+        return [path.name for path in fm.collect()]
+
+    assert collect(ignore_case=False) == []
+    serial = collect(ignore_case=True)
+    assert sorted(serial) == ["log_1.txt", "log_3.txt", "notas.txt"]
+    assert sorted(collect(ignore_case=True, filter_out=True)) == [
+        "log_0.txt",
+        "log_2.txt",
+        "log_4.txt",
+    ]
+    # Mismo orden que el walk, también con lotes de 2 archivos en el pool de procesos
+    walk_order = [name for name in collect() if name in serial]
+    assert serial == walk_order
+    monkeypatch.setattr(content, "BATCH_SIZE", 2)
+    assert collect(ignore_case=True, workers=2) == walk_order
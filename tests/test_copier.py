@@ -0,0 +1,76 @@
+import os
+import shutil
+from pathlib import Path
+
+from file_manager import FileManager, copier
+from file_manager.copier import BulkCopier
+
+
+def test_copy_files_and_folders(tree: Path, tmp_path_factory):
+    target = tmp_path_factory.mktemp("destino")
+    (tree / "notas.txt").write_text("hola")
+    result = FileManager().copy([tree / "notas.txt", tree / "reportes"], target)
+
+    assert (target / "notas.txt").read_text() == "hola"
+    assert (target / "reportes" / "2024" / "resumen.pdf").is_file()
+    assert len(result.copied) == 4
+    assert result.bytes_copied == 4
+    assert not result.errors
+
+
+def test_copy_into_existing_folder(tree: Path, tmp_path_factory):
+    target = tmp_path_factory.mktemp("destino")
+    fm = FileManager()
+    fm.copy([tree / "reportes"], target)
+    result = fm.copy([tree / "reportes"], target)
+    assert not result.errors
+
+
+def test_errors_do_not_stop_the_batch(tree: Path, tmp_path_factory):
+    target = tmp_path_factory.mktemp("destino")
+    result = BulkCopier().copy([tree / "no_existe.txt", tree / "notas.txt"], target)
+    assert tree / "no_existe.txt" in result.errors
+    assert result.copied == [tree / "notas.txt"]
+
+
+def test_skip_unchanged(tree: Path, tmp_path_factory):
+    target = tmp_path_factory.mktemp("destino")
+    copier = BulkCopier(preserve_metadata=True, skip_unchanged=True)
+    copier.copy([tree / "cuentas_1.xlsx"], target)
+    assert copier.copy([tree / "cuentas_1.xlsx"], target).skipped == [
+        tree / "cuentas_1.xlsx"
+    ]
+
+
+def test_edit_within_the_same_second_is_copied(tmp_path: Path):
+    src = tmp_path / "src" / "a.txt"
+    src.parent.mkdir()
+    src.write_text("uno")
+    os.utime(src, ns=(10**18, 10**18 + 100_000_000))
+    copier = BulkCopier(preserve_metadata=True, skip_unchanged=True)
+    copier.copy([src], tmp_path / "out")
+    # Misma longitud y mismo segundo, 0.5 s después
+    src.write_text("dos")
+    os.utime(src, ns=(10**18, 10**18 + 600_000_000))
+    assert copier.copy([src], tmp_path / "out").copied == [src]
+    assert (tmp_path / "out" / "a.txt").read_text() == "dos"
+    window = BulkCopier(preserve_metadata=True, skip_unchanged=True, modify_window=1)
+    os.utime(src, ns=(10**18, 10**18 + 900_000_000))
+    assert window.copy([src], tmp_path / "out").skipped == [src]
+
+
+def test_copy_onto_itself_is_an_error(tree: Path):
+    (tree / "notas.txt").write_text("no me borres")
+    result = BulkCopier().copy([tree / "notas.txt"], tree)
+    assert isinstance(result.errors[tree / "notas.txt"], shutil.SameFileError)
+    assert result.copied == []
+    assert (tree / "notas.txt").read_text() == "no me borres"
+
+
+def test_read_write_fallback(tmp_path: Path, monkeypatch):
+    data = os.urandom(300_000)
+    (tmp_path / "src.bin").write_bytes(data)
+    monkeypatch.setattr(copier, "KERNEL_COPY", [])
+    result = BulkCopier(reflink=False).copy([tmp_path / "src.bin"], tmp_path / "out")
+    assert result.bytes_copied == len(data)
+    assert (tmp_path / "out" / "src.bin").read_bytes() == data
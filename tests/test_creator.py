@@ -1,7 +1,9 @@
 from pathlib import Path
-from pprint import pprint
+
+import pytest
 
 from file_manager import FileManager
+from file_manager.file_creator import FileCreator
 
 TEST_DIR = Path(__file__).parent / "test_folders"
 TEST_DIR.mkdir(exist_ok=True)
@@ -19,6 +21,38 @@ def test_create_files():
     fm.create_files(files, target_dir=TEST_DIR)
 
 
+def test_create_files_in_bulk(tmp_path: Path):
+    fm = FileManager()
+    names = FileCreator.expand(
+        "{}/cuentas_{}.xlsx", [(2024, n) for n in range(1, 2501)]
+    )
+    created = fm.create_files(names, target_dir=tmp_path, size=128)
+    assert len(created) == 2500
+    assert created[0] == tmp_path / "2024" / "cuentas_1.xlsx"
+    assert all(p.stat().st_size == 128 for p in created[:10])
+
+
+def test_create_files_from_template(tmp_path: Path):
+    template = tmp_path / "plantilla.txt"
+    template.write_text("hola")
+    created = FileCreator().create_files(
+        [Path("/otra/carpeta/a.txt"), "b.txt"], tmp_path / "out", template_file=template
+    )
+    assert [p.read_text() for p in created] == ["hola", "hola"]
+    assert created[0] == tmp_path / "out" / "a.txt"
+
+
+@pytest.mark.parametrize(
+    "name", ["/tmp/fuera.txt", "../fuera.txt", "a/../../fuera.txt"]
+)
+def test_create_files_stays_in_target_dir(tmp_path: Path, name: str):
+    target = tmp_path / "out"
+    with pytest.raises(ValueError):
+        FileCreator().create_files(["dentro.txt", name], target)
+    assert not (tmp_path / "fuera.txt").exists()
+    assert not target.exists()
+
+
 # def test_touch():
 #     fm = FileManager()
 #     fm.touch("prueba.txt")
@@ -0,0 +1,91 @@
+import os
+from pathlib import Path
+
+from file_manager.dedupe import (
+    DuplicateFinder,
+    clean_numbered_name,
+    plan_dedupe,
+    plan_name_cleanup,
+)
+from file_manager.stats import OperationStats
+
+
+def write(path: Path, content: bytes) -> Path:
+    path.write_bytes(content)
+    return path
+
+
+def test_groups_by_content_not_name(tmp_path: Path):
+    a = write(tmp_path / "informe.xlsx", b"abc" * 1000)
+    b = write(tmp_path / "copia de informe.xlsx", b"abc" * 1000)
+    c = write(tmp_path / "informe (1).xlsx", b"abd" * 1000)  # same size, other content
+    write(tmp_path / "unico.txt", b"x")
+
+    assert DuplicateFinder().find([a, b, c, tmp_path / "unico.txt"]) == [sorted([a, b])]
+
+
+def test_large_files_differing_in_the_middle(tmp_path: Path):
+    finder = DuplicateFinder(block_size=16, chunk_size=8)
+    base = b"0" * 100
+    a = write(tmp_path / "a.bin", base)
+    b = write(tmp_path / "b.bin", base)
+    c = write(tmp_path / "c.bin", base[:50] + b"1" + base[51:])
+    assert finder.find([a, b, c]) == [[a, b]]
+
+
+def test_unique_sizes_are_not_read(tmp_path: Path, monkeypatch):
+    def fail(path: Path) -> bytes:
+        raise AssertionError(f"{path} should not be read")
+
+    finder = DuplicateFinder()
+    monkeypatch.setattr(finder, "_full_hash", fail)
+    monkeypatch.setattr(finder, "_partial_hash", fail)
+    paths = [write(tmp_path / f"{i}.txt", b"x" * i) for i in range(1, 5)]
+    assert finder.find(paths) == []
+
+
+def test_missing_files_are_reported(tmp_path: Path):
+    finder = DuplicateFinder()
+    assert finder.find([tmp_path / "no_existe.txt"]) == []
+    assert tmp_path / "no_existe.txt" in finder.errors
+
+
+def test_links_are_not_duplicates(tmp_path: Path):
+    target = write(tmp_path / "informe_largo.txt", b"datos" * 100)
+    (tmp_path / "a.txt").symlink_to(target)
+    os.link(target, tmp_path / "b.txt")
+    copy = write(tmp_path / "c.txt", b"datos" * 100)
+
+    paths = sorted(tmp_path.iterdir())
+    assert DuplicateFinder().find(paths) == [[tmp_path / "b.txt", copy]]
+    # Sin la copia, el hardlink y el symlink no son duplicados del original
+    copy.unlink()
+    assert DuplicateFinder().find(sorted(tmp_path.iterdir())) == []
+
+
+def test_plans(tmp_path: Path):
+    original = tmp_path / "acta.docx"
+    copy = tmp_path / "acta (1).docx"
+    lonely = tmp_path / "nota (2).docx"
+    for p in (original, copy, lonely):
+        p.touch()
+
+    assert plan_dedupe([[copy, original]]) == [copy]
+    assert plan_name_cleanup([original, copy, lonely], deleted=[copy]) == {
+        lonely: tmp_path / "nota.docx"
+    }
+    assert clean_numbered_name(tmp_path / "x (12).pdf") == tmp_path / "x.pdf"
+
+
+def test_stats_count_hashed_bytes(tmp_path: Path):
+    stats = OperationStats("find_duplicates")
+    finder = DuplicateFinder(block_size=16, stats=stats)
+    a = write(tmp_path / "a.bin", b"0" * 100)
+    b = write(tmp_path / "b.bin", b"0" * 100)
+    write(tmp_path / "c.bin", b"1")
+
+    assert finder.find(tmp_path.iterdir()) == [[a, b]]
+    assert stats["stat_calls"] == 3
+    # 2 blocks of 16 bytes in the partial pass, then the whole files
+    assert stats["bytes_hashed"] == 2 * 32 + 2 * 100
+    assert set(stats.phases) == {"size", "partial_hash", "full_hash"}
@@ -0,0 +1,93 @@
+import os
+import threading
+from pathlib import Path
+
+from file_manager import FileManager, deleter
+from file_manager.deleter import BulkDeleter, empty_trash, restore_trash
+
+
+def make_tree(base: Path) -> Path:
+    for i in range(3):
+        folder = base / "cache" / f"nivel_{i}" / "sub"
+        folder.mkdir(parents=True)
+        for j in range(10):
+            (folder / f"{j}.tmp").write_bytes(b"x")
+    (base / "cache" / "suelto.txt").write_text("x")
+    os.symlink(base / "cache", base / "cache" / "bucle")
+    return base / "cache"
+
+
+def test_delete_removes_trees_bottom_up(tmp_path: Path, monkeypatch):
+    # Lotes chicos: los archivos de una carpeta se reparten entre los threads
+    monkeypatch.setattr(deleter, "UNLINK_BATCH", 3)
+    cache = make_tree(tmp_path)
+    otro = tmp_path / "otro.txt"
+    otro.write_text("x")
+
+    fm = FileManager()
+    fm.set_instrumentation(hooks=[])
+    result = fm.delete([cache, otro, tmp_path / "no_existe"], workers=4)
+    assert not result.errors
+    assert set(result.deleted) == {cache, otro, tmp_path / "no_existe"}
+    assert result.files_removed == 33  # 30 .tmp, suelto.txt, el link y otro.txt
+    assert result.dirs_removed == 7
+    assert list(tmp_path.iterdir()) == []
+    assert fm.last_stats["files_removed"] == 33
+
+
+def test_delete_reports_errors_per_item(tmp_path: Path, monkeypatch):
+    cache = make_tree(tmp_path)
+    unlink = os.unlink
+
+    def flaky_unlink(path, *, dir_fd=None):
+        if path == "5.tmp":
+            raise PermissionError(13, "Permission denied")
+        unlink(path, dir_fd=dir_fd)
+
+    monkeypatch.setattr(os, "unlink", flaky_unlink)
+    result = BulkDeleter(workers=2).delete([cache])
+    failed = {cache / f"nivel_{i}" / "sub" / "5.tmp" for i in range(3)}
+    assert set(result.errors) == failed
+    assert result.deleted == [] and result.files_removed == 29
+    # Solo quedan las carpetas de lo que falló
+    assert {p for p in cache.rglob("*")} == failed | {p.parent for p in failed} | {
+        p.parent.parent for p in failed
+    }
+
+
+def test_cancel_skips_what_did_not_start(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(deleter, "UNLINK_BATCH", 3)
+    cache = make_tree(tmp_path)
+    cancel = threading.Event()
+    bulk = BulkDeleter(workers=1, cancel=cancel)
+    unlink = bulk._unlink
+
+    def unlink_once(folder, names):
+        unlink(folder, names)
+        cancel.set()
+
+    monkeypatch.setattr(bulk, "_unlink", unlink_once)
+    result = bulk.delete([cache])
+    assert result.cancelled and not result.errors
+    # Solo se borró el primer lote; las carpetas quedan
+    assert 0 < result.files_removed <= 3
+    assert result.deleted == [] and result.dirs_removed == 0
+    assert (cache / "nivel_0" / "sub").exists()
+
+
+def test_trash_can_be_restored_or_emptied(tmp_path: Path):
+    cache = make_tree(tmp_path)
+    nota = tmp_path / "nota.txt"
+    nota.write_text("hola")
+    trash = tmp_path / ".papelera"
+
+    result = BulkDeleter(trash_dir=trash).delete([cache, nota])
+    assert not cache.exists() and not nota.exists()
+    assert result.journal == trash / "journal.jsonl"
+
+    assert restore_trash(trash, [nota]) == [nota]
+    assert nota.read_text() == "hola"
+    result = empty_trash(trash)
+    assert result.dirs_removed == 7 and not result.errors
+    assert list(trash.iterdir()) == [trash / "journal.jsonl"]
+    assert restore_trash(trash) == []
@@ -1,3 +1,113 @@
-
 # You should create a conftest that creates a series of folders and files (without content)
-# These will serve to test the different functionalities of the FileManager class
\ No newline at end of file
+# These will serve to test the different functionalities of the FileManager class
+
+from pathlib import Path
+
+from file_manager import FileManager
+
+
+def make_fm(search_dir: Path, max_depth: int = 2) -> FileManager:
+    fm = FileManager()
+    fm.set_search_dir(search_dir)
+    fm.set_max_depth(max_depth)
+    return fm
+
+
+def test_collect_applies_conditions(tree: Path):
+    fm = make_fm(tree)
+    found = fm.filter_by_extension(".xlsx").filter_by_regex_search(r"\(\d\)$").collect()
+    assert found == [tree / "reportes" / "febrero (1).xlsx"]
+    assert fm.conditions == []
+
+
+def test_iter_collect_is_lazy(tree: Path):
+    fm = make_fm(tree)
+    it = fm.filter_by_extension(".xlsx").iter_collect()
+    # The conditions are taken when iter_collect is called
+    assert fm.conditions == []
+    assert next(it).suffix == ".xlsx"
+
+
+def test_first_and_exists(tree: Path):
+    fm = make_fm(tree)
+    assert len(fm.filter_by_extension(".xlsx").first(2)) == 2
+    assert fm.filter_by_extension(".pdf").exists()
+    assert not fm.filter_by_extension(".docx").exists()
+
+
+def test_flatten_resolves_collisions(tree: Path):
+    (tree / "reportes" / "notas.txt").write_text("reportes")
+    (tree / "reportes" / "2024" / "notas.txt").write_text("2024")
+    (tree / "reportes - notas.txt").write_text("base")
+    (tree / "otra" / "reportes").mkdir(parents=True)
+    (tree / "otra" / "reportes" / "notas.txt").write_text("otra/reportes")
+
+    result = make_fm(tree).flatten(pattern="*.txt")
+    assert not result.errors
+    flattened = {p.name: p.read_text() for p in tree.glob("*.txt")}
+    assert flattened.pop("notas.txt") == ""
+    assert flattened.pop("2024 - notas.txt") == "2024"
+    assert flattened.pop("reportes - notas.txt") == "base"
+    # Las dos carpetas "reportes" reciben un contador
+    assert set(flattened) == {"reportes - 1 - notas.txt", "reportes - 2 - notas.txt"}
+    assert sorted(flattened.values()) == ["otra/reportes", "reportes"]
+    # Los originales siguen en su lugar
+    assert (tree / "reportes" / "notas.txt").exists()
+
+
+def test_flatten_hardlink_and_move(tree: Path):
+    fm = make_fm(tree)
+    fm.flatten(pattern="*.pdf", mode="hardlink")
+    assert (tree / "resumen.pdf").stat().st_ino == (
+        tree / "reportes" / "2024" / "resumen.pdf"
+    ).stat().st_ino
+
+    fm.flatten(pattern="enero.xlsx", mode="move")
+    assert (tree / "enero.xlsx").exists()
+    assert not (tree / "reportes" / "enero.xlsx").exists()
+
+
+def test_instrumentation_reports_stats(tree: Path):
+    reported = []
+    fm = make_fm(tree)
+    fm.set_instrumentation(hooks=[reported.append])
+    found = fm.filter_by_extension(".xlsx").filter_by_regex_search(r"\(\d\)$").collect()
+
+    stats = fm.last_stats
+    assert reported == [stats]
+    assert stats.operation == "collect"
+    assert stats["dirs_visited"] == 4
+    assert stats["matches"] == len(found) == 1
+    # notas.txt and resumen.pdf by the extension, enero.xlsx and the 2 cuentas by the regex
+    assert sum(stats.rejected.values()) == 5
+    assert stats.rejected["ExtensionFilter('.xlsx')"] == 2
+    assert set(stats.phases) == {"walk", "filter"}
+
+
+def test_instrumentation_logs_by_default(tree: Path, caplog):
+    fm = make_fm(tree)
+    fm.set_instrumentation()
+    with caplog.at_level("INFO", logger="file_manager"):
+        fm.find_duplicates(fm.collect())
+    assert [r.stats["operation"] for r in caplog.records] == [
+        "collect",
+        "find_duplicates",
+    ]
+
+
+def test_instrumentation_is_off_by_default(tree: Path):
+    fm = make_fm(tree)
+    fm.collect()
+    assert fm.last_stats is None
+
+
+def test_top_k_and_sort_by(tree: Path):
+    for i, name in enumerate(["notas.txt", "cuentas_1.xlsx", "cuentas_2.xlsx"]):
+        (tree / name).write_bytes(b"x" * 10 ** (i + 1))
+    fm = make_fm(tree)
+    assert fm.top_k(2) == [tree / "cuentas_2.xlsx", tree / "cuentas_1.xlsx"]
+    assert fm.filter_by_regex_match("cuentas").top_k(1, largest=False) == [
+        tree / "cuentas_1.xlsx"
+    ]
+    names = [p.name for p in fm.filter_by_type("file").sort_by("size", reverse=True)]
+    assert names[:3] == ["cuentas_2.xlsx", "cuentas_1.xlsx", "notas.txt"]
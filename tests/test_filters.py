@@ -0,0 +1,106 @@
+import os
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from file_manager.filters import (
+    ExtensionFilter,
+    NamesFilter,
+    RegexFilter,
+    SizeFilter,
+    TimeFilter,
+    TypeFilter,
+    _merge_patterns,
+    compile_filters,
+    split_name,
+)
+
+NAMES = [
+    "cuentas_1.xlsx",
+    "cuentas (1).xlsx",
+    "Fracaso escolar.xlsx",
+    "notas.txt",
+    ".bashrc",
+    "archivo.",
+    "datos.tar.gz",
+    "sin_extension",
+]
+
+
+class Entry:
+    def __init__(self, name: str):
+        self.name = name
+        self.path = f"/tmp/{name}"
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_split_name_matches_pathlib(name: str):
+    path = Path(name)
+    assert split_name(name) == (path.stem, path.suffix)
+
+
+@pytest.mark.parametrize(
+    "conditions",
+    [
+        [ExtensionFilter(".xlsx")],
+        [ExtensionFilter(".xlsx"), ExtensionFilter(".txt")],
+        [
+            ExtensionFilter(".xlsx", filter_out=True),
+            ExtensionFilter(".txt", filter_out=True),
+        ],
+        [ExtensionFilter(".xlsx"), RegexFilter(r"^(?=.*Fracaso)")],
+        [
+            RegexFilter(r"\(\d\)$", search=True, filter_out=True),
+            RegexFilter("cu", filter_out=True),
+        ],
+        [
+            RegexFilter("(a)\\1", search=True, filter_out=True),
+            RegexFilter("(?i)NOTAS", filter_out=True),
+        ],
+        [NamesFilter(["notas", "cuentas_1"]), NamesFilter(["notas"], filter_out=True)],
+        [lambda p: p if p.suffix == ".gz" else None],
+    ],
+)
+def test_compiled_predicate_matches_chain(conditions):
+    predicate = compile_filters(conditions)
+    for name in NAMES:
+        path = Path(f"/tmp/{name}")
+        expected = all(cond(path) is not None for cond in conditions)
+        assert predicate(Entry(name)) == expected, name
+
+
+def test_excluding_regexes_are_merged():
+    merged = _merge_patterns(
+        [RegexFilter(r"\(\d\)$", search=True), RegexFilter("copia", search=True)]
+    )
+    assert len(merged) == 1
+    assert merged[0].search("informe (2)")
+    # Con grupos se mantienen separados para no romper las backreferences
+    assert len(_merge_patterns([RegexFilter(r"(a)\1"), RegexFilter("b")])) == 2
+
+
+def test_stat_filters_read_the_entry(tmp_path: Path):
+    (tmp_path / "grande.bin").write_bytes(b"x" * 2000)
+    (tmp_path / "chico.bin").write_bytes(b"x" * 10)
+    viejo = tmp_path / "viejo.bin"
+    viejo.write_bytes(b"x" * 10)
+    os.utime(viejo, (0, 0))
+    (tmp_path / "carpeta").mkdir()
+    entries = {e.name: e for e in os.scandir(tmp_path)}
+
+    def passing(*conditions) -> set[str]:
+        predicate = compile_filters(conditions)
+        return {name for name, e in entries.items() if predicate(e)}
+
+    files = TypeFilter("file")
+    assert passing(files, SizeFilter(min_size=1000)) == {"grande.bin"}
+    assert passing(files, SizeFilter(max_size=1000)) == {"chico.bin", "viejo.bin"}
+    assert passing(TimeFilter("mtime", before=timedelta(days=1))) == {"viejo.bin"}
+    assert passing(files, TimeFilter("mtime", before=60, filter_out=True)) == {
+        "grande.bin",
+        "chico.bin",
+    }
+    assert passing(TypeFilter("dir")) == {"carpeta"}
+    # The legacy interface (called with a Path) still works
+    assert SizeFilter(min_size=1000)(tmp_path / "chico.bin") is None
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import pytest
+
+from file_manager import FileManager
+from file_manager.ignore import IgnoreRules, parse_ignore_lines
+
+
+@pytest.mark.parametrize(
+    "lines, path, is_dir, ignored",
+    [
+        (["*.log"], "a/b/error.log", False, True),
+        (["build/"], "src/build", True, True),
+        (["build/"], "src/build", False, None),
+        (["/build"], "src/build", True, None),
+        (["doc/*.txt"], "doc/a.txt", False, True),
+        (["doc/*.txt"], "doc/sub/a.txt", False, None),
+        (["**/logs"], "x/y/logs", True, True),
+        (["a/**/b"], "a/b", True, True),
+        (["a/**/b"], "a/x/y/b", True, True),
+        (["out/**"], "out/x/y", False, True),
+        (["*.log", "!keep.log"], "keep.log", False, False),
+        (["file[0-9].txt"], "file7.txt", False, True),
+        (["file[!0-9].txt"], "file7.txt", False, None),
+        (["# comentario", "", r"\#hash"], "#hash", False, True),
+    ],
+)
+def test_gitignore_semantics(lines, path, is_dir, ignored):
+    assert IgnoreRules(parse_ignore_lines(lines)).match(path, is_dir) is ignored
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """
+    tmp_path/
+        .gitignore (*.pyc, build/)
+        main.py, main.pyc
+        build/ salida.txt
+        node_modules/ paquete/ index.js
+        src/
+            .gitignore (!especial.pyc)
+            modulo.py, modulo.pyc, especial.pyc
+    """
+    (tmp_path / ".gitignore").write_text("*.pyc\nbuild/\n")
+    for rel in (
+        "main.py",
+        "main.pyc",
+        "build/salida.txt",
+        "node_modules/paquete/index.js",
+        "src/modulo.py",
+        "src/modulo.pyc",
+        "src/especial.pyc",
+    ):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).touch()
+    (tmp_path / "src" / ".gitignore").write_text("!especial.pyc\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_ignored_subtrees_are_not_listed(repo: Path, workers: int):
+    fm = FileManager(workers=workers)
+    fm.set_search_dir(repo)
+    fm.set_max_depth(5)
+    fm.set_instrumentation(hooks=[])
+    fm.set_ignore([".gitignore"], ignore_files=[".gitignore"])
+    fm.prune_dirs("node_modules")
+
+    found = {p.relative_to(repo).as_posix() for p in fm.collect()}
+    assert found == {"main.py", "src/modulo.py", "src/especial.pyc"}
+    # Solo se listaron la raíz y src
+    assert fm.last_stats["dirs_visited"] == 2
+
+
+def test_dir_filter_callable_and_index(repo: Path, tmp_path_factory):
+    fm = FileManager()
+    fm.set_search_dir(repo)
+    fm.set_max_depth(5)
+    fm.set_index(tmp_path_factory.mktemp("indice") / "index.db")
+    fm.prune_dirs(lambda entry: entry.name.startswith(("b", "n")))
+    found = {
+        p.relative_to(repo).as_posix() for p in fm.filter_by_extension(".py").collect()
+    }
+    assert found == {"main.py", "src/modulo.py"}
@@ -0,0 +1,96 @@
+import os
+from pathlib import Path
+
+from file_manager import FileManager
+from file_manager.ignore import Pruner
+from file_manager.index import DirectoryIndex
+from file_manager.walker import TreeWalker
+
+
+def test_index_walk_matches_walker(tree: Path, tmp_path_factory):
+    index = DirectoryIndex(tmp_path_factory.mktemp("cache") / "index.sqlite")
+    expected = {e.path for e in TreeWalker(max_depth=2).walk(tree)}
+    assert {e.path for e in index.walk(tree, max_depth=2)} == expected
+    # Second walk is served from the index
+    assert {e.path for e in index.walk(tree, max_depth=2)} == expected
+
+
+def test_index_only_relists_changed_dirs(tree: Path, tmp_path_factory):
+    index = DirectoryIndex(tmp_path_factory.mktemp("cache") / "index.sqlite")
+    list(index.walk(tree, max_depth=2))
+
+    rescanned = []
+    rescan = index._rescan
+    index._rescan = lambda d, m: rescanned.append(d) or rescan(d, m)
+
+    (tree / "reportes" / "marzo.xlsx").touch()
+    # Forzar un mtime distinto aunque el reloj del fs sea poco preciso
+    st = os.stat(tree / "reportes")
+    os.utime(tree / "reportes", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    found = {e.name for e in index.walk(tree, max_depth=2)}
+    assert "marzo.xlsx" in found
+    assert rescanned == [str(tree / "reportes")]
+
+
+def test_index_forgets_deleted_dirs(tree: Path, tmp_path_factory):
+    index = DirectoryIndex(tmp_path_factory.mktemp("cache") / "index.sqlite")
+    list(index.walk(tree, max_depth=2))
+    (tree / "reportes" / "2024" / "resumen.pdf").unlink()
+    (tree / "reportes" / "2024").rmdir()
+    list(index.walk(tree, max_depth=2))
+    assert index.query(tree, suffixes=[".pdf"]) == []
+
+
+def test_index_query(tree: Path, tmp_path_factory):
+    index = DirectoryIndex(tmp_path_factory.mktemp("cache") / "index.sqlite")
+    list(index.walk(tree, max_depth=2))
+    assert set(index.query(tree, suffixes=[".xlsx"], regex=r"\(\d\)$")) == {
+        tree / "reportes" / "febrero (1).xlsx"
+    }
+
+
+def test_file_manager_with_index(tree: Path, tmp_path_factory):
+    fm = FileManager()
+    fm.set_search_dir(tree)
+    fm.set_max_depth(2)
+    fm.set_index(tmp_path_factory.mktemp("cache") / "index.sqlite")
+    first = fm.filter_by_extension(".xlsx").collect()
+    second = fm.filter_by_extension(".xlsx").collect()
+    assert len(first) == 4
+    assert first == second
+
+
+def test_index_filters_suffixes_in_sql(tree: Path, tmp_path_factory):
+    index = DirectoryIndex(tmp_path_factory.mktemp("cache") / "index.sqlite")
+    (tree / ".gitignore").write_text("enero.xlsx\n")
+    pruner = Pruner(ignore_files=[".gitignore"])
+    list(index.walk(tree, max_depth=2, pruner=pruner))
+
+    # Desde el índice solo se leen las carpetas, los .xlsx y el .gitignore
+    found = {
+        e.name for e in index.walk(tree, max_depth=2, pruner=pruner, suffixes={".xlsx"})
+    }
+    assert found == {
+        ".gitignore",
+        "cuentas_1.xlsx",
+        "cuentas_2.xlsx",
+        "febrero (1).xlsx",
+    }
+    found = {e.name for e in index.walk(tree, max_depth=2, exclude_suffixes={".xlsx"})}
+    assert found == {".gitignore", "notas.txt", "resumen.pdf"}
+
+
+def test_index_sizes_are_read_again(tree: Path, tmp_path_factory):
+    fm = FileManager()
+    fm.set_search_dir(tree)
+    fm.set_max_depth(2)
+    fm.set_index(tmp_path_factory.mktemp("cache") / "index.sqlite")
+    assert fm.filter_by_size(min_size=1).collect() == []
+
+    # Cambiar el contenido no cambia el mtime de la carpeta: no se vuelve a listar
+    st = os.stat(tree)
+    (tree / "notas.txt").write_text("ya no está vacío")
+    os.utime(tree, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert fm.filter_by_size(min_size=1).collect() == [tree / "notas.txt"]
+    assert fm.index.query(tree, min_size=1) == [tree / "notas.txt"]
@@ -1,7 +1,80 @@
 from pathlib import Path
 from pprint import pprint
 
+import pytest
+
 from file_manager import ESNameBuilder
 
-nb = ESNameBuilder()
-nb.
\ No newline at end of file
+NAMES = [
+    "  INFORME_de-LA  sesion  ",
+    "nota de actualidad_2024",
+    "ACTA--final__v2",
+    "",
+]
+
+
+def test_str_methods_are_added_to_the_pipeline():
+    nb = ESNameBuilder().lower().strip()
+    assert nb.apply("  HOLA ") == "hola"
+
+
+@pytest.mark.parametrize(
+    "nb",
+    [
+        ESNameBuilder().lower().lower().strip().smart_title(),
+        ESNameBuilder().replace("_", " ").replace("-", " ").normalize_spaces_lower(),
+        # El segundo replace busca lo que genera el primero
+        ESNameBuilder().replace("_", "-").replace("-", " ").expandtabs(tabsize=2),
+        ESNameBuilder().replace("__", "_").center(30, "*").keep_after("-"),
+        ESNameBuilder().add_dash_after_keywords().filter("ACTA", filter_out=True),
+    ],
+)
+def test_compiled_pipeline_matches_steps(nb: ESNameBuilder):
+    for name in NAMES:
+        assert nb.apply(name) == nb.apply_steps(name), name
+    assert nb.apply_many(NAMES * 2) == [nb.apply_steps(n) for n in NAMES * 2]
+
+
+def test_adding_steps_recompiles():
+    nb = ESNameBuilder().upper()
+    assert nb.apply("a") == "A"
+    nb.replace("A", "B")
+    assert nb.apply("a") == "B"
+
+
+def test_smart_title_exceptions():
+    nb = ESNameBuilder().smart_title()
+    assert nb.apply("informe DE la SESION") == "Informe de la Sesion"
+    assert nb.apply("de acuerdo") == "De Acuerdo"
+
+
+def test_build_and_build_many(tmp_path: Path):
+    (tmp_path / "informe anual.docx").touch()
+    (tmp_path / "carpeta.v2").mkdir()
+    nb = ESNameBuilder(tmp_path / "informe anual.docx").smart_title()
+    assert nb.build() == "Informe Anual"
+    assert nb.build_many([tmp_path / "carpeta.v2"]) == ["Carpeta.v2"]
+    with pytest.raises(ValueError):
+        ESNameBuilder().build()
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Informe (10)", "informe"),
+        ("Copia de Sesión - copia (2)", "sesion"),
+        ("acta_copy", "acta"),
+        ("Copy (2) of ACTA", "acta"),
+        ("Copia de seguridad", "copia de seguridad"),
+        ("telecopia", "telecopia"),
+        ("(1)", "(1)"),
+    ],
+)
+def test_remove_copy_markers_and_accents(name: str, expected: str):
+    nb = ESNameBuilder().remove_copy_markers().strip_accents().lower()
+    assert nb.apply(name) == expected
+
+
+if __name__ == "__main__":
+    nb = ESNameBuilder().smart_title()
+    pprint(nb.apply_many(NAMES))
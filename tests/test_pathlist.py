@@ -0,0 +1,58 @@
+import os
+from pathlib import Path
+
+from file_manager import FileManager
+from file_manager.filters import ExtensionFilter, SizeFilter, TimeFilter
+from file_manager.pathlist import PathList
+
+
+def test_collect_compact_matches_collect(tree: Path):
+    (tree / "reportes" / "ñandú.txt").write_text("hola")
+    fm = FileManager()
+    fm.set_search_dir(tree)
+    fm.set_max_depth(2)
+    expected = fm.collect()
+    compact = fm.collect_compact(with_stat=True)
+
+    assert list(compact) == expected
+    assert len(compact) == len(expected)
+    assert compact[-1] == expected[-1]
+    assert list(compact[1:4]) == expected[1:4]
+    assert list(compact.strings()) == [str(p) for p in expected]
+    assert tree / "reportes" / "ñandú.txt" in compact
+    i = expected.index(tree / "reportes" / "ñandú.txt")
+    assert compact.sizes[i] == 4
+
+
+def test_filter_keeps_stats_and_shares_names(tree: Path):
+    paths = [tree / "a" / "__init__.py", tree / "b" / "__init__.py", tree / "c.txt"]
+    compact = PathList.from_paths(paths)
+    assert list(compact) == paths
+    # Los nombres repetidos se guardan una vez
+    assert compact._starts[0] == compact._starts[1]
+    assert list(compact.filter(ExtensionFilter(".py"))) == paths[:2]
+
+    fm = FileManager()
+    fm.set_search_dir(tree)
+    fm.set_max_depth(2)
+    (tree / "notas.txt").write_text("x" * 10)
+    found = fm.collect_compact(with_stat=True).filter(SizeFilter(min_size=1))
+    assert list(found) == [tree / "notas.txt"]
+    assert list(found.sizes) == [10]
+
+
+def test_filter_with_stat_uses_stored_columns(tree: Path, monkeypatch):
+    fm = FileManager()
+    fm.set_search_dir(tree)
+    fm.set_max_depth(2)
+    (tree / "notas.txt").write_text("x" * 10)
+    compact = fm.collect_compact(with_stat=True)
+    i = list(compact).index(tree / "notas.txt")
+    mtime = compact.mtimes[i]
+    # Los archivos cambian después del recorrido: el filtro ve lo guardado
+    (tree / "notas.txt").write_text("")
+    calls = []
+    monkeypatch.setattr(os, "stat", lambda *a, **k: calls.append(a))
+    found = compact.filter(SizeFilter(min_size=1), TimeFilter(after=mtime))
+    assert list(found) == [tree / "notas.txt"]
+    assert calls == []
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pytest
+
+from file_manager import ESNameBuilder, FileManager
+from file_manager.renamer import (
+    RenameJournal,
+    plan_renames,
+    resume_renames,
+    rollback_renames,
+)
+
+
+def make(folder: Path, *names: str) -> list[Path]:
+    paths = [folder / name for name in names]
+    for path, name in zip(paths, names):
+        path.write_text(name)
+    return paths
+
+
+def test_rename_with_builder(tmp_path: Path):
+    make(tmp_path, "acta de la sesion.docx", "NOTA.txt")
+    (tmp_path / "informe anual").mkdir()
+    fm = FileManager()
+    fm.rename(list(tmp_path.iterdir()), ESNameBuilder().smart_title())
+    assert {p.name for p in tmp_path.iterdir()} == {
+        "Acta de la Sesion.docx",
+        "Nota.txt",
+        "Informe Anual",
+    }
+
+
+def test_swap_cycle(tmp_path: Path):
+    a, b, c = make(tmp_path, "a.txt", "b.txt", "c.txt")
+    plan = plan_renames(
+        [a, b, c], {"a.txt": "b.txt", "b.txt": "c.txt", "c.txt": "a.txt"}
+    )
+    assert not plan.collisions
+    assert len(plan.cycles) == 1
+    plan.execute()
+    assert (tmp_path / "b.txt").read_text() == "a.txt"
+    assert (tmp_path / "c.txt").read_text() == "b.txt"
+    assert (tmp_path / "a.txt").read_text() == "c.txt"
+
+
+def test_chain_is_ordered(tmp_path: Path):
+    a, b = make(tmp_path, "a.txt", "b.txt")
+    plan_renames([a, b], {"a.txt": "b.txt", "b.txt": "c.txt"}).execute()
+    assert (tmp_path / "b.txt").read_text() == "a.txt"
+    assert (tmp_path / "c.txt").read_text() == "b.txt"
+
+
+def test_collisions(tmp_path: Path):
+    a, b, _ = make(tmp_path, "a.txt", "b.txt", "ocupado.txt")
+    plan = plan_renames([a, b], {"a.txt": "x.txt", "b.txt": "x.txt"})
+    assert plan.collisions == {tmp_path / "x.txt": [a, b]}
+
+    plan = plan_renames([a], {"a.txt": "ocupado.txt"})
+    assert tmp_path / "ocupado.txt" in plan.collisions
+    assert "!" in plan.diff()
+    with pytest.raises(FileExistsError):
+        plan.execute()
+
+
+def test_resume_and_rollback(tmp_path: Path):
+    a, b = make(tmp_path, "a.txt", "b.txt")
+    plan = plan_renames([a, b], {"a.txt": "b.txt", "b.txt": "a.txt"})
+    journal_path = tmp_path / "rename.journal"
+
+    # Simula una interrupción después del primer paso
+    RenameJournal.create(plan.steps, journal_path)
+    src, dst = plan.steps[0]
+    src.rename(dst)
+
+    rollback_renames(journal_path)
+    assert a.read_text() == "a.txt" and b.read_text() == "b.txt"
+    assert not journal_path.exists()
+
+    RenameJournal.create(plan.steps, journal_path)
+    src, dst = plan.steps[0]
+    src.rename(dst)
+    resume_renames(journal_path)
+    assert a.read_text() == "b.txt" and b.read_text() == "a.txt"
+
+
+def test_target_created_after_the_plan(tmp_path: Path):
+    a, b = make(tmp_path, "a.txt", "b.txt")
+    plan = plan_renames([a, b], {"a.txt": "x.txt", "b.txt": "y.txt"})
+    (tmp_path / "y.txt").write_text("nuevo")
+    journal_path = tmp_path / "rename.journal"
+    with pytest.raises(FileExistsError) as info:
+        plan.execute(journal_path)
+    assert (tmp_path / "y.txt").read_text() == "nuevo"
+    assert info.value.journal_path == journal_path
+    assert str(journal_path) in info.value.__notes__[0]
+
+    rollback_renames(journal_path)
+    assert a.read_text() == "a.txt" and b.read_text() == "b.txt"
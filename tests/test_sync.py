@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+
+from file_manager import FileManager
+from file_manager.sync import MANIFEST_NAME, TreeSync
+
+
+def make_fm(search_dir: Path) -> FileManager:
+    fm = FileManager()
+    fm.set_search_dir(search_dir)
+    fm.set_instrumentation(hooks=[])
+    return fm
+
+
+def test_sync_copies_only_changes(tree: Path, tmp_path_factory):
+    target = tmp_path_factory.mktemp("espejo")
+    (tree / "notas.txt").write_text("v1")
+
+    first = make_fm(tree).sync(target)
+    assert len(first.copy.copied) == 6 and not first.errors
+    assert (target / "reportes" / "2024" / "resumen.pdf").exists()
+    assert (target / "vacio").is_dir()
+    assert (target / MANIFEST_NAME).exists()
+
+    (tree / "notas.txt").write_text("v2")
+    (tree / "reportes" / "marzo.xlsx").write_text("nuevo")
+    (target / "sobra.txt").write_text("x")
+    fm = make_fm(tree)
+    second = fm.sync(target, delete_extras=True)
+    assert sorted(second.copy.copied) == [
+        tree / "notas.txt",
+        tree / "reportes" / "marzo.xlsx",
+    ]
+    assert second.plan.unchanged == 5
+    assert second.delete.deleted == [target / "sobra.txt"]
+    assert (target / "notas.txt").read_text() == "v2"
+    # Mismo tamaño que antes: se comparó el contenido de las dos copias
+    assert fm.last_stats["files_hashed"] == 2
+
+
+def test_same_size_is_hashed_once(tmp_path: Path, monkeypatch):
+    source, target = tmp_path / "origen", tmp_path / "destino"
+    source.mkdir()
+    (source / "igual.txt").write_text("misma")
+    (source / "distinto.txt").write_text("nuevo")
+    TreeSync().sync(source, target)
+
+    # Mismo tamaño, otra fecha: hay que mirar el contenido
+    (target / "distinto.txt").write_text("viejo")
+    for name in ("igual.txt", "distinto.txt"):
+        os.utime(target / name, ns=(0, 10**9))
+    plan = TreeSync().plan(source, target)
+    assert plan.changed == ["distinto.txt"] and plan.touch == ["igual.txt"]
+    assert plan.hashed == 2
+
+    TreeSync().sync(source, target)
+    assert (target / "distinto.txt").read_text() == "nuevo"
+    # Un destino que no guarda la fecha: el manifest evita volver a hashear
+    os.utime(target / "igual.txt", ns=(0, 10**9))
+    with monkeypatch.context() as m:
+        m.setattr(os, "utime", lambda *args, **kwargs: None)
+        assert TreeSync().sync(source, target).plan.hashed == 1
+    plan = TreeSync().plan(source, target)
+    assert plan.hashed == 0 and plan.unchanged == 2
+
+
+def test_excluded_files_are_kept(tree: Path, tmp_path_factory):
+    target = tmp_path_factory.mktemp("espejo")
+    (target / "local.xlsx").write_text("no tocar")
+    result = make_fm(tree).filter_by_extension(".xlsx", True).sync(target, True)
+    assert (target / "local.xlsx").exists()
+    assert not (target / "cuentas_1.xlsx").exists()
+    assert (target / "notas.txt").exists() and not result.errors
+
+
+def test_ignored_paths_are_not_synced(tree: Path, tmp_path_factory):
+    target = tmp_path_factory.mktemp("espejo")
+    (target / "reportes").mkdir()
+    (target / "reportes" / "local.pdf").write_text("no tocar")
+    fm = make_fm(tree)
+    fm.set_ignore(["reportes/", "notas.txt"])
+    result = fm.sync(target, delete_extras=True)
+    assert sorted(p.name for p in target.iterdir()) == [
+        ".file_manager-sync.json",
+        "cuentas_1.xlsx",
+        "cuentas_2.xlsx",
+        "reportes",
+        "vacio",
+    ]
+    assert (target / "reportes" / "local.pdf").exists() and not result.errors
@@ -0,0 +1,118 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from file_manager import FileManager
+from file_manager.walker import TreeWalker
+
+
+def names(entries) -> set[str]:
+    return {entry.name for entry in entries}
+
+
+def test_max_depth_zero_returns_subdirs(tree: Path):
+    found = names(TreeWalker(max_depth=0).walk(tree))
+    assert found == {
+        "cuentas_1.xlsx",
+        "cuentas_2.xlsx",
+        "notas.txt",
+        "reportes",
+        "vacio",
+    }
+
+
+def test_max_depth_is_tracked_per_directory(tree: Path):
+    found = names(TreeWalker(max_depth=1).walk(tree))
+    assert found == {
+        "cuentas_1.xlsx",
+        "cuentas_2.xlsx",
+        "notas.txt",
+        "enero.xlsx",
+        "febrero (1).xlsx",
+        "2024",
+    }
+    assert "resumen.pdf" in names(TreeWalker(max_depth=2).walk(tree))
+
+
+def test_empty_directory_does_not_raise(tmp_path: Path):
+    assert list(TreeWalker(max_depth=3).walk(tmp_path)) == []
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="requires symlinks")
+def test_symlink_cycles_are_skipped(tree: Path):
+    (tree / "reportes" / "loop").symlink_to(tree, target_is_directory=True)
+
+    not_followed = names(TreeWalker(max_depth=5).walk(tree))
+    assert "loop" in not_followed
+
+    followed = [
+        e.name for e in TreeWalker(max_depth=5, follow_symlinks=True).walk(tree)
+    ]
+    assert followed.count("resumen.pdf") == 1
+    assert "loop" not in followed
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="requires symlinks")
+@pytest.mark.parametrize("workers", [1, 3])
+def test_folder_and_link_to_it_keep_the_first_listed(tmp_path: Path, workers: int):
+    (tmp_path / "a_real").mkdir()
+    (tmp_path / "a_real" / "f.txt").touch()
+    (tmp_path / "b_link").symlink_to(tmp_path / "a_real", target_is_directory=True)
+    # Gana el que aparece primero en el listado, con uno o varios workers
+    first = next(e.name for e in os.scandir(tmp_path))
+    walker = TreeWalker(max_depth=1, follow_symlinks=True, workers=workers)
+    assert [e.path for e in walker.walk(tmp_path)] == [str(tmp_path / first / "f.txt")]
+
+
+def test_list_files_recursive_is_reentrant(tree: Path):
+    fm = FileManager()
+    fm.set_max_depth(1)
+    first = fm._list_files_recursive(tree)
+    second = fm._list_files_recursive(tree)
+    assert first == second
+    assert tree / "reportes" / "enero.xlsx" in first
+
+
+def test_parallel_walk_keeps_serial_order(tree: Path):
+    serial = [e.path for e in TreeWalker(max_depth=2).walk(tree)]
+    parallel = [e.path for e in TreeWalker(max_depth=2, workers=4).walk(tree)]
+    assert parallel == serial
+
+
+def test_parallel_walk_stops_early(tree: Path):
+    walker = TreeWalker(max_depth=2, workers=4)
+    it = walker.walk(tree)
+    next(it)
+    it.close()
+
+
+def test_parallel_walk_bounds_listings_ahead(tmp_path: Path):
+    for i in range(40):
+        (tmp_path / f"carpeta_{i:02}").mkdir()
+        (tmp_path / f"carpeta_{i:02}" / "a.txt").touch()
+    walker = TreeWalker(max_depth=1, workers=2)
+    scanned = []
+    scan = walker._scan
+    walker._scan = lambda d, *args: scanned.append(d) or scan(d, *args)
+
+    entries = walker.walk(tmp_path)
+    next(entries)
+    time.sleep(0.1)
+    # La raíz, la que se está consumiendo y como mucho 2 * workers por delante
+    assert len(scanned) <= 2 + 2 * 2
+    assert len(list(entries)) == 39
+    assert len(scanned) == 41
+
+
+def test_file_manager_workers(tree: Path):
+    serial = FileManager()
+    parallel = FileManager(workers=4)
+    for fm in (serial, parallel):
+        fm.set_search_dir(tree)
+        fm.set_max_depth(2)
+    assert (
+        parallel.filter_by_extension(".xlsx").collect()
+        == serial.filter_by_extension(".xlsx").collect()
+    )
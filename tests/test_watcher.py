@@ -0,0 +1,97 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from file_manager import FileManager
+from file_manager.watcher import Watcher, _libc
+
+BACKENDS = ["polling"] + (["inotify"] if _libc is not None else [])
+
+
+@pytest.fixture(params=BACKENDS)
+def watcher(request, tree: Path):
+    fm = FileManager()
+    fm.set_search_dir(tree)
+    fm.set_max_depth(2)
+    watcher = fm.filter_by_extension(".xlsx").watch(
+        debounce=0.05, backend=request.param, poll_interval=0.05
+    )
+    yield watcher
+    watcher.close()
+
+
+def test_initial_set_is_the_collect(watcher: Watcher, tree: Path):
+    assert {p.name for p in watcher.paths} == {
+        "cuentas_1.xlsx",
+        "cuentas_2.xlsx",
+        "enero.xlsx",
+        "febrero (1).xlsx",
+    }
+
+
+def test_changes_are_filtered_and_batched(watcher: Watcher, tree: Path):
+    (tree / "reportes" / "2024" / "marzo.xlsx").touch()
+    (tree / "reportes" / "2024" / "marzo.txt").touch()
+    (tree / "cuentas_1.xlsx").unlink()
+    batch = watcher.poll(timeout=5)
+    assert batch.added == [tree / "reportes" / "2024" / "marzo.xlsx"]
+    assert batch.removed == [tree / "cuentas_1.xlsx"]
+    assert tree / "reportes" / "2024" / "marzo.xlsx" in watcher.paths
+    assert watcher.poll(timeout=0.2) is None
+
+
+def test_renames_and_new_folders(watcher: Watcher, tree: Path):
+    os.rename(tree / "cuentas_2.xlsx", tree / "vacio" / "cuentas_2.xlsx")
+    batch = watcher.poll(timeout=5)
+    assert batch.moved == {tree / "cuentas_2.xlsx": tree / "vacio" / "cuentas_2.xlsx"}
+
+    (tree / "nueva").mkdir()
+    (tree / "nueva" / "abril.xlsx").touch()
+    batch = watcher.poll(timeout=5)
+    assert batch.added == [tree / "nueva" / "abril.xlsx"]
+
+
+def test_created_and_deleted_in_the_same_window(tree: Path):
+    watcher = Watcher(tree, lambda entry: True, backend="polling")
+    path = str(tree / "tmp.txt")
+    batch = watcher._apply([("created", path, None), ("deleted", path, None)])
+    assert not batch
+    watcher.close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_ignored_paths_are_not_watched(tree: Path, backend: str):
+    fm = FileManager()
+    fm.set_search_dir(tree)
+    fm.set_max_depth(2)
+    fm.set_ignore(["reportes/", "borrador*"])
+    with fm.filter_by_extension(".xlsx").watch(
+        debounce=0.05, backend=backend, poll_interval=0.05
+    ) as watcher:
+        assert {p.name for p in watcher.paths} == {"cuentas_1.xlsx", "cuentas_2.xlsx"}
+        (tree / "reportes" / "marzo.xlsx").touch()
+        (tree / "vacio" / "borrador.xlsx").touch()
+        (tree / "vacio" / "abril.xlsx").touch()
+        batch = watcher.poll(timeout=5)
+        assert batch.added == [tree / "vacio" / "abril.xlsx"]
+
+
+def test_polling_only_lists_changed_folders(tree: Path):
+    # Carpetas con mtime viejo: su listado guardado es confiable
+    for folder in (tree, tree / "reportes", tree / "reportes" / "2024", tree / "vacio"):
+        os.utime(folder, (1e9, 1e9))
+    watcher = Watcher(tree, lambda entry: True, max_depth=2, backend="polling")
+    listed = []
+    scan = watcher.walker._scan
+    watcher.walker._scan = lambda d, *args: listed.append(d) or scan(d, *args)
+
+    (tree / "vacio" / "nuevo.txt").touch()
+    (tree / "notas.txt").write_text("cambió")
+    events = watcher.backend._diff(watcher.backend._snapshot())
+    assert listed == [str(tree / "vacio")]
+    assert sorted(events) == [
+        ("created", str(tree / "vacio" / "nuevo.txt"), None),
+        ("modified", str(tree / "notas.txt"), None),
+    ]
+    watcher.close()